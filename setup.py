@@ -50,6 +50,7 @@ setup(
     install_requires=[
         # python installation for py4j
         'py4j>=' + PY4J_VERSION,
+        'numpy',
         'pandas',
         'pytest',
       ],    
@@ -1,112 +1,244 @@
 import os
 import subprocess
-import traceback
+import time
 
-from py4j.java_gateway import JavaGateway
+from py4j.java_gateway import JavaGateway, GatewayParameters
+from py4j.protocol import Py4JError
 
 from planit import ConverterFactory, GatewayUtils
 from planit import GatewayConfig
 from planit import GatewayState
+from planit import JvmOptions
 from planit import PlanitProject
 from planit import Version
 
 
 class Planit:
             
-    def __init__(self, debug_info=False, standalone=True):
-        """Constructor of PLANit python wrapper which acts as an interface to the underlying PLANit Java code
+    def __init__(self, debug_info=False, standalone=True, jvm_options: JvmOptions = None):
+        """Constructor of PLANit python wrapper which acts as an interface to the underlying PLANit Java code. Multiple
+        instances can be used concurrently, each has its own gateway (and JVM when standalone)
         :param project_path the path location of the XML input file(s) to be used by PLANitIO
-        :param standalone when true this PLANit instance bootstraps a java gateway and closes it upon completion of the scripts when false <to be implemented>
+        :param standalone when true this PLANit instance bootstraps a java gateway and closes it upon completion of the
+        scripts, when false it attaches to the shared PLANit gateway server (started on first use), which keeps running
+        afterwards to avoid paying the JVM startup for every script, see start_server and stop_server
+        :param jvm_options JVM settings (heap, GC, flags, Java installation) of the JVM started by this instance, the
+        GatewayConfig defaults are used for each option not set. When attaching to a running server they have no effect
         """  
         # explicitly set uninitialized member variables to None
         self.assignment_project = None                     
-        self._converter_factory_instance = ConverterFactory()
+        self._gateway_state = GatewayState()
+        self._converter_factory_instance = ConverterFactory(self._gateway_state)
         
         self._debug_info = debug_info
+        self._standalone = standalone
+        self._jvm_options = jvm_options if jvm_options is not None else JvmOptions()
         
-        if not standalone:
-            raise Exception('Standalone argument can only be true at this time, server mode not yet supported')  
-        self.__start_java__()
+        if standalone:
+            self.__start_java__()
+        else:
+            self.__attach_java__()
 
     def __get_package_jvm(self):
         """ Convenience method to access jvm base to be supplemented with packages.
 
         for example, get_package_jvm().java.lang.String
 
-        :return GatewayState.python_2_java_gateway.jvm.java
+        :return self._gateway_state.python_2_java_gateway.jvm
         """
-        return GatewayUtils.get_package_jvm() if GatewayState.gateway_is_running else None
+        return GatewayUtils.get_package_jvm(self._gateway_state) if self._gateway_state.gateway_is_running else None
        
     def __start_java__(self):            
-        """Start the gateway to Java 
+        """Start the gateway to Java, each instance runs its own JVM with a gateway server on its own port
         """  
+        gateway_state = self._gateway_state
         
-        #find the location of this file, so that other directories can be located relative to it    
-        dir_path = os.path.dirname(os.path.realpath(__file__))
         # Bootstrap the java gateway server
-        if not GatewayState.gateway_is_running:
-            # register dependencies (both for:
-            #    - the IDE run, 
-            #    - the RELEASE environment
-            #    - a venv (virtual python) environment (which contains a bug that requires us to use a different path)
-            dependencySet = {
-                os.path.join(dir_path, GatewayConfig.IDE_SHARE_PATH,GatewayConfig.PLANIT_SHARE),
-                os.path.join(dir_path, GatewayConfig.IDE_SHARE_PATH, GatewayConfig.PY4J_SHARE),
-                os.path.join(GatewayConfig.RELEASE_SHARE_PATH, GatewayConfig.PLANIT_SHARE),
-                os.path.join(GatewayConfig.VENV_RELEASE_SHARE_PATH,GatewayConfig.PLANIT_SHARE),                
-                os.path.join(GatewayConfig.RELEASE_SHARE_PATH,GatewayConfig.PY4J_SHARE),
-                os.path.join(GatewayConfig.VENV_RELEASE_SHARE_PATH, GatewayConfig.PY4J_SHARE)}
-            dependencySeparator = ';'
-            fullString = dependencySeparator.join(dependencySet)
-            
-            cmd = ['java', '-classpath', fullString, GatewayConfig.JAVA_GATEWAY_WRAPPER_CLASS]
+        if not gateway_state.gateway_is_running:
+            gateway_state.startup_timings = {}
+            start_time = time.perf_counter()
+
+            fullString = Planit.__create_classpath()
+            gateway_state.jvm_options = self._jvm_options.effective()
+            # a plain Py4J gateway server is started, which terminates when its stdin is closed, i.e., also when this
+            # Python process dies unexpectedly. With port 0 it binds a free port itself and prints it as the first line
+            # of its output, where it is read back, see read_java_gateway_port
+            cmd = [gateway_state.jvm_options.java_executable()] + gateway_state.jvm_options.to_arguments() + [
+                '-classpath', fullString, GatewayConfig.PY4J_GATEWAY_SERVER_CLASS, '--die-on-broken-pipe',
+                str(GatewayConfig.JAVA_GATEWAY_PORT)]
+            gateway_state.java_command = cmd
             if self._debug_info: print('Java classpath: ' + fullString)
-            GatewayState.planit_java_process = subprocess.Popen(cmd)           
-             
+            if self._debug_info: print('Java options: ' + str(gateway_state.jvm_options))
+            gateway_state.startup_timings['classpath'] = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            gateway_state.planit_java_process = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=gateway_state.jvm_options.to_environment())
+            gateway_state.startup_timings['jvm_spawn'] = time.perf_counter() - start_time
+
+            # wait for the JVM to be ready to accept connections, rather than racing it
+            start_time = time.perf_counter()
+            try:
+                gateway_state.port = GatewayUtils.read_java_gateway_port(gateway_state.planit_java_process)
+                GatewayUtils.wait_for_java_gateway(
+                    gateway_state.planit_java_process, GatewayConfig.JAVA_GATEWAY_ADDRESS, gateway_state.port)
+            except Exception:
+                if gateway_state.planit_java_process.poll() is None:
+                    gateway_state.planit_java_process.kill()
+                    gateway_state.planit_java_process.wait()
+                gateway_state.planit_java_process = None
+                raise
+            gateway_state.startup_timings['jvm_listening'] = time.perf_counter() - start_time
+
             # now we  connect to the gateway, ask Py4J to auto convert containers between Python and Java
-            GatewayState.python_2_java_gateway = JavaGateway()
-            GatewayState.gateway_is_running = True            
+            start_time = time.perf_counter()
+            gateway_state.python_2_java_gateway = JavaGateway(gateway_parameters=GatewayParameters(
+                address=GatewayConfig.JAVA_GATEWAY_ADDRESS, port=gateway_state.port))
+            gateway_state.python_2_java_gateway.jvm.java.lang.System.currentTimeMillis()
+            gateway_state.startup_timings['first_call'] = time.perf_counter() - start_time
+
+            # the PLANit entry point is created on the server, the same way as when attaching to the shared server. It
+            # also replaces the (absent) entry point of the plain server on the gateway, so both access it alike
+            start_time = time.perf_counter()
+            gateway_state.entry_point = GatewayUtils.get_java_class(
+                GatewayConfig.JAVA_GATEWAY_WRAPPER_CLASS, gateway_state)()
+            gateway_state.python_2_java_gateway.entry_point = gateway_state.entry_point
+            gateway_state.startup_timings['entry_point'] = time.perf_counter() - start_time
+            gateway_state.register()
             
             print("PLANit v:" + Version.planit)
                 
-            #TODO: Note we are not waiting for it to setup properly --> possibly considering some mechanism to wait for this to ensure proper connection!
-            if self._debug_info: print('Java interface running with PID: '+ str(GatewayState.planit_java_process.pid))
+            if self._debug_info: print('Java interface running with PID: '+ str(gateway_state.planit_java_process.pid)
+                                       + ' on port: ' + str(gateway_state.port))
+            if self._debug_info: print('Java interface startup timings (s): ' + str(gateway_state.startup_timings))
         else:
-            raise Exception('PLANit java interface already running, only a single instance allowed at this point')
+            raise Exception('PLANit java interface already running for this instance')
             
+    def __attach_java__(self):
+        """Attach to the shared PLANit gateway server, start it when not yet running. Each attached instance creates
+        its own PLANit entry point on the server, so projects of different clients are isolated from each other
+        """
+        gateway_state = self._gateway_state
+        if gateway_state.gateway_is_running:
+            raise Exception('PLANit java interface already running for this instance')
+
+        gateway_state.startup_timings = {}
+        start_time = time.perf_counter()
+        if not GatewayUtils.is_java_gateway_listening(GatewayConfig.JAVA_GATEWAY_ADDRESS, GatewayConfig.SERVER_PORT):
+            Planit.start_server(self._debug_info, self._jvm_options)
+        gateway_state.startup_timings['jvm_listening'] = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        gateway_state.port = GatewayConfig.SERVER_PORT
+        gateway_state.python_2_java_gateway = JavaGateway(gateway_parameters=GatewayParameters(
+            address=GatewayConfig.JAVA_GATEWAY_ADDRESS, port=GatewayConfig.SERVER_PORT))
+        gateway_state.entry_point = GatewayUtils.get_java_class(
+            GatewayConfig.JAVA_GATEWAY_WRAPPER_CLASS, gateway_state)()
+        gateway_state.python_2_java_gateway.entry_point = gateway_state.entry_point
+        gateway_state.startup_timings['first_call'] = time.perf_counter() - start_time
+        gateway_state.register()
+
+        print("PLANit v:" + Version.planit)
+        if self._debug_info: print('Attached to PLANit server on port: ' + str(GatewayConfig.SERVER_PORT))
+
+    @staticmethod
+    def start_server(debug_info=False, jvm_options: JvmOptions = None):
+        """Start the shared PLANit gateway server used by Planit instances created with standalone=False, the server
+        runs detached from the current Python process and remains running until stop_server is called. Returns
+        once the server accepts connections
+        :param jvm_options JVM settings of the server, the GatewayConfig defaults are used for each option not set
+        """
+        fullString = Planit.__create_classpath()
+        jvm_options = (jvm_options if jvm_options is not None else JvmOptions()).effective()
+        cmd = [jvm_options.java_executable()] + jvm_options.to_arguments() + [
+            '-classpath', fullString, GatewayConfig.PY4J_GATEWAY_SERVER_CLASS, str(GatewayConfig.SERVER_PORT)]
+        if debug_info: print('Java classpath: ' + fullString)
+        if debug_info: print('Java options: ' + str(jvm_options))
+        if os.name == 'nt':
+            server_process = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=jvm_options.to_environment(),
+                creationflags=subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            server_process = subprocess.Popen(
+                cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=jvm_options.to_environment(),
+                start_new_session=True)
+        try:
+            GatewayUtils.wait_for_java_gateway(
+                server_process, GatewayConfig.JAVA_GATEWAY_ADDRESS, GatewayConfig.SERVER_PORT)
+        except Exception:
+            # another client may have started the server concurrently, in which case ours fails to bind the port
+            if not GatewayUtils.is_java_gateway_listening(
+                    GatewayConfig.JAVA_GATEWAY_ADDRESS, GatewayConfig.SERVER_PORT):
+                raise
+        if debug_info: print('PLANit server running with PID: ' + str(server_process.pid))
+
+    @staticmethod
+    def stop_server():
+        """Stop the shared PLANit gateway server (if running), any instances still attached to it can no longer be used
+        """
+        if GatewayUtils.is_java_gateway_listening(GatewayConfig.JAVA_GATEWAY_ADDRESS, GatewayConfig.SERVER_PORT):
+            JavaGateway(gateway_parameters=GatewayParameters(
+                address=GatewayConfig.JAVA_GATEWAY_ADDRESS, port=GatewayConfig.SERVER_PORT)).shutdown()
+
+    @staticmethod
+    def __create_classpath():
+        """ Create the Java classpath comprising the PLANit and Py4J dependencies
+        """
+        return os.pathsep.join(GatewayUtils.resolve_classpath())
+
     def __del__(self):
         """Destructor of PLANit object which shuts down the connection to Java
         """
         self.__stop_java__()
         
     def __stop_java__(self):        
-        """Cleans up the gateway in Java in case this has not been done yet. It assumes a single instance available in Python tied
-        to a particular self. Only that instance is allowed to terminate the gateway. In case an exception is raised indicating an instance is
-        already running it is likely this method has not been called. If you are certain the object has gone out of scope, it is likely the garbage collector
-        has not yet removed the object and therefore the connection still exists., use force_stop_java to achieve this if you do not want to call the garbage 
-        collector
+        """Cleans up the gateway in Java in case this has not been done yet. Each instance terminates only its own
+        gateway (and JVM when standalone). If the instance has gone out of scope, it is likely the garbage collector has
+        not yet removed the object and therefore the connection still exists, use force_stop_java to achieve this if you
+        do not want to call the garbage collector
         """          
+        gateway_state = self._gateway_state
+        # in server mode only this client's connection is closed, the shared server remains running
+        if gateway_state.gateway_is_running and not self._standalone:
+            try:
+                gateway_state.python_2_java_gateway.detach(gateway_state.entry_point)
+            except Py4JError:
+                # the shared server is gone already, e.g., stopped by another client
+                if self._debug_info: print("PLANit server no longer available")
+            gateway_state.python_2_java_gateway.close()
+            gateway_state.unregister()
+            gateway_state.python_2_java_gateway = None
+            gateway_state.entry_point = None
+            if self._debug_info: print ("Detached from PLANit server")
         # Let the instance that instantiated the connection also terminate it automatically
-        if GatewayState.gateway_is_running:
-            # Check if the process has really terminated & force kill if not.           
+        elif gateway_state.gateway_is_running:
+            gateway_state.unregister()
             try:
-                GatewayState.python_2_java_gateway.shutdown()
-                GatewayState.planit_java_process.terminate()
-                if (GatewayState.planit_java_process.poll() != None):
-                    os.kill(GatewayState.planit_java_process.pid, 0)
-                    GatewayState.planit_java_process.kill()
-                # Wait for zombie process to provide post-mortem information. 
+                gateway_state.python_2_java_gateway.shutdown(raise_exception=True)
+            except Py4JError:
+                # the JVM is gone already, e.g., killed to cancel a call in progress
+                if self._debug_info: print("PLANit java interface already terminated")
+            java_process = gateway_state.planit_java_process
+            try:
+                # the JVM terminates when its stdin is closed, the pipe is broken when it has terminated already
+                java_process.stdin.close()
+            except OSError:
+                pass
+            java_process.terminate()
+            # Check if the process has really terminated & force kill if not.
+            try:
+                java_process.wait(timeout=GatewayConfig.SHUTDOWN_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                java_process.kill()
+                # Wait for zombie process to provide post-mortem information.
                 # Only after this call the subprocess will be gone and we will not receive warnings
-                # that it is still alive regardless of the fact we killed it zoom
-                GatewayState.planit_java_process.wait()
-                GatewayState.gateway_is_running = False
-                GatewayState.python_2_java_gateway = None
+                # that it is still alive regardless of the fact we killed it
+                java_process.wait()
                 if self._debug_info: print ("Forced kill of PLANitJava interface")
-            except OSError:
-                if self._debug_info: print ("Terminated PLANitJava interface")   
-            except:
-                traceback.print_exc()        
-                
+            gateway_state.python_2_java_gateway = None
+            gateway_state.entry_point = None
+            if self._debug_info: print ("Terminated PLANitJava interface")
+
     def force_stop_java(self):
         """ force the java connectoind to be ended, only use when you are certain you no longer are using this Planit instance
         """
@@ -119,7 +251,7 @@ class Planit:
             :return create and/or provide access to the planit project instance to conduct an assignment 
         """        
         if not self.assignment_project:
-            self.assignment_project = PlanitProject(project_path)
+            self.assignment_project = PlanitProject(project_path, self._gateway_state)
         else:
             raise Exception("Cannot create a project when project is already created, only a single project allowed")
         return self.assignment_project
@@ -133,6 +265,13 @@ class Planit:
             self.create_project()
         return self.assignment_project
         
+    @property
+    def gateway_state(self) -> GatewayState:
+        """ access to the gateway state of this instance, e.g., its port and startup timings
+        :return gateway state
+        """
+        return self._gateway_state
+
     @property
     def converter_factory(self) -> ConverterFactory:
         """ access to converter factory
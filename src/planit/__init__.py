@@ -3,9 +3,11 @@
 from .enums import *
 from .version import Version
 from .gateway import GatewayConfig
+from .gateway import JvmOptions
 from .gateway import GatewayState
 from .gateway import GatewayUtils
 from .initial_cost import InitialCost
+from .initial_cost import InitialCostCache
 from .wrappers import BaseWrapper
 from .converterwrappers import *
 from .converter import _ConverterBase
@@ -13,6 +15,19 @@ from .converter import ConverterFactory
 from .converter import NetworkConverter
 from .converter import ZoningConverter
 from .converter import IntermodalConverter
+from .progress import IterationProgress
+from .progress import IterationMonitor
+from .progress import StoppingPolicy
+from .progress import GapImprovementPolicy
+from .progress import TimeBudgetPolicy
+from .network_index import NetworkEntityTable
+from .network_index import NetworkIndex
+from .network_index import NetworkGeometry
 from .projectwrappers import *
 from .project import PlanitProject
 from .Planit import Planit
+from .asyncplanit import AsyncPlanit
+from .asyncplanit import AsyncPlanitProject
+from .scenario import ScenarioSpec
+from .scenario import ScenarioResult
+from .scenario import ScenarioRunner
@@ -0,0 +1,210 @@
+import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from planit import IntermodalConverter
+from planit import IntermodalReaderWrapper
+from planit import IntermodalWriterWrapper
+from planit import IterationProgress
+from planit import JvmOptions
+from planit import Planit
+from planit import PlanitProject
+from planit import _ConverterBase
+
+
+class AsyncPlanit:
+    """ asyncio counterpart of Planit. Blocking calls into Java (starting the JVM, running assignments, conversions)
+    are awaitables executed on an executor managed by this instance, so they do not block the event loop. Each
+    instance runs its own JVM, which is what allows cancellation: a Java call can not be interrupted from Python, so
+    cancelling an awaited run or conversion terminates the JVM, after which start has to be awaited again, e.g.,
+
+        async with AsyncPlanit() as planit:
+            project = await planit.create_project(project_path)
+            project.set(TrafficAssignment.TRADITIONAL_STATIC)
+            await project.run(on_progress=lambda progress: print(progress.iteration, progress.gap))
+    """
+
+    # default number of executor threads, i.e., concurrent blocking calls, of an instance
+    MAX_WORKERS = 4
+
+    def __init__(self, debug_info=False, jvm_options: JvmOptions = None, max_workers: int = None):
+        """ Initialiser, the JVM is started by start (or by entering the instance as async context manager)
+        :param debug_info passed on to the underlying Planit instance
+        :param jvm_options passed on to the underlying Planit instance
+        :param max_workers the number of executor threads, default MAX_WORKERS
+        """
+        self._debug_info = debug_info
+        self._jvm_options = jvm_options
+        self._max_workers = max_workers if max_workers is not None else AsyncPlanit.MAX_WORKERS
+        self._executor = None
+        self._planit = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, exc_traceback):
+        await self.stop()
+
+    async def start(self):
+        """ Start the underlying (standalone) Planit instance and its JVM, unless already running
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="planit-async")
+        if not self.is_running:
+            self._planit = await self.call(Planit, self._debug_info, True, self._jvm_options)
+
+    async def stop(self):
+        """ Stop the underlying Planit instance and its JVM as well as the executor
+        """
+        if self.is_running:
+            await self.call(self._planit.force_stop_java)
+        self._planit = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def call(self, function: Callable, *args, **kwargs):
+        """ Run any blocking function (typically one calling into Java, e.g., collecting results from memory) on the
+        executor of this instance. Such calls are not cancellable, see run and convert for cancellable calls
+        :param function to call
+        :return result of the function
+        """
+        if self._executor is None:
+            raise Exception('AsyncPlanit not started, await start() first')
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs))
+
+    async def create_project(self, project_path: str = None) -> "AsyncPlanitProject":
+        """ Create a project, which parses its inputs, see Planit.create_project. Unlike Planit, multiple projects can be
+        created (one after the other, or concurrently) on the same instance
+        :param project_path to use, when left empty current working directory is used
+        :return the asyncio counterpart of the created project
+        """
+        return AsyncPlanitProject(self, await self.call(PlanitProject, project_path, self.planit.gateway_state))
+
+    async def convert(self, converter: _ConverterBase, reader_wrapper, writer_wrapper):
+        """ Perform the conversion of the converter (created via converter_factory) without blocking the event loop.
+        Cancelling it terminates the JVM
+        :param converter to use
+        :param reader_wrapper to use
+        :param writer_wrapper to use
+        """
+        await self._run_cancellable(converter.convert, reader_wrapper, writer_wrapper)
+
+    async def convert_with_services(self, converter: IntermodalConverter, reader_wrapper: IntermodalReaderWrapper,
+                                    writer_wrapper: IntermodalWriterWrapper):
+        """ Perform the conversion including services of the intermodal converter (created via converter_factory)
+        without blocking the event loop. Cancelling it terminates the JVM
+        :param converter to use
+        :param reader_wrapper to use
+        :param writer_wrapper to use
+        """
+        await self._run_cancellable(converter.convert_with_services, reader_wrapper, writer_wrapper)
+
+    async def _run_cancellable(self, function: Callable, *args):
+        """ Run the blocking function on the executor. When the awaiting task is cancelled before the function
+        completed, the JVM is terminated to stop the Java call
+        :param function to run
+        :return result of the function
+        """
+        planit = self.planit
+        future = asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args))
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if not future.done():
+                # the failure of the abandoned call (its JVM is gone) is of no interest, but has to be retrieved
+                future.add_done_callback(lambda abandoned: abandoned.cancelled() or abandoned.exception())
+                self.__terminate(planit)
+            raise
+
+    def __terminate(self, planit: Planit):
+        """ kill the JVM of the Planit instance, which ends any Java call in progress
+        """
+        java_process = planit.gateway_state.planit_java_process
+        if java_process is not None and java_process.poll() is None:
+            java_process.kill()
+        planit.force_stop_java()
+        if self._planit is planit:
+            self._planit = None
+        if self._debug_info: print("Terminated PLANit java interface to cancel call in progress")
+
+    @property
+    def is_running(self) -> bool:
+        """ :return true when the JVM of this instance is running, false otherwise
+        """
+        return self._planit is not None and self._planit.gateway_state.gateway_is_running
+
+    @property
+    def planit(self) -> Planit:
+        """ access to the underlying Planit instance, e.g., for its gateway state
+        :return Planit instance
+        """
+        if not self.is_running:
+            raise Exception('PLANit java interface not running, await start() first')
+        return self._planit
+
+    @property
+    def converter_factory(self):
+        """ access to converter factory of the underlying Planit instance, creating and configuring converters, readers
+        and writers is not blocking, use convert and convert_with_services to perform the conversion
+        :return factory to create converters for networks, zoning, etc.
+        """
+        return self.planit.converter_factory
+
+
+class AsyncPlanitProject:
+    """ asyncio counterpart of PlanitProject, all configuration is delegated to the underlying project as is, while
+    running the assignment is awaitable, cancellable, and can report its progress per iteration
+    """
+
+    def __init__(self, async_planit: AsyncPlanit, project: PlanitProject):
+        """ Initialiser
+        :param async_planit the AsyncPlanit instance the project was created on
+        :param project the underlying project
+        """
+        self._async_planit = async_planit
+        self._project = project
+        # tasks of coroutine progress handlers, referenced until done since the event loop only holds weak references
+        # to tasks
+        self._progress_tasks = set()
+
+    def __getattr__(self, name: str):
+        """ delegate to the underlying project, e.g., project.assignment, project.set(...)
+        """
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return getattr(self._project, name)
+
+    @property
+    def project(self) -> PlanitProject:
+        """ access to the underlying project
+        :return project
+        """
+        return self._project
+
+    async def run(self, on_progress: Callable[[IterationProgress], None] = None):
+        """ Run the traffic assignment without blocking the event loop, see PlanitProject.run. Cancelling it terminates
+        the JVM (see AsyncPlanit)
+        :param on_progress called on the event loop with the progress of each iteration of the assignment (see
+        IterationMonitor), may be a coroutine function in which case it is scheduled as a task
+        """
+        if on_progress is None:
+            await self._async_planit._run_cancellable(self._project.run)
+            return
+
+        loop = asyncio.get_running_loop()
+
+        def report_progress(progress: IterationProgress):
+            result = on_progress(progress)
+            if inspect.isawaitable(result):
+                progress_task = asyncio.ensure_future(result)
+                self._progress_tasks.add(progress_task)
+                progress_task.add_done_callback(self._progress_tasks.discard)
+
+        # iterations are reported on the callback thread, they are handed over to the event loop in order
+        await self._async_planit._run_cancellable(
+            self._project.run, lambda progress: loop.call_soon_threadsafe(report_progress, progress))
@@ -32,6 +32,19 @@ class _ConverterBase():
     """ Base converter class on python side exposing the convert functionality
     """
 
+    def __init__(self, gateway_state: GatewayState = None):
+        """ initialise the converter
+        :param gateway_state: the gateway state (of the Planit instance) to create Java readers, writers, and
+        converters on, default GatewayState.of()
+        """
+        self._gateway_state = gateway_state or GatewayState.of()
+
+    @property
+    def _jvm(self):
+        """ jvm view of the gateway state of this converter
+        """
+        return GatewayUtils.get_package_jvm(self._gateway_state)
+
     @abstractmethod
     def _create_java_converter(self, readerWrapper, writerWrapper):
         """ create java converter based on reader and writer wrapper provided in derived class implementation 
@@ -55,8 +68,8 @@ class NetworkConverter(_ConverterBase):
     """ Expose the options to create network reader and writers of supported types and perform conversion between them
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, gateway_state: GatewayState = None):
+        super().__init__(gateway_state)
 
     def _create_java_converter(self, reader_wrapper, writer_wrapper):
         """ create java network converter with reader and writer wrapper provided
@@ -64,7 +77,7 @@ class NetworkConverter(_ConverterBase):
         :param writer_wrapper: to use
         :return created java network converter
         """
-        return GatewayUtils.get_package_jvm().org.goplanit.converter.network.NetworkConverterFactory.create(
+        return self._jvm.org.goplanit.converter.network.NetworkConverterFactory.create(
             reader_wrapper.java, writer_wrapper.java)
 
     #####################################
@@ -73,17 +86,17 @@ class NetworkConverter(_ConverterBase):
 
     def __create_osm_network_reader(self, country: str) -> OsmNetworkReaderWrapper:
         java_network_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.osm.converter.network.OsmNetworkReaderFactory.create(country)
+            self._jvm.org.goplanit.osm.converter.network.OsmNetworkReaderFactory.create(country)
         return OsmNetworkReaderWrapper(java_network_reader)
 
     def __create_planit_network_reader(self) -> PlanitNetworkReaderWrapper:
         java_network_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.network.PlanitNetworkReaderFactory.create()
+            self._jvm.org.goplanit.io.converter.network.PlanitNetworkReaderFactory.create()
         return PlanitNetworkReaderWrapper(java_network_reader)
 
     def __create_tntp_network_reader(self) -> TntpNetworkReaderWrapper:
         java_network_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.tntp.converter.network.TntpNetworkReaderFactory.create()
+            self._jvm.org.goplanit.tntp.converter.network.TntpNetworkReaderFactory.create()
         return TntpNetworkReaderWrapper(java_network_reader)
 
     #####################################
@@ -92,17 +105,17 @@ class NetworkConverter(_ConverterBase):
 
     def __create_matsim_network_writer(self) -> MatsimNetworkWriterWrapper:
         java_network_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.matsim.converter.MatsimNetworkWriterFactory.create()
+            self._jvm.org.goplanit.matsim.converter.MatsimNetworkWriterFactory.create()
         return MatsimNetworkWriterWrapper(java_network_writer)
 
     def __create_geoio_network_writer(self) -> GeometryNetworkWriterWrapper:
         java_network_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.geoio.converter.network.GeometryNetworkWriterFactory.create()
+            self._jvm.org.goplanit.geoio.converter.network.GeometryNetworkWriterFactory.create()
         return GeometryNetworkWriterWrapper(java_network_writer)
 
     def __create_planit_network_writer(self) -> PlanitNetworkWriterWrapper:
         java_network_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.network.PlanitNetworkWriterFactory.create()
+            self._jvm.org.goplanit.io.converter.network.PlanitNetworkWriterFactory.create()
         return PlanitNetworkWriterWrapper(java_network_writer)
 
     def create_reader(self, network_reader_type: NetworkReaderType, country: str = "Global") -> ZoningReaderWrapper:
@@ -148,8 +161,8 @@ class ZoningConverter(_ConverterBase):
     """ Expose the options to create zoning reader and writers of supported types and perform conversion between them
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, gateway_state: GatewayState = None):
+        super().__init__(gateway_state)
 
     def _create_java_converter(self, reader_wrapper, writer_wrapper):
         """ create java network converter with reader and writer wrapper provided
@@ -157,24 +170,22 @@ class ZoningConverter(_ConverterBase):
         :param writer_wrapper: to writer use
         :return created java network converter
         """
-        return GatewayUtils.get_package_jvm().org.goplanit.converter.zoning.ZoningConverterFactory.create(
+        return self._jvm.org.goplanit.converter.zoning.ZoningConverterFactory.create(
             reader_wrapper.java, writer_wrapper.java)
 
     #####################################
     #     ZONING READER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_planit_zoning_reader(reference_reader: ZoningReaderWrapper) -> PlanitZoningReaderWrapper:
+    def __create_planit_zoning_reader(self, reference_reader: ZoningReaderWrapper) -> PlanitZoningReaderWrapper:
         java_zoning_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.zoning.PlanitZoningReaderFactory.create(
+            self._jvm.org.goplanit.io.converter.zoning.PlanitZoningReaderFactory.create(
                 reference_reader.java)
         return PlanitZoningReaderWrapper(java_zoning_reader)
 
-    @staticmethod
-    def __create_tntp_zoning_reader(reference_reader: ZoningReaderWrapper) -> TntpZoningReaderWrapper:
+    def __create_tntp_zoning_reader(self, reference_reader: ZoningReaderWrapper) -> TntpZoningReaderWrapper:
         java_zoning_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.tntp.converter.zoning.TntpZoningReaderFactory.create(
+            self._jvm.org.goplanit.tntp.converter.zoning.TntpZoningReaderFactory.create(
                 reference_reader.java)
         return TntpZoningReaderWrapper(java_zoning_reader)
 
@@ -182,16 +193,14 @@ class ZoningConverter(_ConverterBase):
     #     ZONING WRITER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_planit_zoning_writer() -> PlanitZoningWriterWrapper:
+    def __create_planit_zoning_writer(self) -> PlanitZoningWriterWrapper:
         java_zoning_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.zoning.PlanitZoningWriterFactory.create()
+            self._jvm.org.goplanit.io.converter.zoning.PlanitZoningWriterFactory.create()
         return PlanitZoningWriterWrapper(java_zoning_writer)
 
-    @staticmethod
-    def __create_geoio_zoning_writer() -> GeometryZoningWriterWrapper:
+    def __create_geoio_zoning_writer(self) -> GeometryZoningWriterWrapper:
         java_zoning_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.geoio.converter.zoning.GeometryZoningWriterFactory.create()
+            self._jvm.org.goplanit.geoio.converter.zoning.GeometryZoningWriterFactory.create()
         return GeometryZoningWriterWrapper(java_zoning_writer)
 
     def create_reader(self,
@@ -209,9 +218,9 @@ class ZoningConverter(_ConverterBase):
                 "Zoning reader type provided is not of ZoningReaderType, unable to instantiate")
 
         elif zoning_reader_type == ZoningReaderType.PLANIT:
-            return ZoningConverter.__create_planit_zoning_reader(reference_reader)
+            return self.__create_planit_zoning_reader(reference_reader)
         elif zoning_reader_type == ZoningReaderType.TNTP:
-            return ZoningConverter.__create_tntp_zoning_reader(reference_reader)
+            return self.__create_tntp_zoning_reader(reference_reader)
         else:
             raise Exception("Unsupported zoning reader type provided, unable to instantiate")
 
@@ -226,9 +235,9 @@ class ZoningConverter(_ConverterBase):
                 "Zoning reader type provided is not of ZoningReaderType, unable to instantiate")
 
         elif zoning_writer_type == ZoningWriterType.PLANIT:
-            return ZoningConverter.__create_planit_zoning_writer()
+            return self.__create_planit_zoning_writer()
         elif zoning_writer_type == ZoningWriterType.SHAPE:
-            return ZoningConverter.__create_geoio_zoning_writer()
+            return self.__create_geoio_zoning_writer()
         else:
             raise Exception("Unsupported zoning writer type provided, unable to instantiate")
 
@@ -237,8 +246,8 @@ class DemandsConverter(_ConverterBase):
     """ Expose the options to create demand reader and writers of supported types and perform conversion between them
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, gateway_state: GatewayState = None):
+        super().__init__(gateway_state)
 
     def _create_java_converter(self, reader_wrapper, writer_wrapper):
         """ create java network converter with reader and writer wrapper provided
@@ -246,24 +255,23 @@ class DemandsConverter(_ConverterBase):
         :param writer_wrapper: writer to use
         :return created java network converter
         """
-        return GatewayUtils.get_package_jvm().org.goplanit.converter.demands.DemandsConverterFactory.create(
+        return self._jvm.org.goplanit.converter.demands.DemandsConverterFactory.create(
             reader_wrapper.java, writer_wrapper.java)
 
     #####################################
     #     DEMANDS READER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_planit_demands_reader(reference_zoning_reader: ZoningReaderWrapper) -> PlanitDemandsReaderWrapper:
+    def __create_planit_demands_reader(self, reference_zoning_reader: ZoningReaderWrapper) \
+            -> PlanitDemandsReaderWrapper:
         java_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.demands.PlanitDemandsReaderFactory.create(
+            self._jvm.org.goplanit.io.converter.demands.PlanitDemandsReaderFactory.create(
                 reference_zoning_reader.java)
         return PlanitDemandsReaderWrapper(java_reader)
 
-    @staticmethod
-    def __create_tntp_demands_reader(reference_zoning_reader: ZoningReaderWrapper) -> TntpDemandsReaderWrapper:
+    def __create_tntp_demands_reader(self, reference_zoning_reader: ZoningReaderWrapper) -> TntpDemandsReaderWrapper:
         java_reader = \
-            GatewayUtils.get_package_jvm().org.goplanit.tntp.converter.demands.TntpDemandsReaderFactory.create(
+            self._jvm.org.goplanit.tntp.converter.demands.TntpDemandsReaderFactory.create(
                 reference_zoning_reader.java)
         return TntpDemandsReaderWrapper(java_reader)
 
@@ -271,10 +279,9 @@ class DemandsConverter(_ConverterBase):
     #     DEMANDS WRITER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_planit_demands_writer() -> PlanitDemandsWriterWrapper:
+    def __create_planit_demands_writer(self) -> PlanitDemandsWriterWrapper:
         java_writer = \
-            GatewayUtils.get_package_jvm().org.goplanit.io.converter.demands.PlanitDemandsWriterFactory.create()
+            self._jvm.org.goplanit.io.converter.demands.PlanitDemandsWriterFactory.create()
         return PlanitDemandsWriterWrapper(java_writer)
 
     def create_reader(self,
@@ -288,9 +295,9 @@ class DemandsConverter(_ConverterBase):
         if not isinstance(demands_reader_type, DemandsReaderType): raise Exception(
             "Demands reader type provided is not of DemandsReaderType, unable to instantiate")
         elif demands_reader_type == DemandsReaderType.PLANIT:
-            return DemandsConverter.__create_planit_demands_reader(reference_zoning_reader)
+            return self.__create_planit_demands_reader(reference_zoning_reader)
         elif demands_reader_type == DemandsReaderType.TNTP:
-            return DemandsConverter.__create_tntp_demands_reader(reference_zoning_reader)
+            return self.__create_tntp_demands_reader(reference_zoning_reader)
         else:
             raise Exception("Unsupported demands reader type provided, unable to instantiate")
 
@@ -303,7 +310,7 @@ class DemandsConverter(_ConverterBase):
         if not isinstance(demands_writer_type, DemandsWriterType): raise Exception(
             "Demands writer type provided is not of DemandsWriterType, unable to instantiate")
         elif demands_writer_type == DemandsWriterType.PLANIT:
-            return DemandsConverter.__create_planit_demands_writer()
+            return self.__create_planit_demands_writer()
         else:
             raise Exception("Unsupported demands writer type provided, unable to instantiate")
 
@@ -313,17 +320,16 @@ class IntermodalConverter(_ConverterBase):
     them
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, gateway_state: GatewayState = None):
+        super().__init__(gateway_state)
 
-    @staticmethod
-    def _create_java_converter(reader_wrapper, writer_wrapper) -> IntermodalConverterWrapper:
+    def _create_java_converter(self, reader_wrapper, writer_wrapper) -> IntermodalConverterWrapper:
         """ create java intermodal converter with reader and writer wrapper provided
         :param reader_wrapper: the reader to use
         :param writer_wrapper: the writer to use
         :return created java intermodal converter
         """
-        return IntermodalConverterWrapper(GatewayState.python_2_java_gateway.jvm.org.goplanit.converter.intermodal.
+        return IntermodalConverterWrapper(self._jvm.org.goplanit.converter.intermodal.
                                           IntermodalConverterFactory.create(reader_wrapper.java, writer_wrapper.java))
 
     def convert_with_services(self, reader_wrapper: IntermodalReaderWrapper, writer_wrapper: IntermodalWriterWrapper):
@@ -339,26 +345,23 @@ class IntermodalConverter(_ConverterBase):
     #     READER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_osm_intermodal_reader(country: str) -> OsmIntermodalReaderWrapper:
-        java_intermodal_reader = GatewayState.python_2_java_gateway.jvm.org.goplanit.osm.converter.intermodal. \
+    def __create_osm_intermodal_reader(self, country: str) -> OsmIntermodalReaderWrapper:
+        java_intermodal_reader = self._jvm.org.goplanit.osm.converter.intermodal. \
             OsmIntermodalReaderFactory.create(country)
         return OsmIntermodalReaderWrapper(java_intermodal_reader)
 
-    @staticmethod
-    def __create_planit_intermodal_reader() -> PlanitIntermodalReaderWrapper:
-        java_intermodal_reader = GatewayState.python_2_java_gateway.jvm.org.goplanit.io.converter.intermodal. \
+    def __create_planit_intermodal_reader(self) -> PlanitIntermodalReaderWrapper:
+        java_intermodal_reader = self._jvm.org.goplanit.io.converter.intermodal. \
             PlanitIntermodalReaderFactory.create()
         return PlanitIntermodalReaderWrapper(java_intermodal_reader)
 
-    @staticmethod
-    def __create_gtfs_intermodal_reader(country: str,
+    def __create_gtfs_intermodal_reader(self, country: str,
                                         reference_reader: IntermodalReaderWrapper) -> PlanitIntermodalReaderWrapper:
         if not reference_reader:
             raise Exception(
                 "GTFS intermodal reader expects a reference reader to be able to construct network and zoning")
 
-        java_intermodal_reader = GatewayState.python_2_java_gateway.jvm.org.goplanit.gtfs.converter.intermodal. \
+        java_intermodal_reader = self._jvm.org.goplanit.gtfs.converter.intermodal. \
             GtfsIntermodalReaderFactory.create(country, reference_reader.java)
         return GtfsIntermodalReaderWrapper(java_intermodal_reader)
 
@@ -366,21 +369,18 @@ class IntermodalConverter(_ConverterBase):
     #     WRITER FACTORY METHODS
     #####################################
 
-    @staticmethod
-    def __create_matsim_intermodal_writer() -> MatsimIntermodalWriterWrapper:
-        java_network_writer = GatewayState.python_2_java_gateway.jvm.org.goplanit.matsim.converter. \
+    def __create_matsim_intermodal_writer(self) -> MatsimIntermodalWriterWrapper:
+        java_network_writer = self._jvm.org.goplanit.matsim.converter. \
             MatsimIntermodalWriterFactory.create()
         return MatsimIntermodalWriterWrapper(java_network_writer)
 
-    @staticmethod
-    def __create_planit_intermodal_writer() -> PlanitIntermodalWriterWrapper:
-        java_network_writer = GatewayState.python_2_java_gateway.jvm.org.goplanit.io.converter.intermodal. \
+    def __create_planit_intermodal_writer(self) -> PlanitIntermodalWriterWrapper:
+        java_network_writer = self._jvm.org.goplanit.io.converter.intermodal. \
             PlanitIntermodalWriterFactory.create()
         return PlanitIntermodalWriterWrapper(java_network_writer)
 
-    @staticmethod
-    def __create_geoio_intermodal_writer() -> GeometryIntermodalWriterWrapper:
-        java_network_writer = GatewayState.python_2_java_gateway.jvm.org.goplanit.geoio.converter.intermodal. \
+    def __create_geoio_intermodal_writer(self) -> GeometryIntermodalWriterWrapper:
+        java_network_writer = self._jvm.org.goplanit.geoio.converter.intermodal. \
             GeometryIntermodalWriterFactory.create()
         return GeometryIntermodalWriterWrapper(java_network_writer)
 
@@ -403,11 +403,11 @@ class IntermodalConverter(_ConverterBase):
 
         if intermodal_reader_type == IntermodalReaderType.OSM:
             # OSM requires country to initialise default settings
-            return IntermodalConverter.__create_osm_intermodal_reader(country)
+            return self.__create_osm_intermodal_reader(country)
         elif intermodal_reader_type == IntermodalReaderType.PLANIT:
-            return IntermodalConverter.__create_planit_intermodal_reader()
+            return self.__create_planit_intermodal_reader()
         elif intermodal_reader_type == IntermodalReaderType.GTFS:
-            return IntermodalConverter.__create_gtfs_intermodal_reader(country, reference_reader)
+            return self.__create_gtfs_intermodal_reader(country, reference_reader)
         else:
             raise Exception(f"Unsupported intermodal reader type provided {intermodal_reader_type}, "
                             f"unable to instantiate")
@@ -421,11 +421,11 @@ class IntermodalConverter(_ConverterBase):
             "writer type provided is not of IntermodalWriterType, unable to instantiate")
 
         if intermodal_writer_type == IntermodalWriterType.MATSIM:
-            return IntermodalConverter.__create_matsim_intermodal_writer()
+            return self.__create_matsim_intermodal_writer()
         elif intermodal_writer_type == IntermodalWriterType.PLANIT:
-            return IntermodalConverter.__create_planit_intermodal_writer()
+            return self.__create_planit_intermodal_writer()
         elif intermodal_writer_type == IntermodalWriterType.SHAPE:
-            return IntermodalConverter.__create_geoio_intermodal_writer()
+            return self.__create_geoio_intermodal_writer()
         else:
             raise Exception("Unsupported intermodal writer type provided, unable to instantiate")
 
@@ -436,37 +436,36 @@ class ConverterFactory:
     one can convert an Open Street Map network to a PLANit network using this functionality.
     """
 
-    def __init__(self):
+    def __init__(self, gateway_state: GatewayState = None):
         """ initialise the converter, requires gateway to be up and running, if not throw exception
+        :param gateway_state: the gateway state (of the Planit instance) the created converters use, default
+        GatewayState.of() upon creating a converter
         """
+        self._gateway_state = gateway_state
 
-    @staticmethod
-    def __create_network_converter() -> NetworkConverter:
+    def __create_network_converter(self, gateway_state: GatewayState) -> NetworkConverter:
         """ Factory method to create a network converter proxy that allows the user to create readers and writers and
         exposes a convert method that performs the actual conversion
         """
-        return NetworkConverter()
+        return NetworkConverter(gateway_state)
 
-    @staticmethod
-    def __create_zoning_converter() -> ZoningConverter:
+    def __create_zoning_converter(self, gateway_state: GatewayState) -> ZoningConverter:
         """ Factory method to create a zoning converter proxy that allows the user to create readers and writers and
         exposes a convert method that performs the actual conversion
         """
-        return ZoningConverter()
+        return ZoningConverter(gateway_state)
 
-    @staticmethod
-    def __create_intermodal_converter() -> IntermodalConverter:
+    def __create_intermodal_converter(self, gateway_state: GatewayState) -> IntermodalConverter:
         """ Factory method to create an intermodal converter proxy that allows the user to create readers and writers
         and exposes a convert method that performs the actual conversion
         """
-        return IntermodalConverter()
+        return IntermodalConverter(gateway_state)
 
-    @staticmethod
-    def __create_demands_converter() -> IntermodalConverter:
+    def __create_demands_converter(self, gateway_state: GatewayState) -> IntermodalConverter:
         """ Factory method to create a demands converter proxy that allows the user to create readers and writers
         and exposes a convert method that performs the actual conversion
         """
-        return DemandsConverter()
+        return DemandsConverter(gateway_state)
 
     def create(self, converter_type: ConverterType) -> _ConverterBase:
         """ factory method to create a converter of a given type
@@ -476,19 +475,20 @@ class ConverterFactory:
 
         :return a network, zoning, or intermodal converter
         """
-        if not GatewayState.gateway_is_running: raise Exception('A ConverterFactory can only be used when connection '
+        gateway_state = self._gateway_state or GatewayState.of()
+        if not gateway_state.gateway_is_running: raise Exception('A ConverterFactory can only be used when connection '
                                                                 'to JVM present, connection not available')
 
         if not isinstance(converter_type, ConverterType): raise Exception("Converter type provided is not of "
                                                                           "ConverterType, unable to instantiate")
 
         if converter_type == ConverterType.NETWORK:
-            return self.__create_network_converter()
+            return self.__create_network_converter(gateway_state)
         elif converter_type == ConverterType.ZONING:
-            return self.__create_zoning_converter()
+            return self.__create_zoning_converter(gateway_state)
         elif converter_type == ConverterType.DEMANDS:
-            return self.__create_demands_converter()
+            return self.__create_demands_converter(gateway_state)
         elif converter_type == ConverterType.INTERMODAL:
-            return self.__create_intermodal_converter()
+            return self.__create_intermodal_converter(gateway_state)
         else:
             raise Exception(f"Invalid converter type {converter_type} provided, no converter could be created")
@@ -108,7 +108,7 @@ class IntermodalWriterWrapper(WriterWrapper):
         super().__init__(java_counterpart)
 
     def set_id_mapper_type(self, id_mapper_type: IdMapperType):
-        self.setIdMapperType(GatewayUtils.to_java_enum(id_mapper_type))
+        self.setIdMapperType(GatewayUtils.to_java_enum(id_mapper_type, self.gateway_state))
 
     def get_id_mapper_type(self) -> IdMapperType:
         return IdMapperType.from_java(self.getIdMapperType())
@@ -243,29 +243,29 @@ class OsmPublicTransportSettingsWrapper(ReaderSettingsWrapper):
     def overwrite_waiting_area_of_stop_location(
             self, osm_stop_location_id: int, osm_entity_type: OsmEntityType, osm_waiting_area_id: int):
         self.overwriteWaitingAreaOfStopLocation(
-            osm_stop_location_id, GatewayUtils.to_java_enum(osm_entity_type), osm_waiting_area_id)
+            osm_stop_location_id, GatewayUtils.to_java_enum(osm_entity_type, self.gateway_state), osm_waiting_area_id)
 
     def overwrite_waiting_area_nominated_osm_way_for_stop_location(
             self, osm_waiting_area_id: int, osm_entity_type: OsmEntityType, osm_way_id):
         self.overwriteWaitingAreaNominatedOsmWayForStopLocation(
-            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type), osm_way_id)
+            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type, self.gateway_state), osm_way_id)
 
     def has_waiting_area_nominated_osm_way_for_stop_location(
             self, osm_waiting_area_id: int, osm_entity_type: OsmEntityType) -> bool:
         return self.hasWaitingAreaNominatedOsmWayForStopLocation(
-            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type))
+            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type, self.gateway_state))
 
     def overwrite_waiting_area_mode_access(
             self, osm_waiting_area_id: int, osm_entity_type: OsmEntityType, mode_access: List[str]):
-        _str_class = GatewayState.python_2_java_gateway.jvm.java.lang.String
+        _str_class = self.gateway_state.jvm.java.lang.String
         self.overwriteWaitingAreaModeAccess(
-            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type),
-            GatewayUtils.to_java_array(_str_class, mode_access))
+            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type, self.gateway_state),
+            GatewayUtils.to_java_array(_str_class, mode_access, self.gateway_state))
 
     def get_overwritten_waiting_area_mode_access(
             self, osm_waiting_area_id: int, osm_entity_type: OsmEntityType) -> List[str]:
         return self.getOverwrittenWaitingAreaModeAccess(
-            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type))
+            osm_waiting_area_id, GatewayUtils.to_java_enum(osm_entity_type, self.gateway_state))
 
 
 class OsmIntermodalReaderSettingsWrapper(ReaderSettingsWrapper):
@@ -367,7 +367,7 @@ class OsmHighwaySettingsWrapper(ReaderSettingsWrapper):
         return PredefinedModeType.from_java(self.java.getMappedPlanitRoadMode(osm_mode))
 
     def get_mapped_osm_road_modes(self, predefined_mode_type: PredefinedModeType) -> Set[str]:
-        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type)
+        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type, self.gateway_state)
         result = self.java.getMappedOsmRoadModes(java_predefined_mode_type)
         return result
 
@@ -387,7 +387,7 @@ class OsmRailwaySettingsWrapper(ReaderSettingsWrapper):
         return PredefinedModeType.from_java(self.java.getMappedPlanitRailMode(osm_mode))
 
     def get_mapped_osm_rail_modes(self, predefined_mode_type: PredefinedModeType) -> Set[str]:
-        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type)
+        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type, self.gateway_state)
         result = self.java.getMappedOsmRailModes(java_predefined_mode_type)
         return result
 
@@ -408,7 +408,7 @@ class OsmWaterwaySettingsWrapper(ReaderSettingsWrapper):
         return PredefinedModeType.from_java(self.java.getMappedPlanitWaterMode(osm_mode))
 
     def get_mapped_osm_water_modes(self, predefined_mode_type: PredefinedModeType) -> Set[str]:
-        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type)
+        java_predefined_mode_type = GatewayUtils.to_java_enum(predefined_mode_type, self.gateway_state)
         result = self.java.getMappedOsmWaterModes(java_predefined_mode_type)
         return result
 
@@ -440,14 +440,13 @@ class GtfsServicesReaderSettingsWrapper(ReaderSettingsWrapper):
     """ Wrapper around settings for GTFS services used by converter
     """
 
-    @staticmethod
-    def __create_java_day_of_week(day_of_week: DayOfWeek):
+    def __create_java_day_of_week(self, day_of_week: DayOfWeek):
         """ convert Python day of week enum to Java day of week enum.
 
         :param day_of_week: type to convert
         :return java counterpart
         """
-        return GatewayState.python_2_java_gateway.entry_point.createEnum(
+        return self.gateway_state.entry_point.createEnum(
             day_of_week.java_class_name(), day_of_week.value)
 
     def __init__(self, java_counterpart):
@@ -459,7 +458,7 @@ class GtfsServicesReaderSettingsWrapper(ReaderSettingsWrapper):
 
     @day_of_week.setter
     def day_of_week(self, value: DayOfWeek):
-        self.java.setDayOfWeek(GtfsServicesReaderSettingsWrapper.__create_java_day_of_week(value))
+        self.java.setDayOfWeek(self.__create_java_day_of_week(value))
 
     def get_time_period_filters(self):
         filters: java_collections.Set = self.java.getTimePeriodFilters()
@@ -484,7 +483,7 @@ class GtfsZoningReaderSettingsWrapper(ReaderSettingsWrapper):
     def add_overwrite_gtfs_stop_transfer_zone_mapping(
             self, gtfs_stop_id: str, transfer_zone_id: Union[int, str], id_mapper_type: IdMapperType):
         self.java.addOverwriteGtfsStopTransferZoneMapping(
-            gtfs_stop_id, transfer_zone_id, GatewayUtils.to_java_enum(id_mapper_type))
+            gtfs_stop_id, transfer_zone_id, GatewayUtils.to_java_enum(id_mapper_type, self.gateway_state))
 
     def get_overwritten_gtfs_stop_transfer_zone_mapping(self, gtfs_stop_id: str) -> List[
         Tuple[Union[int, str], IdMapperType]]:
@@ -508,7 +507,7 @@ class GtfsZoningReaderSettingsWrapper(ReaderSettingsWrapper):
     def overwrite_gtfs_stop_to_link_mapping(
             self, gtfs_stop_id: str, planit_link_id: Union[int, str], id_mapper_type: IdMapperType):
         self.java.overwriteGtfsStopToLinkMapping(
-            gtfs_stop_id, planit_link_id, GatewayUtils.to_java_enum(id_mapper_type))
+            gtfs_stop_id, planit_link_id, GatewayUtils.to_java_enum(id_mapper_type, self.gateway_state))
 
     def get_overwritten_gtfs_stop_to_link_mapping(self, gtfs_stop_id: str) -> Tuple[Union[int, str], IdMapperType]:
         java_planit_pair = self.java.getOverwrittenGtfsStopToLinkMapping(gtfs_stop_id)
@@ -678,31 +677,31 @@ class TntpNetworkReaderSettingsWrapper(ReaderSettingsWrapper):
         super().__init__(java_counterpart)
 
     def set_network_file_columns(self, network_file_columns: Dict[TntpFileColumnType, int]):
-        java_hash_map = GatewayUtils.get_package_jvm().java.util.HashMap()
+        java_hash_map = GatewayUtils.get_package_jvm(self.gateway_state).java.util.HashMap()
         for column_type, column_index in network_file_columns.items():
-            java_hash_map[GatewayUtils.to_java_enum(column_type)] = column_index
+            java_hash_map[GatewayUtils.to_java_enum(column_type, self.gateway_state)] = column_index
         self.java.setNetworkFileColumns(java_hash_map)
 
     def set_speed_units(self, speed_units: SpeedUnits):
-        self.java.setSpeedUnits(GatewayUtils.to_java_enum(speed_units))
+        self.java.setSpeedUnits(GatewayUtils.to_java_enum(speed_units, self.gateway_state))
 
     def get_speed_units(self) -> SpeedUnits:
         return SpeedUnits.from_java(self.java.getSpeedUnits())
 
     def set_time_units(self, time_units: TimeUnits):
-        self.java.setTimeUnits(GatewayUtils.to_java_enum(time_units))
+        self.java.setTimeUnits(GatewayUtils.to_java_enum(time_units, self.gateway_state))
 
     def get_time_units(self) -> TimeUnits:
         return TimeUnits.from_java(self.java.getTimeUnits())
 
     def set_length_units(self, length_units: LengthUnits):
-        self.java.setLengthUnits(GatewayUtils.to_java_enum(length_units))
+        self.java.setLengthUnits(GatewayUtils.to_java_enum(length_units, self.gateway_state))
 
     def get_length_units(self) -> LengthUnits:
         return LengthUnits.from_java(self.java.getLengthUnits())
 
     def set_capacity_period(self, duration: float, time_units: TimeUnits):
-        self.java.setCapacityPeriod(duration, GatewayUtils.to_java_enum(time_units))
+        self.java.setCapacityPeriod(duration, GatewayUtils.to_java_enum(time_units, self.gateway_state))
 
     def get_capacity_period_units(self) -> TimeUnits:
         return TimeUnits.from_java(self.java.getCapacityPeriodUnits())
@@ -711,7 +710,7 @@ class TntpNetworkReaderSettingsWrapper(ReaderSettingsWrapper):
         return self.java.getCapacityPeriodDuration()
 
     def set_free_flow_travel_time_units(self, time_units: TimeUnits):
-        self.java.setFreeFlowTravelTimeUnits(GatewayUtils.to_java_enum(time_units))
+        self.java.setFreeFlowTravelTimeUnits(GatewayUtils.to_java_enum(time_units, self.gateway_state))
 
 
 class TntpNetworkReaderWrapper(ZoningReaderWrapper):
@@ -741,10 +740,10 @@ class TntpDemandsReaderSettingsWrapper(ReaderSettingsWrapper):
         super().__init__(java_counterpart)
 
     def set_start_time_since_midnight(self, start_time: Union[float, int], time_units: TimeUnits):
-        self.java.setStartTimeSinceMidnight(start_time, GatewayUtils.to_java_enum(time_units))
+        self.java.setStartTimeSinceMidnight(start_time, GatewayUtils.to_java_enum(time_units, self.gateway_state))
 
     def set_time_period_duration(self, duration: Union[float, int], time_units: TimeUnits):
-        self.java.setTimePeriodDuration(duration, GatewayUtils.to_java_enum(time_units))
+        self.java.setTimePeriodDuration(duration, GatewayUtils.to_java_enum(time_units, self.gateway_state))
 
 
 class TntpDemandsReaderWrapper(DemandsReaderWrapper):
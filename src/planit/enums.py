@@ -200,6 +200,32 @@ class OutputProperty(Enum):
     def java_class_name(self) -> str:
         return "org.goplanit.output.property.OutputPropertyType"
 
+    def numpy_dtype(self) -> str:
+        """ the numpy dtype used when collecting the values of this property in bulk. Xml ids, external ids, names,
+        locations and path strings are textual (object), the remaining ids are integer based and all other properties
+        are floating point based
+
+        :return numpy dtype name
+        """
+        if self.value.endswith("_XML_ID") or self.value.endswith("_EXTERNAL_ID") or self.value.endswith("_LOCATION") \
+                or self in (OutputProperty.LINK_SEGMENT_TYPE_NAME, OutputProperty.PATH_STRING):
+            return "object"
+        if self.value.endswith("_ID") or self == OutputProperty.ITERATION_INDEX:
+            return "int64"
+        return "float64"
+
+    def pandas_dtype(self) -> str:
+        """ the pandas dtype used when collecting the values of this property in a DataFrame. Differs from the numpy
+        dtype in that xml ids are categorical (few distinct values repeated across many rows) and the remaining textual
+        properties use the dedicated pandas string dtype
+
+        :return pandas dtype name
+        """
+        if self.value.endswith("_XML_ID"):
+            return "category"
+        numpy_dtype = self.numpy_dtype()
+        return "string" if numpy_dtype == "object" else numpy_dtype
+
 
 class OutputType(Enum):
     """ Enum for the different output types the user can choose to activate, 
@@ -1,11 +1,27 @@
 import datetime
+import glob
+import json
 import os
+import queue
 import re
+import socket
 import sys
+import tempfile
+import threading
+import time
 from builtins import staticmethod
 from enum import Enum
+from functools import lru_cache
+from typing import Dict, List, Optional
 
+import numpy as np
 from py4j import java_collections
+from py4j.java_gateway import CallbackServerParameters
+from py4j.java_gateway import DEFAULT_ADDRESS
+from py4j.protocol import Py4JError
+from py4j.protocol import Py4JJavaError
+
+from planit import Version
 
 
 class GatewayConfig(object):
@@ -23,12 +39,165 @@ class GatewayConfig(object):
     PLANIT_SHARE = os.path.join('planit', '*')
     PY4J_SHARE = os.path.join('py4j', '*')
 
-    # the main entry point of the Java gateway implementation for PLANit
+    # file in which the resolved classpath is cached across Python processes (keyed by PLANit version and probed
+    # locations), None to only cache it within the current process
+    CLASSPATH_CACHE_FILE = os.path.join(tempfile.gettempdir(), 'planit_classpath_cache.json')
+
+    # the main entry point of the Java gateway implementation for PLANit, each Planit instance creates one on the Py4J
+    # gateway server it connects to (see PY4J_GATEWAY_SERVER_CLASS)
     JAVA_GATEWAY_WRAPPER_CLASS = 'org.goplanit.python.PLANitJ2Py'
 
+    # address and port the Java gateway server of a standalone Planit instance listens on, with port 0 the JVM binds a
+    # free port for each instance (and announces it), such that multiple instances can run concurrently
+    JAVA_GATEWAY_ADDRESS = DEFAULT_ADDRESS
+    JAVA_GATEWAY_PORT = 0
+
+    # port of the shared PLANit gateway server that Planit instances attach to when not standalone. Both the shared
+    # and a standalone server are plain Py4J gateway servers, on which each client creates its own PLANit entry point.
+    # A standalone server is started with --die-on-broken-pipe and port 0, it then prints the port it bound on the
+    # first line of its standard output, see GatewayUtils.read_java_gateway_port
+    SERVER_PORT = 25340
+    PY4J_GATEWAY_SERVER_CLASS = 'py4j.GatewayServer'
+
+    # maximum time (seconds) to wait for the Java gateway to accept connections after starting the JVM, and the
+    # initial and maximum interval (seconds) between consecutive probes, the interval doubles after each failed probe
+    STARTUP_TIMEOUT = 60.0
+    STARTUP_POLL_INTERVAL = 0.01
+    STARTUP_POLL_MAX_INTERVAL = 0.5
+
+    # maximum time (seconds) to wait for the JVM of a standalone Planit instance to exit once its gateway is shut down,
+    # after which it is killed
+    SHUTDOWN_TIMEOUT = 10.0
+
+    # separator used to join the string representation of all entries of a Java array into a single string on the Java
+    # side (unit separator control character), so it can be transferred in a single call. It is not expected to be
+    # present in any PLANit id or value
+    BULK_STRING_SEPARATOR = '\u001f'
+    # separator used to join strings that are themselves joined by BULK_STRING_SEPARATOR, e.g., rows of entries (record
+    # separator control character)
+    BULK_RECORD_SEPARATOR = '\u001e'
+
+    # minimum number of elements of a Python list, set, or dict of primitives for it to be transferred to Java in bulk
+    # (a constant number of calls), smaller ones are transferred per element (a call per element)
+    BULK_CONVERSION_MIN_SIZE = 16
+
+    # maximum number of Python to Java style name conversions memoized by GatewayUtils.to_camelcase. Read when the
+    # memoization is created, i.e., upon the first conversion, so changes take effect after clear_camelcase_cache
+    CAMELCASE_CACHE_SIZE = 4096
+
+    # maximum number of parsed initial cost files kept per gateway session (least recently used ones are evicted first),
+    # see InitialCostCache, 0 disables caching. Entries are only reused by repeated runs of the same project
+    INITIAL_COST_CACHE_SIZE = 32
+
+    # default JVM settings, used for each option not set on the JvmOptions provided to Planit (None means JVM default).
+    # JAVA_HOME selects the Java installation, when absent java is taken from the PATH
+    JAVA_HOME = None
+    # maximum and initial heap size, e.g., '48g', passed on as -Xmx and -Xms
+    JVM_MAX_HEAP = None
+    JVM_MIN_HEAP = None
+    # garbage collector, one of JvmOptions.GARBAGE_COLLECTORS
+    JVM_GC = None
+    # -XX flags with or without the -XX: prefix, e.g., ['+UseStringDeduplication', 'MaxGCPauseMillis=200']
+    JVM_XX_FLAGS = []
+    # any other JVM options passed on as is, e.g., ['-Dfile.encoding=UTF-8']
+    JVM_EXTRA_OPTIONS = []
+
+
+class JvmOptions(object):
+    """ structured options of the JVM started for a Planit instance (or the shared server), each option not set falls
+    back on its GatewayConfig default
+    """
+
+    # supported garbage collectors and the flag selecting them
+    GARBAGE_COLLECTORS = {
+        'G1': '-XX:+UseG1GC',
+        'PARALLEL': '-XX:+UseParallelGC',
+        'SERIAL': '-XX:+UseSerialGC',
+        'Z': '-XX:+UseZGC',
+        'SHENANDOAH': '-XX:+UseShenandoahGC'}
+
+    def __init__(self, max_heap: str = None, min_heap: str = None, gc: str = None, xx_flags: List[str] = None,
+                 extra_options: List[str] = None, java_home: str = None, env: Dict[str, str] = None):
+        """ Initialiser of the JVM options
+
+        :param max_heap: maximum heap size, e.g., '48g'
+        :param min_heap: initial heap size, e.g., '8g'
+        :param gc: garbage collector, one of GARBAGE_COLLECTORS (case insensitive)
+        :param xx_flags: -XX flags with or without the -XX: prefix, e.g., ['MaxGCPauseMillis=200']
+        :param extra_options: other JVM options passed on as is
+        :param java_home: Java installation to use
+        :param env: environment variables of the JVM process, overriding the ones of the current process
+        """
+        if gc is not None and gc.upper() not in JvmOptions.GARBAGE_COLLECTORS:
+            raise Exception(f'Unsupported garbage collector {gc}, choose one of '
+                            f'{list(JvmOptions.GARBAGE_COLLECTORS)}')
+        self.max_heap = max_heap
+        self.min_heap = min_heap
+        self.gc = gc
+        self.xx_flags = xx_flags
+        self.extra_options = extra_options
+        self.java_home = java_home
+        self.env = env
+
+    def effective(self):
+        """ the effective options, i.e., with the GatewayConfig default for each option that is not set
+
+        :return effective JVM options
+        """
+        return JvmOptions(
+            max_heap=self.max_heap if self.max_heap is not None else GatewayConfig.JVM_MAX_HEAP,
+            min_heap=self.min_heap if self.min_heap is not None else GatewayConfig.JVM_MIN_HEAP,
+            gc=self.gc if self.gc is not None else GatewayConfig.JVM_GC,
+            xx_flags=list(self.xx_flags if self.xx_flags is not None else GatewayConfig.JVM_XX_FLAGS),
+            extra_options=list(self.extra_options if self.extra_options is not None
+                               else GatewayConfig.JVM_EXTRA_OPTIONS),
+            java_home=self.java_home if self.java_home is not None else GatewayConfig.JAVA_HOME,
+            env=dict(self.env) if self.env is not None else {})
+
+    def java_executable(self) -> str:
+        """ :return the java executable of the Java installation, java on the PATH when no Java home is set
+        """
+        if self.java_home is None:
+            return 'java'
+        return os.path.join(self.java_home, 'bin', 'java')
+
+    def to_arguments(self) -> List[str]:
+        """ :return the JVM command line arguments of these options (without GatewayConfig defaults)
+        """
+        arguments = []
+        if self.max_heap is not None:
+            arguments.append('-Xmx' + self.max_heap)
+        if self.min_heap is not None:
+            arguments.append('-Xms' + self.min_heap)
+        if self.gc is not None:
+            arguments.append(JvmOptions.GARBAGE_COLLECTORS[self.gc.upper()])
+        for xx_flag in self.xx_flags or []:
+            arguments.append(xx_flag if xx_flag.startswith('-XX:') else '-XX:' + xx_flag)
+        arguments.extend(self.extra_options or [])
+        return arguments
+
+    def to_environment(self) -> Optional[Dict[str, str]]:
+        """ :return the environment of the JVM process, None to inherit the current one unchanged
+        """
+        if not self.env and self.java_home is None:
+            return None
+        environment = dict(os.environ)
+        if self.java_home is not None:
+            environment['JAVA_HOME'] = self.java_home
+        environment.update(self.env or {})
+        return environment
+
+    def __repr__(self):
+        return f'JvmOptions({self.__dict__})'
+
 
 class GatewayState(object):
-    """ the access to the Java side 
+    """ the access to the Java side. Each Planit instance owns a gateway state with its own JVM process (when
+    standalone), Py4J gateway and PLANit entry point, so multiple instances can be used concurrently. Wrappers resolve
+    the gateway state of their Java counterpart via GatewayState.of.
+
+    The class level attributes mirror the most recently started gateway state, such that code without an owning
+    instance (single instance usage) keeps accessing the Java side as before
     """
 
     # Create a static variable which flags if the java server already is running or not
@@ -38,66 +207,837 @@ class GatewayState(object):
     python_2_java_gateway = None
     # will contain reference to the Java project instance once the gateway is up and running        
     planit_project = None
+    # the PLANit (PLANitJ2Py) entry point on the Java side, i.e., an instance created for the owning Planit instance
+    # on the gateway server
+    entry_point = None
+    # duration (seconds) of each startup phase of the most recent gateway start, i.e., classpath construction
+    # (classpath), spawning the JVM process (jvm_spawn), JVM accepting connections which includes class loading
+    # (jvm_listening), completing the first call (first_call), and creating the PLANit entry point (entry_point, part of
+    # first_call when attaching to the shared server)
+    startup_timings = {}
+    # Java classes accessed via GatewayUtils.get_java_class by their fully qualified name
+    java_classes = {}
+    # unbound method handles by Java class name, method name and number of parameters, see
+    # GatewayUtils.invoke_per_position
+    java_method_handles = {}
+
+    # the gateway state the class level attributes mirror
+    _default = None
+    # running gateway states by their Py4J gateway client, used to resolve the gateway state of Java objects
+    _running = {}
+
+    def __init__(self):
+        self.gateway_is_running = False
+        self.planit_java_process = None
+        self.python_2_java_gateway = None
+        self.planit_project = None
+        self.entry_point = None
+        self.startup_timings = {}
+        self.java_classes = {}
+        self.java_method_handles = {}
+        # the port the gateway server of this state listens on
+        self.port = None
+        # the effective JVM options and full java command the JVM of this state was started with (if started by it)
+        self.jvm_options = None
+        self.java_command = None
+
+    @property
+    def jvm(self):
+        """ access to the jvm view of this gateway state, see GatewayUtils.get_package_jvm
+        """
+        return self.python_2_java_gateway.jvm
+
+    def register(self):
+        """ register this gateway state as running, its gateway and entry point should be available. It becomes the
+        default gateway state mirrored by the class level attributes
+        """
+        self.gateway_is_running = True
+        GatewayState._running[self.python_2_java_gateway._gateway_client] = self
+        GatewayState.__mirror(self)
+
+    def unregister(self):
+        """ unregister this gateway state, when it is the default, the most recently registered remaining running
+        gateway state (if any) becomes the default
+        """
+        if self.python_2_java_gateway is not None:
+            GatewayState._running.pop(self.python_2_java_gateway._gateway_client, None)
+        self.gateway_is_running = False
+        if GatewayState._default is self:
+            GatewayState.__mirror(next(reversed(GatewayState._running.values()), None))
+
+    @staticmethod
+    def of(java_object=None):
+        """ the gateway state a Java object was created by, i.e., the gateway state of the Planit instance owning it
+
+        :param java_object: Py4j java object (or array, collection, member), when absent or unknown the default is
+        provided
+        :return the gateway state
+        """
+        # Py4J java objects, arrays and collections hold their gateway client as _gateway_client, java members (bound
+        # methods) as gateway_client
+        gateway_client = getattr(java_object, '_gateway_client', None) or getattr(java_object, 'gateway_client', None)
+        if gateway_client is not None:
+            gateway_state = GatewayState._running.get(gateway_client)
+            if gateway_state is not None:
+                return gateway_state
+        return GatewayState._default if GatewayState._default is not None else GatewayState
+
+    @staticmethod
+    def __mirror(gateway_state):
+        """ mirror the given gateway state in the class level attributes, or reset them when None
+        """
+        GatewayState._default = gateway_state
+        GatewayState.gateway_is_running = gateway_state is not None
+        GatewayState.planit_java_process = gateway_state.planit_java_process if gateway_state else None
+        GatewayState.python_2_java_gateway = gateway_state.python_2_java_gateway if gateway_state else None
+        GatewayState.entry_point = gateway_state.entry_point if gateway_state else None
+        GatewayState.startup_timings = gateway_state.startup_timings if gateway_state else {}
+        GatewayState.java_classes = gateway_state.java_classes if gateway_state else {}
+        GatewayState.java_method_handles = gateway_state.java_method_handles if gateway_state else {}
+
+
+def _to_camelcase(s):
+    """ regex based conversion of a Python style string into a Java style string, memoized by GatewayUtils
+    """
+    return re.sub(r'(?!^)_([a-zA-Z])', lambda m: m.group(1).upper(), s)
 
 
 class GatewayUtils(object):
     """ Utilities for the Java gateway
     """
 
+    # memoized _to_camelcase, created upon first use sized by GatewayConfig.CAMELCASE_CACHE_SIZE, see to_camelcase
+    _memoized_camelcase = None
+
+    # resolved classpath (list of jars) by classpath cache key, see resolve_classpath
+    _classpath_cache = {}
+
+    # Java primitive types that can be decoded from a byte buffer in bulk, with the (big endian, as is the ByteBuffer
+    # default) NumPy type of their binary representation and the ByteBuffer view decoding them
+    __PRIMITIVE_BUFFERS = {
+        'int': ('>i4', 'asIntBuffer'),
+        'long': ('>i8', 'asLongBuffer'),
+        'short': ('>i2', 'asShortBuffer'),
+        'byte': ('>i1', None),
+        'double': ('>f8', 'asDoubleBuffer'),
+        'float': ('>f4', 'asFloatBuffer')}
+
+    __BOXED_PRIMITIVES = {
+        'java.lang.Integer': 'int',
+        'java.lang.Long': 'long',
+        'java.lang.Short': 'short',
+        'java.lang.Byte': 'byte',
+        'java.lang.Double': 'double',
+        'java.lang.Float': 'float'}
+
     @staticmethod
     def to_camelcase(s):
         """ convert a Python style string into a Java style string regarding method calls and variable names.
         Especially useful to avoid having to call Java functions as Java functions but one can call them as Python
-        functions which are dynamically changed to their Java counterparts
+        functions which are dynamically changed to their Java counterparts. Conversions are memoized (LRU bounded by
+        GatewayConfig.CAMELCASE_CACHE_SIZE), see camelcase_cache_info
+        """
+        memoized_camelcase = GatewayUtils._memoized_camelcase
+        if memoized_camelcase is None:
+            memoized_camelcase = GatewayUtils._memoized_camelcase = \
+                lru_cache(maxsize=GatewayConfig.CAMELCASE_CACHE_SIZE)(_to_camelcase)
+        return memoized_camelcase(s)
+
+    @staticmethod
+    def camelcase_cache_info():
+        """ instrumentation of the memoized name conversion in to_camelcase
+
+        :return dict with the hits and misses (a miss is a regex conversion), and the current and maximum number of
+        memoized conversions (size, max_size)
         """
-        return re.sub(r'(?!^)_([a-zA-Z])', lambda m: m.group(1).upper(), s)
+        memoized_camelcase = GatewayUtils._memoized_camelcase
+        if memoized_camelcase is None:
+            hits, misses, max_size, size = 0, 0, GatewayConfig.CAMELCASE_CACHE_SIZE, 0
+        else:
+            hits, misses, max_size, size = memoized_camelcase.cache_info()
+        return {'hits': hits,
+                'misses': misses,
+                'size': size,
+                'max_size': max_size}
 
     @staticmethod
-    def convert_args_to_java(args):
+    def clear_camelcase_cache():
+        """ clear the memoized name conversions and reset their instrumentation. The memoization is recreated upon the
+        next conversion, sized by the then current GatewayConfig.CAMELCASE_CACHE_SIZE
+        """
+        GatewayUtils._memoized_camelcase = None
+
+    @staticmethod
+    def resolve_classpath() -> List[str]:
+        """ Resolve the jars comprising the PLANit and Py4J dependencies. Only existing share locations are probed for
+        jars (IDE run, release environment, and venv environment which requires a different path due to a bug in
+        venv). The result is cached by PLANit version and probed locations, within the process as well as in
+        GatewayConfig.CLASSPATH_CACHE_FILE, such that subsequent starts skip discovery as long as the jars still exist
+
+        :return list of jar file locations
+        """
+        # find the location of this file, so that other directories can be located relative to it
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        share_patterns = [
+            os.path.join(dir_path, GatewayConfig.IDE_SHARE_PATH, GatewayConfig.PLANIT_SHARE),
+            os.path.join(dir_path, GatewayConfig.IDE_SHARE_PATH, GatewayConfig.PY4J_SHARE),
+            os.path.join(GatewayConfig.RELEASE_SHARE_PATH, GatewayConfig.PLANIT_SHARE),
+            os.path.join(GatewayConfig.RELEASE_SHARE_PATH, GatewayConfig.PY4J_SHARE),
+            os.path.join(GatewayConfig.VENV_RELEASE_SHARE_PATH, GatewayConfig.PLANIT_SHARE),
+            os.path.join(GatewayConfig.VENV_RELEASE_SHARE_PATH, GatewayConfig.PY4J_SHARE)]
+        cache_key = Version.planit + os.pathsep + os.pathsep.join(share_patterns)
+
+        jars = GatewayUtils._classpath_cache.get(cache_key)
+        if jars is None:
+            jars = GatewayUtils.__read_classpath_cache_file().get(cache_key)
+        if jars is not None and all(os.path.isfile(jar) for jar in jars):
+            GatewayUtils._classpath_cache[cache_key] = jars
+            return jars
+
+        jars = []
+        probed_dirs = set()
+        for share_pattern in share_patterns:
+            share_dir = os.path.realpath(os.path.dirname(share_pattern))
+            # release and venv locations may coincide
+            if share_dir in probed_dirs or not os.path.isdir(share_dir):
+                continue
+            probed_dirs.add(share_dir)
+            jars.extend(sorted(jar for jar in glob.glob(os.path.join(share_dir, '*')) if jar.lower().endswith('.jar')))
+        if not jars:
+            raise Exception(f'No PLANit jars found, looked in {[os.path.dirname(p) for p in share_patterns]}')
+
+        GatewayUtils._classpath_cache[cache_key] = jars
+        GatewayUtils.__write_classpath_cache_file(cache_key, jars)
+        return jars
+
+    @staticmethod
+    def __read_classpath_cache_file() -> Dict[str, List[str]]:
+        """ read the classpath cache file, an absent or unreadable file is considered empty
+        """
+        if GatewayConfig.CLASSPATH_CACHE_FILE is None:
+            return {}
+        try:
+            with open(GatewayConfig.CLASSPATH_CACHE_FILE, 'r') as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def __write_classpath_cache_file(cache_key: str, jars: List[str]):
+        """ add the resolved classpath to the classpath cache file, failing to do so only disables caching across
+        processes
+        """
+        if GatewayConfig.CLASSPATH_CACHE_FILE is None:
+            return
+        classpath_cache = GatewayUtils.__read_classpath_cache_file()
+        classpath_cache[cache_key] = jars
+        try:
+            # write to a process specific file first, so concurrently starting processes never read a partial file
+            temp_file_name = f'{GatewayConfig.CLASSPATH_CACHE_FILE}.{os.getpid()}'
+            with open(temp_file_name, 'w') as cache_file:
+                json.dump(classpath_cache, cache_file)
+            os.replace(temp_file_name, GatewayConfig.CLASSPATH_CACHE_FILE)
+        except OSError:
+            pass
+
+    @staticmethod
+    def read_java_gateway_port(java_process, timeout: float = None) -> int:
+        """ the port the Java gateway server of a process listens on, as announced on the first line of its standard
+        output (so the process should be started with stdout=subprocess.PIPE). Its remaining output is forwarded to
+        sys.stdout by a daemon thread, so the process never blocks on a full pipe
+
+        :param java_process: the process running the gateway server
+        :param timeout: maximum time to wait for the port in seconds, default GatewayConfig.STARTUP_TIMEOUT
+        :return the port
+        """
+        timeout = timeout or GatewayConfig.STARTUP_TIMEOUT
+        first_lines = queue.Queue()
+
+        def forward_output():
+            first_lines.put(java_process.stdout.readline())
+            for line in iter(java_process.stdout.readline, b''):
+                sys.stdout.write(line.decode(errors='replace'))
+        threading.Thread(target=forward_output, daemon=True).start()
+
+        try:
+            first_line = first_lines.get(timeout=timeout)
+        except queue.Empty:
+            raise Exception(f'PLANit java interface did not announce its port after waiting {timeout} seconds')
+        try:
+            port = int(first_line.strip())
+        except ValueError:
+            port = None
+        if port is None or not 0 < port < 65536:
+            raise Exception(f'PLANit java interface announced {first_line!r} rather than its port, exit code '
+                            f'{java_process.poll()}')
+        return port
+
+    @staticmethod
+    def start_callback_server(gateway_state=None):
+        """ start the Py4J callback server of the gateway (once), which allows Java to call Python objects implementing
+        a Java interface. It listens on a free port, which is passed on to the Java side. Only available for a
+        standalone gateway, as the Java gateway server has a single callback client, i.e., with a shared server
+        callbacks of one client would be sent to another
+
+        :param gateway_state: gateway state to access, default GatewayState.of()
+        """
+        gateway_state = gateway_state or GatewayState.of()
+        if not gateway_state.gateway_is_running:
+            raise Exception('PLANit java interface not available')
+        if gateway_state.planit_java_process is None:
+            raise Exception('Java to Python callbacks require a standalone PLANit java interface')
+        gateway = gateway_state.python_2_java_gateway
+        if gateway.get_callback_server() is None:
+            gateway.start_callback_server(CallbackServerParameters(
+                address=GatewayConfig.JAVA_GATEWAY_ADDRESS, port=0, daemonize=True, daemonize_connections=True))
+            gateway.java_gateway_server.resetCallbackClient(
+                gateway.java_gateway_server.getCallbackClient().getAddress(),
+                gateway.get_callback_server().get_listening_port())
+
+    @staticmethod
+    def is_java_gateway_listening(address: str, port: int) -> bool:
+        """ verify if a (Java gateway) server accepts connections on the given address and port
+
+        :param address: to probe
+        :param port: to probe
+        :return true when accepting connections, false otherwise
+        """
+        try:
+            with socket.create_connection((address, port), timeout=GatewayConfig.STARTUP_POLL_MAX_INTERVAL):
+                return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def wait_for_java_gateway(java_process, address: str = None, port: int = None, timeout: float = None):
+        """ wait until the Java gateway server accepts connections by polling its port with exponential backoff
+
+        :param java_process: the process running the gateway server, when it terminates waiting stops immediately
+        :param address: to probe, default GatewayConfig.JAVA_GATEWAY_ADDRESS
+        :param port: to probe, default GatewayConfig.JAVA_GATEWAY_PORT
+        :param timeout: maximum time to wait in seconds, default GatewayConfig.STARTUP_TIMEOUT
+        """
+        address = address or GatewayConfig.JAVA_GATEWAY_ADDRESS
+        port = port or GatewayConfig.JAVA_GATEWAY_PORT
+        deadline = time.perf_counter() + (timeout or GatewayConfig.STARTUP_TIMEOUT)
+        poll_interval = GatewayConfig.STARTUP_POLL_INTERVAL
+        while True:
+            if java_process is not None and java_process.poll() is not None:
+                raise Exception(f'PLANit java interface terminated during startup with exit code '
+                                f'{java_process.returncode}')
+            try:
+                with socket.create_connection((address, port), timeout=poll_interval):
+                    return
+            except OSError:
+                if time.perf_counter() >= deadline:
+                    raise Exception(f'PLANit java interface not available on {address}:{port} after waiting '
+                                    f'{timeout or GatewayConfig.STARTUP_TIMEOUT} seconds')
+            time.sleep(poll_interval)
+            poll_interval = min(2 * poll_interval, GatewayConfig.STARTUP_POLL_MAX_INTERVAL)
+
+    @staticmethod
+    def convert_args_to_java(args, gateway_state=None):
         """ convert passed in arguments to java versions if needed. Required for containers which cannot be mapped
-        one on one to Java. 1) Python List is converted to Java ArrayList.
+        one on one to Java. 1) Python List is converted to Java ArrayList, 2) Python set to Java HashSet, 3) Python dict
+        to Java HashMap, see to_java_list, to_java_set, and to_java_map.
 
         :param args: to convert where needed, assumed iterable
+        :param gateway_state: gateway state to create Java objects on, default GatewayState.of()
         :return converted args to use  
         """
+        gateway_state = gateway_state or GatewayState.of()
         converted_args = []
         for arg in args:
 
-            # convert Python List to Java ArrayList. For some reason the built-in converter does not work properly,
-            # so we do it ourselves but along the same lines. Main difference is instantiation of the array list via
-            # gateway
+            # convert Python containers ourselves, for some reason the built-in converter does not work properly.
+            # Main difference is instantiation via the gateway and bulk transfer of primitives
             if isinstance(arg, list):
-                java_list = GatewayState.python_2_java_gateway.jvm.java.util.ArrayList()
-                for element in arg:
-                    java_list.add(element)
-                arg = java_list
+                arg = GatewayUtils.to_java_list(arg, gateway_state)
+            elif isinstance(arg, (set, frozenset)):
+                arg = GatewayUtils.to_java_set(arg, gateway_state)
+            elif isinstance(arg, dict):
+                arg = GatewayUtils.to_java_map(arg, gateway_state)
             if isinstance(arg, datetime.time):
-                arg = GatewayUtils.to_java_local_time(arg)
+                arg = GatewayUtils.to_java_local_time(arg, gateway_state)
             converted_args.append(arg)
         return converted_args
 
     @staticmethod
-    def get_package_jvm():
+    def get_package_jvm(gateway_state=None):
         """ Convenience method to access jvm base to be supplemented with packages.
 
         for example, get_package_jvm().java.lang.String
 
-        :return GatewayState.python_2_java_gateway.jvm.java
+        :param gateway_state: gateway state to access, default GatewayState.of()
+        :return gateway_state.python_2_java_gateway.jvm
+        """
+        return (gateway_state or GatewayState.of()).python_2_java_gateway.jvm
+
+    @staticmethod
+    def get_java_class(java_class_name: str, gateway_state=None):
+        """ Access a Java class (or static member) by its fully qualified name, e.g., get_java_class('java.lang.String')
+        or get_java_class('java.lang.String.format')
+
+        :param java_class_name: fully qualified name
+        :param gateway_state: gateway state to access, default GatewayState.of()
+        :return py4j Java class (or member)
+        """
+        gateway_state = gateway_state or GatewayState.of()
+        java_class = gateway_state.java_classes.get(java_class_name)
+        if java_class is None:
+            # each package and class in the name costs a call, so they are only looked up once per gateway
+            java_class = GatewayUtils.get_package_jvm(gateway_state)
+            for name in java_class_name.split('.'):
+                java_class = getattr(java_class, name)
+            gateway_state.java_classes[java_class_name] = java_class
+        return java_class
+
+    @staticmethod
+    def to_java_list(python_list, gateway_state=None):
+        """ convert a Python list (or other sized iterable) to a Java ArrayList. Lists of only ints, only floats, or
+        only strings are transferred in bulk, i.e., in a constant number of calls regardless of their size, other lists
+        (and lists smaller than GatewayConfig.BULK_CONVERSION_MIN_SIZE) with a call per element. Elements are converted
+        as Py4J converts them individually, i.e., ints to Integer (or Long when exceeding the Integer range), floats to
+        Double, and strings to String
+
+        :param python_list: to convert
+        :param gateway_state: gateway state to create the list on, default GatewayState.of()
+        :return java ArrayList with the elements of the python list
+        """
+        gateway_state = gateway_state or GatewayState.of()
+        java_array_list_class = GatewayUtils.get_java_class('java.util.ArrayList', gateway_state)
+        if len(python_list) >= GatewayConfig.BULK_CONVERSION_MIN_SIZE:
+            java_collection = GatewayUtils.__to_java_collection_bulk(python_list, gateway_state)
+            if java_collection is not None:
+                return java_array_list_class(java_collection)
+
+        java_list = java_array_list_class()
+        for element in python_list:
+            java_list.add(element)
+        return java_list
+
+    @staticmethod
+    def to_java_set(python_set, gateway_state=None):
+        """ convert a Python set to a Java HashSet, transferred in bulk where possible, see to_java_list
+
+        :param python_set: to convert
+        :param gateway_state: gateway state to create the set on, default GatewayState.of()
+        :return java HashSet with the elements of the python set
+        """
+        gateway_state = gateway_state or GatewayState.of()
+        return GatewayUtils.get_java_class('java.util.HashSet', gateway_state)(
+            GatewayUtils.to_java_list(list(python_set), gateway_state))
+
+    @staticmethod
+    def to_java_map(python_dict, gateway_state=None):
+        """ convert a Python dict to a Java HashMap. When both its keys and its values are of only ints, only floats, or
+        only strings, they are transferred in bulk as two Java arrays and zipped into the map on the Java side (see
+        invoke_per_position), i.e., in a constant number of calls regardless of its size. Other dicts (and dicts
+        smaller than GatewayConfig.BULK_CONVERSION_MIN_SIZE) are converted with a call per entry
+
+        :param python_dict: to convert
+        :param gateway_state: gateway state to create the map on, default GatewayState.of()
+        :return java HashMap with the entries of the python dict
+        """
+        gateway_state = gateway_state or GatewayState.of()
+        java_map = GatewayUtils.get_java_class('java.util.HashMap', gateway_state)()
+        if len(python_dict) >= GatewayConfig.BULK_CONVERSION_MIN_SIZE:
+            java_keys = GatewayUtils.__to_java_collection_bulk(list(python_dict.keys()), gateway_state)
+            java_values = GatewayUtils.__to_java_collection_bulk(list(python_dict.values()), gateway_state) \
+                if java_keys is not None else None
+            if java_values is not None:
+                try:
+                    GatewayUtils.invoke_per_position(
+                        java_map, 'put', [java_keys.toArray(), java_values.toArray()], len(python_dict),
+                        gateway_state=gateway_state)
+                    return java_map
+                except Py4JError:
+                    java_map.clear()
+        for key, value in python_dict.items():
+            java_map.put(key, value)
+        return java_map
+
+    @staticmethod
+    def __to_java_collection_bulk(python_list, gateway_state):
+        """ transfer a list of only ints, only floats, or only strings to a Java List in a constant number of calls,
+        i.e., serialised as a single payload decoded by the JDK on the Java side
+
+        :param python_list: to transfer
+        :param gateway_state: gateway state to transfer to
+        :return java List, None when the elements do not allow for bulk transfer
+        """
+        element_types = set(map(type, python_list))
+        if len(element_types) != 1:
+            return None
+        element_type = element_types.pop()
+
+        if element_type is str:
+            java_array = GatewayUtils.__to_java_string_array(python_list, gateway_state)
+            if java_array is None:
+                return None
+            return GatewayUtils.get_java_class('java.util.Arrays', gateway_state).asList(java_array)
+
+        if element_type is float:
+            java_primitive = 'double'
+        elif element_type is int:
+            min_element, max_element = min(python_list), max(python_list)
+            if -2 ** 31 <= min_element and max_element < 2 ** 31:
+                java_primitive = 'int'
+            elif max_element < -2 ** 31 or min_element >= 2 ** 31:
+                # only when none would be an Integer, otherwise Py4J would yield a mix of Integer and Long
+                java_primitive = 'long'
+            else:
+                return None
+        else:
+            return None
+
+        values = GatewayUtils.__to_primitive_values(java_primitive, python_list)
+        if values is None:
+            return None
+        return GatewayUtils.__to_java_boxed_list(
+            GatewayUtils.__to_java_primitive_array(java_primitive, values, gateway_state), gateway_state)
+
+    @staticmethod
+    def __to_java_array_bulk(object_class, python_list, gateway_state):
+        """ transfer a list (or NumPy array) to a Java array of a primitive type, its boxed type, or String in a
+        constant number of calls
+
+        :param object_class: the Java class type of the array instances
+        :param python_list: to transfer
+        :param gateway_state: gateway state to transfer to
+        :return java array, None when the class or the elements do not allow for bulk transfer
+        """
+        java_class_name = object_class._fqn
+        if java_class_name == 'java.lang.String':
+            if isinstance(python_list, np.ndarray) or any(type(element) is not str for element in python_list):
+                return None
+            return GatewayUtils.__to_java_string_array(python_list, gateway_state)
+
+        java_primitive = GatewayUtils.__BOXED_PRIMITIVES.get(java_class_name, java_class_name)
+        if java_primitive not in GatewayUtils.__PRIMITIVE_BUFFERS:
+            return None
+        values = GatewayUtils.__to_primitive_values(java_primitive, python_list)
+        if values is None:
+            return None
+        java_array = GatewayUtils.__to_java_primitive_array(java_primitive, values, gateway_state)
+        if java_primitive == java_class_name:
+            return java_array
+        if java_primitive not in ('int', 'long', 'double'):
+            # the JDK only provides boxing of int, long, and double arrays in bulk
+            return None
+        return GatewayUtils.__to_java_boxed_list(java_array, gateway_state).toArray(
+            gateway_state.python_2_java_gateway.new_array(object_class, 0))
+
+    @staticmethod
+    def __to_primitive_values(java_primitive: str, python_list):
+        """ values of a list (or NumPy array) as NumPy array of the binary representation of the Java primitive type,
+        when all values can be represented by it without loss (as when transferred per element)
+
+        :param java_primitive: the Java primitive type
+        :param python_list: the values
+        :return NumPy array, None when not all values can be represented
+        """
+        buffer_dtype = np.dtype(GatewayUtils.__PRIMITIVE_BUFFERS[java_primitive][0])
+        integral = buffer_dtype.kind == 'i'
+        if isinstance(python_list, np.ndarray):
+            if python_list.ndim != 1 or python_list.dtype.kind not in ('iu' if integral else 'iuf'):
+                return None
+        else:
+            element_types = set(map(type, python_list))
+            if not element_types <= ({int} if integral else {int, float}):
+                return None
+        values = np.asarray(python_list)
+        if integral and len(values) > 0:
+            if values.min() < np.iinfo(buffer_dtype).min or values.max() > np.iinfo(buffer_dtype).max:
+                return None
+        return values.astype(buffer_dtype)
+
+    @staticmethod
+    def __to_java_primitive_array(java_primitive: str, values: np.ndarray, gateway_state):
+        """ transfer values to a Java primitive array in a constant number of calls: the binary payload is transferred
+        as byte[] in a single call and decoded into the primitive array by a ByteBuffer view on the Java side
+
+        :param java_primitive: the Java primitive type
+        :param values: the values in the binary representation of the primitive type
+        :param gateway_state: gateway state to transfer to
+        :return java primitive array
+        """
+        as_buffer = GatewayUtils.__PRIMITIVE_BUFFERS[java_primitive][1]
+        java_array = gateway_state.python_2_java_gateway.new_array(
+            GatewayUtils.get_java_class(java_primitive, gateway_state), len(values))
+        java_buffer = GatewayUtils.get_java_class('java.nio.ByteBuffer', gateway_state).wrap(values.tobytes())
+        if as_buffer is not None:
+            java_buffer = getattr(java_buffer, as_buffer)()
+        java_buffer.get(java_array)
+        return java_array
+
+    @staticmethod
+    def __to_java_boxed_list(java_array, gateway_state):
+        """ box an int, long, or double Java array into a Java List on the Java side
+        """
+        return GatewayUtils.get_java_class('java.util.Arrays', gateway_state).stream(java_array).boxed().collect(
+            GatewayUtils.get_java_class('java.util.stream.Collectors', gateway_state).toList())
+
+    @staticmethod
+    def __to_java_string_array(python_list, gateway_state):
+        """ transfer a list of strings to a Java String array in a constant number of calls, joined in a single string
+        and split on the Java side
+
+        :param python_list: the strings
+        :param gateway_state: gateway state to transfer to
+        :return java String array, None when the separator is part of a string
         """
-        return GatewayState.python_2_java_gateway.jvm
+        if any(GatewayConfig.BULK_STRING_SEPARATOR in element for element in python_list):
+            return None
+        return GatewayUtils.get_java_class('java.util.regex.Pattern', gateway_state).compile(
+            GatewayConfig.BULK_STRING_SEPARATOR).split(GatewayConfig.BULK_STRING_SEPARATOR.join(python_list), -1)
 
     @staticmethod
-    def to_java_array(object_class, python_list):
-        """ convert a Python list to a Java array
-        :param object_class the Java class type to use for the array instances
-        :param python_list to populate the array with
+    def to_java_array(object_class, python_list, gateway_state=None):
+        """ convert a Python list to a Java array. Arrays of a primitive type (except boolean and char), its boxed type,
+        or String are transferred in bulk, i.e., in a constant number of calls regardless of their size, when all
+        elements can be represented by the type. Otherwise (and for lists smaller than
+        GatewayConfig.BULK_CONVERSION_MIN_SIZE) the array is populated with a call per element
+        :param object_class the Java class type to use for the array instances, e.g., get_java_class('double')
+        :param python_list to populate the array with, either a list or a one dimensional NumPy array
+        :param gateway_state: gateway state to create the array on, default GatewayState.of()
         :return java array created in Python with the contents of the Python list
         """
-        java_array = GatewayState.python_2_java_gateway.new_array(object_class, len(python_list))
+        gateway_state = gateway_state or GatewayState.of()
+        if len(python_list) >= GatewayConfig.BULK_CONVERSION_MIN_SIZE:
+            java_array = GatewayUtils.__to_java_array_bulk(object_class, python_list, gateway_state)
+            if java_array is not None:
+                return java_array
+        if isinstance(python_list, np.ndarray):
+            # NumPy scalars can not be transferred as is
+            python_list = python_list.tolist()
+
+        java_array = gateway_state.python_2_java_gateway.new_array(object_class, len(python_list))
         for i in range(len(python_list)):
             java_array[i] = python_list[i]
         return java_array
 
+    @staticmethod
+    def to_numpy_array(java_array, java_primitive: str, length: int, gateway_state=None) -> np.ndarray:
+        """ transfer a Java array of a primitive type (except boolean and char) to a NumPy array in a constant number of
+        calls regardless of its size, by copying it into a byte buffer on the Java side which Py4J transfers as bytes
+
+        :param java_array: the Py4j java array, e.g., the result of a primitive stream's toArray()
+        :param java_primitive: the Java primitive type of the entries, e.g., 'double'
+        :param length: the number of entries in the java array
+        :param gateway_state: gateway state of the array, default GatewayState.of(java_array)
+        :return NumPy array of the entries, in native byte order
+        """
+        buffer_dtype, as_buffer = GatewayUtils.__PRIMITIVE_BUFFERS[java_primitive]
+        buffer_dtype = np.dtype(buffer_dtype)
+        if length == 0:
+            return np.empty(0, dtype=buffer_dtype.newbyteorder('='))
+        gateway_state = gateway_state or GatewayState.of(java_array)
+        java_buffer = GatewayUtils.get_java_class('java.nio.ByteBuffer', gateway_state).allocate(
+            buffer_dtype.itemsize * length)
+        (getattr(java_buffer, as_buffer)() if as_buffer is not None else java_buffer).put(java_array)
+        # byte buffers are big endian
+        return np.frombuffer(java_buffer.array(), dtype=buffer_dtype).astype(buffer_dtype.newbyteorder('='))
+
+    @staticmethod
+    def to_python_strings(java_array, length: int):
+        """ collect the string representation of all entries of a Java (Object) array in a single call, rather than
+        one call per entry. Each entry is converted via its Java toString(), null entries become 'null'
+
+        :param java_array: the Py4j java array to collect
+        :param length: the number of entries in the java array
+        :return python list of strings, one per entry
+        """
+        if length == 0:
+            return []
+        java_format = GatewayConfig.BULK_STRING_SEPARATOR.join(['%s'] * length)
+        # resolving String.format through the jvm view costs a call per package, so the member is looked up once
+        java_string_format = GatewayUtils.get_java_class('java.lang.String.format', GatewayState.of(java_array))
+        return java_string_format(java_format, java_array).split(GatewayConfig.BULK_STRING_SEPARATOR)
+
+    @staticmethod
+    def to_java_object_array(java_iterable, gateway_state=None):
+        """ collect the elements of a Java Iterable (e.g., a PLANit container of network entities) in a Java Object
+        array on the Java side, in a constant number of calls rather than one call per element
+
+        :param java_iterable: the Py4j java iterable
+        :param gateway_state: gateway state of the iterable, default GatewayState.of(java_iterable)
+        :return java Object array
+        """
+        gateway_state = gateway_state or GatewayState.of(java_iterable)
+        return GatewayUtils.get_java_class('java.util.stream.StreamSupport', gateway_state).stream(
+            java_iterable.spliterator(), False).toArray()
+
+    @staticmethod
+    def invoke_to_python_strings(java_array, length: int, method_name: str, gateway_state=None):
+        """ invoke a method without arguments (e.g., getXmlId) on all entries of a Java (Object) array and collect the
+        string representation of the results, see to_python_strings. The method is mapped over the entries on the Java
+        side, so this takes a constant number of calls. When that is not possible, e.g., the method is declared by a
+        non-public class or the entries are not all of the same class, it falls back to one call per entry
+
+        :param java_array: the Py4j java array of entries
+        :param length: the number of entries in the java array
+        :param method_name: the name of the (public) Java method to invoke
+        :param gateway_state: gateway state of the array, default GatewayState.of(java_array)
+        :return python list of strings, one per entry
+        """
+        if length == 0:
+            return []
+        gateway_state = gateway_state or GatewayState.of(java_array)
+        java_results = GatewayUtils.__map_java_array(java_array, method_name, gateway_state)
+        if java_results is None:
+            java_results = (getattr(java_array[index], method_name)() for index in range(length))
+            return ['null' if java_result is None else str(java_result) for java_result in java_results]
+        return GatewayUtils.to_python_strings(java_results, length)
+
+    @staticmethod
+    def invoke_to_java_array(java_array, length: int, method_name: str, gateway_state=None):
+        """ invoke a method without arguments (e.g., getGeometry) on all entries of a Java (Object) array and collect
+        the results in a Java Object array, e.g., to pass them on to Java in bulk. Like invoke_to_python_strings, the
+        method is mapped over the entries on the Java side, falling back to two calls per entry when that is not
+        possible
+
+        :param java_array: the Py4j java array of entries
+        :param length: the number of entries in the java array
+        :param method_name: the name of the (public) Java method to invoke
+        :param gateway_state: gateway state of the array, default GatewayState.of(java_array)
+        :return java Object array of the results, one per entry
+        """
+        gateway_state = gateway_state or GatewayState.of(java_array)
+        if length > 0:
+            java_results = GatewayUtils.__map_java_array(java_array, method_name, gateway_state)
+            if java_results is not None:
+                return java_results
+        java_results = gateway_state.python_2_java_gateway.new_array(
+            GatewayUtils.get_java_class('java.lang.Object', gateway_state), length)
+        for index in range(length):
+            java_results[index] = getattr(java_array[index], method_name)()
+        return java_results
+
+    @staticmethod
+    def __map_java_array(java_array, method_name: str, gateway_state):
+        """ map a method without arguments over all entries of a non-empty Java array on the Java side, in a constant
+        number of calls, None when the method can not be mapped, e.g., some entry is null
+        """
+        java_first_entry = java_array[0]
+        if java_first_entry is None:
+            return None
+        try:
+            java_class = GatewayUtils.get_java_class('java.lang.Class', gateway_state)
+            java_method = java_first_entry.getClass().getMethod(
+                method_name, gateway_state.python_2_java_gateway.new_array(java_class, 0))
+            # a java.util.function.Function backed by the method, created on the Java side so it is not called back
+            java_function = GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state) \
+                .asInterfaceInstance(java_class.forName('java.util.function.Function'),
+                                     GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+                                     .publicLookup().unreflect(java_method))
+            return GatewayUtils.get_java_class('java.util.Arrays', gateway_state).stream(java_array) \
+                .map(java_function).toArray()
+        except Py4JJavaError:
+            return None
+
+    @staticmethod
+    def invoke_per_position(java_object, method_name: str, arguments: List, num_positions: int,
+                            to_doubles: bool = False, gateway_state=None):
+        """ invoke a public method of a Java object once for each position 0, ..., num_positions - 1 on the Java side,
+        in a constant number of calls rather than one call per position. The arguments of each invocation are taken from
+        Java arrays (e.g., transferred in bulk by to_java_array), per parameter either the array entry at the position
+        or, when given as a tuple (java_array, indices), the array entry at indices[position].
+
+        On the Java side the method is unreflected into a method handle, adapted to take and return Objects only, and
+        each parameter is filtered by a handle (int position) -> argument that reads the array(s); these handles are
+        adapted to (int) -> Object as well, as combining method handles requires exact type matches. The resulting
+        (int position) -> result handle is applied to an IntStream of all positions.
+
+        :param java_object: the Py4j java object to invoke the method on
+        :param method_name: name of the public method, it is resolved by name and number of parameters, so overloads
+        with the same number of parameters are not supported
+        :param arguments: per parameter of the method, a Java array or a tuple of a Java array and the indices (a list
+        or NumPy array of ints) into it
+        :param num_positions: number of positions, i.e., invocations
+        :param to_doubles: when true the results are collected as doubles (null results become 0.0), otherwise they
+        are discarded
+        :param gateway_state: gateway state of the object, default GatewayState.of(java_object)
+        :return float64 NumPy array of the results when to_doubles, None otherwise
+        :raise Py4JError: when the method can not be found or invoked from the Java side, e.g., it is declared by a
+        non-public class, in which case callers can fall back on invoking it per position
+        """
+        gateway_state = gateway_state or GatewayState.of(java_object)
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        int_class = GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)
+        java_position_to_object = method_type.methodType(
+            GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class, int_class)
+
+        java_method = GatewayUtils.to_method_handle(java_object, method_name, len(arguments), gateway_state).asType(
+            method_type.genericMethodType(len(arguments)))
+        java_arguments_at = []
+        for argument in arguments:
+            java_array, indices = argument if isinstance(argument, tuple) else (argument, None)
+            java_argument_at = method_handles.arrayElementGetter(java_array.getClass()).bindTo(java_array)
+            if indices is not None:
+                java_indices = GatewayUtils.to_java_array(GatewayUtils.get_java_class('int', gateway_state),
+                                                          np.asarray(indices, dtype=np.int32), gateway_state)
+                java_argument_at = method_handles.filterReturnValue(
+                    method_handles.arrayElementGetter(java_indices.getClass()).bindTo(java_indices), java_argument_at)
+            java_arguments_at.append(java_argument_at.asType(java_position_to_object))
+        # (int position, ..., int position) -> Object, then (int position) -> Object by passing the position to each
+        java_result_at = method_handles.filterArguments(java_method, 0, GatewayUtils.to_java_array(
+            GatewayUtils.get_java_class('java.lang.invoke.MethodHandle', gateway_state), java_arguments_at,
+            gateway_state))
+        java_result_at = method_handles.permuteArguments(
+            java_result_at, java_position_to_object, GatewayUtils.to_java_array(
+                GatewayUtils.get_java_class('int', gateway_state), [0] * len(arguments), gateway_state))
+
+        java_proxies = GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state)
+        java_positions = GatewayUtils.get_java_class('java.util.stream.IntStream', gateway_state).range(
+            0, num_positions)
+        if not to_doubles:
+            java_positions.forEach(java_proxies.asInterfaceInstance(
+                GatewayUtils.get_java_class('java.util.function.IntConsumer', gateway_state)._java_lang_class,
+                java_result_at.asType(method_type.methodType(
+                    GatewayUtils.get_java_class('java.lang.Void.TYPE', gateway_state), int_class))))
+            return None
+        java_results = java_positions.mapToDouble(java_proxies.asInterfaceInstance(
+            GatewayUtils.get_java_class('java.util.function.IntToDoubleFunction', gateway_state)._java_lang_class,
+            method_handles.explicitCastArguments(java_result_at, method_type.methodType(
+                GatewayUtils.get_java_class('java.lang.Double.TYPE', gateway_state), int_class)))).toArray()
+        return GatewayUtils.to_numpy_array(java_results, 'double', num_positions, gateway_state)
+
+    @staticmethod
+    def to_method_handle(java_object, method_name: str, num_parameters: int, gateway_state=None):
+        """ Java method handle of the public method of the object with the name and number of parameters, bound to the
+        object, e.g., to combine it with other method handles on the Java side, see invoke_per_position. The unbound
+        method handle is looked up once per Java class and gateway
+
+        :param java_object: the Py4j java object
+        :param method_name: name of the public method
+        :param num_parameters: number of parameters of the method, overloads with the same number of parameters are not
+        distinguished
+        :param gateway_state: gateway state of the object, default GatewayState.of(java_object)
+        :return java MethodHandle
+        :raise Py4JError: when there is no such public method or it can not be accessed
+        """
+        gateway_state = gateway_state or GatewayState.of(java_object)
+        java_class = java_object.getClass()
+        method_key = (java_class.getName(), method_name, num_parameters)
+        java_method_handle = gateway_state.java_method_handles.get(method_key)
+        if java_method_handle is None:
+            java_methods = java_class.getMethods()
+            num_methods = len(java_methods)
+            method_names = GatewayUtils.invoke_to_python_strings(java_methods, num_methods, 'getName', gateway_state)
+            method_num_parameters = GatewayUtils.invoke_to_python_strings(
+                java_methods, num_methods, 'getParameterCount', gateway_state)
+            for index in range(num_methods):
+                if method_names[index] == method_name and int(method_num_parameters[index]) == num_parameters:
+                    java_method_handle = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state) \
+                        .publicLookup().unreflect(java_methods[index])
+                    break
+            if java_method_handle is None:
+                raise Py4JError(f'No public method {method_name} with {num_parameters} parameters')
+            gateway_state.java_method_handles[method_key] = java_method_handle
+        return java_method_handle.bindTo(java_object)
+
     @staticmethod
     def to_python_list(java_list: java_collections.JavaList):
         """ convert a Py4j java list to a 'native' Python list
@@ -107,12 +1047,13 @@ class GatewayUtils(object):
         return list(java_list)
 
     @staticmethod
-    def to_java_local_time(time: datetime.time):
+    def to_java_local_time(time: datetime.time, gateway_state=None):
         """ convert a Python datetime.time to a Java LocalTime
         :param time: the python time instance
+        :param gateway_state: gateway state to create the Java instance on, default GatewayState.of()
         :return java LocalTime instance representing the same time as time
         """
-        return GatewayState.python_2_java_gateway.jvm.java.time.LocalTime.of(
+        return GatewayUtils.get_package_jvm(gateway_state).java.time.LocalTime.of(
             time.hour, time.minute, time.second, time.microsecond * 1000)
 
     @staticmethod
@@ -128,11 +1069,27 @@ class GatewayUtils(object):
             microsecond=round(java_time_local_time.getNano() / 1000))
 
     @staticmethod
-    def to_java_enum(python_planit_enum: Enum):
+    def to_java_enum(python_planit_enum: Enum, gateway_state=None):
         """ convert Python predefined enum to Java counterpart.
 
         :param python_planit_enum: type to convert
+        :param gateway_state: gateway state to create the Java enum on, default GatewayState.of()
         :return java counterpart
         """
-        return GatewayState.python_2_java_gateway.entry_point.createEnum(
+        return (gateway_state or GatewayState.of()).entry_point.createEnum(
             python_planit_enum.java_class_name(), python_planit_enum.value)
+
+    @staticmethod
+    def get_jvm_info(gateway_state=None) -> Dict:
+        """ diagnostics of the running JVM, i.e., the values in effect on the Java side rather than the requested ones
+
+        :param gateway_state: gateway state to access, default GatewayState.of()
+        :return dict with java_version, max_heap_bytes, input_arguments, and garbage_collectors
+        """
+        jvm = GatewayUtils.get_package_jvm(gateway_state)
+        management_factory = jvm.java.lang.management.ManagementFactory
+        return {
+            'java_version': jvm.java.lang.System.getProperty('java.version'),
+            'max_heap_bytes': jvm.java.lang.Runtime.getRuntime().maxMemory(),
+            'input_arguments': list(management_factory.getRuntimeMXBean().getInputArguments()),
+            'garbage_collectors': [bean.getName() for bean in management_factory.getGarbageCollectorMXBeans()]}
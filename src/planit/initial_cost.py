@@ -1,30 +1,190 @@
-"""This class exists to take the logic for setting up the initial costs out of the PLANit class.  It does not wrap any Java object.  
+"""This class exists to take the logic for setting up the initial costs out of the PLANit class.  It does not wrap any Java object.
 This class is instantiated as a member of the PLANit object.  It allows top level calls to have the signature "plan_it.initial_cost.set(..."
 """
+import os
+import weakref
+from collections import OrderedDict
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from planit import GatewayConfig
+from planit import GatewayState
+from planit import OutputProperty
+from planit import OutputType
+
 
 class InitialCost:
-    
+
     def __init__(self):
         """Initializer for the InitialCosts class
         """
         self._default_initial_cost_file_location = None
         self._initial_cost_location_dictionary = {}
-        
+        # in memory costs per time period xml id (None for the default), each a (link segment xml ids, costs) per mode
+        self._in_memory_costs = {}
+
     def set(self, initial_cost_file_location, time_period_xml_id=None):
-        """Set an initial cost file location
+        """Set an initial cost file location, replacing any in memory costs set for the time period
         :param initial_cost_file_location location of an initial cost file
         :param time_period_xml_id XML id of the time period for which these initial costs apply
         """
+        self._in_memory_costs.pop(time_period_xml_id, None)
         if (time_period_xml_id == None):
             self._default_initial_cost_file_location = initial_cost_file_location
         else:
             self._initial_cost_location_dictionary[time_period_xml_id] = initial_cost_file_location
-            
+
+    def set_costs(self, mode_xml_id: str, link_segment_costs, link_segment_xml_ids=None, time_period_xml_id=None):
+        """Set initial link segment costs of a mode held in memory rather than in a file, e.g., to warm start from a
+        previous run, see also set_from_memory_output. Replaces any initial cost file set for the time period, costs
+        of multiple modes can be set for the same time period. When the project runs, the costs are set on the Java
+        initial costs directly (see InitialCostWrapper.set_segment_costs), without writing or parsing a file
+        :param mode_xml_id XML id of the mode for which these initial costs apply
+        :param link_segment_costs the cost per link segment, either a dict or pandas Series keyed by link segment
+        XML id, or an array (or list) of costs aligned with link_segment_xml_ids
+        :param link_segment_xml_ids XML ids of the link segments the costs apply to, only when costs are an array
+        :param time_period_xml_id XML id of the time period for which these initial costs apply, None for all
+        """
+        if link_segment_xml_ids is None:
+            if isinstance(link_segment_costs, dict):
+                link_segment_costs = pd.Series(link_segment_costs, dtype="float64")
+            link_segment_xml_ids = link_segment_costs.index
+            link_segment_costs = link_segment_costs.values
+        link_segment_xml_ids = np.asarray(link_segment_xml_ids).astype(str)
+        link_segment_costs = np.asarray(link_segment_costs, dtype=np.float64)
+        if link_segment_xml_ids.shape != link_segment_costs.shape:
+            raise Exception(f'{len(link_segment_costs)} initial costs provided for {len(link_segment_xml_ids)} link '
+                            f'segments')
+
+        if time_period_xml_id is None:
+            self._default_initial_cost_file_location = None
+        else:
+            self._initial_cost_location_dictionary.pop(time_period_xml_id, None)
+        self._in_memory_costs.setdefault(time_period_xml_id, {})[mode_xml_id] = \
+            (link_segment_xml_ids, link_segment_costs)
+
+    def set_from_memory_output(self, memory_output, mode_xml_id: str, time_period_xml_id: str, iteration: int,
+                               target_time_period_xml_id=None):
+        """Set initial link segment costs of a mode from the link results of a previous run held in memory, i.e., its
+        (converged) link segment costs, see set_costs. Requires the link segment XML id and cost link output properties
+        to be active on the previous run
+        :param memory_output the memory output formatter of the previous run's project, i.e., project.memory
+        :param mode_xml_id XML id of the mode to collect and set the costs for
+        :param time_period_xml_id XML id of the time period of the previous run to collect the costs from
+        :param iteration the iteration of the previous run to collect the costs from
+        :param target_time_period_xml_id XML id of the time period for which these initial costs apply, None for all
+        """
+        columns = memory_output.to_numpy(mode_xml_id, time_period_xml_id, iteration, OutputType.LINK)
+        for output_property in [OutputProperty.LINK_SEGMENT_XML_ID, OutputProperty.LINK_SEGMENT_COST]:
+            if output_property not in columns:
+                raise Exception(f'Link output property {output_property.value} required for initial costs is not '
+                                f'active')
+        self.set_costs(mode_xml_id, columns[OutputProperty.LINK_SEGMENT_COST],
+                       columns[OutputProperty.LINK_SEGMENT_XML_ID], target_time_period_xml_id)
+
+    def get_in_memory_costs(self, time_period_xml_id=None) -> dict:
+        """ :return the in memory costs of the time period (None for the default), per mode XML id a tuple of link
+        segment XML ids and costs, see set_costs
+        """
+        return self._in_memory_costs.get(time_period_xml_id, {})
+
     def get_initial_cost_file_location_by_time_period_xml_id(self, time_period_xml_id):
         return self._initial_cost_location_dictionary[time_period_xml_id]
-    
+
     def get_time_periods_xml_id_set(self):
-        return self._initial_cost_location_dictionary.keys()
-    
+        return self._initial_cost_location_dictionary.keys() | (self._in_memory_costs.keys() - {None})
+
+    def is_in_memory(self, time_period_xml_id=None) -> bool:
+        """ :return true when the initial costs of the time period (None for the default) are held in memory
+        """
+        return time_period_xml_id in self._in_memory_costs
+
     def get_default_initial_cost_file_location(self):
-        return self._default_initial_cost_file_location
\ No newline at end of file
+        return self._default_initial_cost_file_location
+
+
+class InitialCostCache:
+    """Least recently used cache of parsed initial cost files of a gateway session, so an initial cost file reused
+    across repeated runs of a project is only parsed once. Entries are keyed by the file (path, modification time and
+    size, so a changed file is parsed again), the network they were parsed for (by identity) and the time period.
+
+    Parsed initial costs refer to the Java link segments and modes of the network they were parsed for, and each
+    project parses its own network, so entries are never reused across projects, even when these are created from the
+    same input files. In particular, each scenario of the ScenarioRunner runs on a new project and always parses its
+    initial cost files. The cache only holds a weak reference to the network, the entries of a network are removed
+    once it is garbage collected, i.e., once its project is gone
+    """
+
+    # cache per gateway state, discarded with the gateway state
+    _caches = weakref.WeakKeyDictionary()
+
+    def __init__(self, max_size: int = None):
+        """Initialiser of the cache
+        :param max_size maximum number of entries, default GatewayConfig.INITIAL_COST_CACHE_SIZE
+        """
+        self._max_size = max_size if max_size is not None else GatewayConfig.INITIAL_COST_CACHE_SIZE
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def of(gateway_state: GatewayState) -> "InitialCostCache":
+        """ access the cache of the gateway session, created on first access
+        :param gateway_state of the gateway session
+        :return the cache
+        """
+        cache = InitialCostCache._caches.get(gateway_state)
+        if cache is None:
+            cache = InitialCostCache._caches[gateway_state] = InitialCostCache()
+        return cache
+
+    def get_or_create(self, initial_cost_file_location: str, network, time_period_xml_id, create: Callable):
+        """ Provide the parsed initial costs of the file from the cache, or create (parse) and cache them
+        :param initial_cost_file_location location of the initial cost file
+        :param network the network (wrapper) the initial costs apply to, only weakly referenced
+        :param time_period_xml_id XML id of the time period the initial costs apply to, None for all
+        :param create parses the file, called on a miss
+        :return the parsed initial costs
+        """
+        if self._max_size <= 0:
+            return create()
+        file_location = os.path.abspath(initial_cost_file_location)
+        file_stat = os.stat(file_location)
+        network_id = id(network)
+        key = (file_location, file_stat.st_mtime_ns, file_stat.st_size, network_id, time_period_xml_id)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0]() is network:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+        self._misses += 1
+        initial_cost = create()
+        # the entries of the network are removed once it is garbage collected, before its id can be reused
+        self._entries[key] = (weakref.ref(network, lambda _: self.__remove_network(network_id)), initial_cost)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        return initial_cost
+
+    def __remove_network(self, network_id: int):
+        """ remove the entries of a garbage collected network
+        """
+        for key in list(self._entries):
+            if key[3] == network_id:
+                self._entries.pop(key, None)
+
+    def info(self) -> dict:
+        """ :return hit, miss and eviction counts, as well as the current and maximum number of entries
+        """
+        return {'hits': self._hits, 'misses': self._misses, 'evictions': self._evictions, 'size': len(self._entries),
+                'max_size': self._max_size}
+
+    def clear(self):
+        """ remove all entries and reset the statistics
+        """
+        self._entries.clear()
+        self._hits = self._misses = self._evictions = 0
@@ -0,0 +1,343 @@
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from py4j.protocol import Py4JError
+
+from planit import GatewayState
+from planit import GatewayUtils
+
+
+def _get_java_layers(java_network) -> Tuple[List, List[Optional[str]]]:
+    """ the transport layers of the network and their XML ids
+    """
+    java_layer_array = GatewayUtils.to_java_object_array(java_network.getTransportLayers())
+    num_layers = len(java_layer_array)
+    layer_xml_ids = _to_optional_strings(
+        GatewayUtils.invoke_to_python_strings(java_layer_array, num_layers, 'getXmlId'))
+    return [java_layer_array[index] for index in range(num_layers)], layer_xml_ids
+
+
+def _to_optional_strings(strings: List[str]) -> List[Optional[str]]:
+    """ Java null entries become None
+    """
+    return [None if string == 'null' else string for string in strings]
+
+
+class NetworkEntityTable:
+    """ Ids, XML ids and external ids of all network entities of one kind (e.g., all link segments), one row per entity.
+    Ids are an int64 array, XML ids and external ids are object arrays of strings (None when absent). Lookups between
+    them are served from dictionaries built on first use
+    """
+
+    def __init__(self, ids: np.ndarray, xml_ids: np.ndarray, external_ids: np.ndarray,
+                 layer_xml_ids: np.ndarray = None):
+        """ Initialiser of the table
+        :param ids the (internal) ids of the entities
+        :param xml_ids the XML ids of the entities
+        :param external_ids the external ids of the entities
+        :param layer_xml_ids the XML ids of the transport layers of the entities, None for entities of the network
+        as a whole (modes)
+        """
+        self.ids = ids
+        self.xml_ids = xml_ids
+        self.external_ids = external_ids
+        self.layer_xml_ids = layer_xml_ids
+        self._positions_by_xml_id = None
+        self._positions_by_id = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def of(ids: List[str], xml_ids: List[str], external_ids: List[str],
+           layer_xml_ids: List[str] = None) -> "NetworkEntityTable":
+        """ create a table from the string representations collected from Java (see
+        GatewayUtils.invoke_to_python_strings), i.e., with 'null' for absent values
+        :param ids the ids of the entities
+        :param xml_ids the XML ids of the entities
+        :param external_ids the external ids of the entities
+        :param layer_xml_ids the XML ids of the transport layers of the entities, if applicable
+        :return the table
+        """
+        return NetworkEntityTable(
+            np.array(ids, dtype=np.int64),
+            np.array(_to_optional_strings(xml_ids), dtype=object),
+            np.array(_to_optional_strings(external_ids), dtype=object),
+            np.array(layer_xml_ids, dtype=object) if layer_xml_ids is not None else None)
+
+    @property
+    def positions_by_xml_id(self) -> Dict[str, int]:
+        """ :return position (row) of each entity by XML id
+        """
+        if self._positions_by_xml_id is None:
+            self._positions_by_xml_id = {xml_id: position for position, xml_id in enumerate(self.xml_ids.tolist())}
+        return self._positions_by_xml_id
+
+    @property
+    def positions_by_id(self) -> Dict[int, int]:
+        """ :return position (row) of each entity by id
+        """
+        if self._positions_by_id is None:
+            self._positions_by_id = {entity_id: position for position, entity_id in enumerate(self.ids.tolist())}
+        return self._positions_by_id
+
+    def id_of(self, xml_id: str) -> Optional[int]:
+        """ :param xml_id XML id of the entity
+        :return id of the entity, None when not present
+        """
+        position = self.positions_by_xml_id.get(xml_id)
+        return int(self.ids[position]) if position is not None else None
+
+    def xml_id_of(self, entity_id: int) -> Optional[str]:
+        """ :param entity_id id of the entity
+        :return XML id of the entity, None when not present
+        """
+        position = self.positions_by_id.get(entity_id)
+        return self.xml_ids[position] if position is not None else None
+
+    def ids_of(self, xml_ids) -> np.ndarray:
+        """ :param xml_ids XML ids of entities
+        :return ids of the entities, in the same order, -1 for XML ids that are not present
+        """
+        positions_by_xml_id = self.positions_by_xml_id
+        positions = np.fromiter((positions_by_xml_id.get(xml_id, -1) for xml_id in xml_ids), dtype=np.int64)
+        ids = np.full(len(positions), -1, dtype=np.int64)
+        ids[positions >= 0] = self.ids[positions[positions >= 0]]
+        return ids
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """ :return the table as DataFrame with columns id, xml_id, external_id (and layer_xml_id when applicable)
+        """
+        columns = {'id': self.ids, 'xml_id': self.xml_ids, 'external_id': self.external_ids}
+        if self.layer_xml_ids is not None:
+            columns['layer_xml_id'] = self.layer_xml_ids
+        return pd.DataFrame(columns)
+
+
+class NetworkIndex:
+    """ Snapshot of the ids, XML ids and external ids of the modes, nodes, link segment types and link segments of a
+    network (see MacroscopicNetworkWrapper.index), collected in bulk: a constant number of calls per container rather
+    than calls per entity. Entities of the transport layers are combined in a single table per kind, in order of the
+    layers
+    """
+
+    def __init__(self, modes: NetworkEntityTable, nodes: NetworkEntityTable, link_segment_types: NetworkEntityTable,
+                 link_segments: NetworkEntityTable):
+        """ Initialiser of the index
+        :param modes table of the modes
+        :param nodes table of the nodes
+        :param link_segment_types table of the link segment types
+        :param link_segments table of the link segments
+        """
+        self.modes = modes
+        self.nodes = nodes
+        self.link_segment_types = link_segment_types
+        self.link_segments = link_segments
+
+    @staticmethod
+    def of(java_network) -> "NetworkIndex":
+        """ collect the index of a network
+        :param java_network the Java (macroscopic) network
+        :return the index
+        """
+        java_layers, layer_xml_ids = _get_java_layers(java_network)
+
+        # the layer is an InfrastructureLayer to py4j which cannot access fields of the derived type, hence its methods
+        # are called for it to find the derived implementation
+        return NetworkIndex(
+            NetworkIndex.__to_table([java_network.getModes()]),
+            NetworkIndex.__to_table([java_layer.getNodes() for java_layer in java_layers], layer_xml_ids),
+            NetworkIndex.__to_table([java_layer.getLinkSegmentTypes() for java_layer in java_layers], layer_xml_ids),
+            NetworkIndex.__to_table([java_layer.getLinkSegments() for java_layer in java_layers], layer_xml_ids))
+
+    @staticmethod
+    def __to_table(java_containers: List, layer_xml_ids: List[str] = None) -> NetworkEntityTable:
+        """ table of the entities of the containers, each container in a constant number of calls
+        """
+        ids, xml_ids, external_ids, layers = [], [], [], []
+        for position, java_container in enumerate(java_containers):
+            java_entities = GatewayUtils.to_java_object_array(java_container)
+            num_entities = len(java_entities)
+            ids.extend(GatewayUtils.invoke_to_python_strings(java_entities, num_entities, 'getId'))
+            xml_ids.extend(GatewayUtils.invoke_to_python_strings(java_entities, num_entities, 'getXmlId'))
+            external_ids.extend(GatewayUtils.invoke_to_python_strings(java_entities, num_entities, 'getExternalId'))
+            if layer_xml_ids is not None:
+                layers.extend([layer_xml_ids[position]] * num_entities)
+        return NetworkEntityTable.of(ids, xml_ids, external_ids, layers if layer_xml_ids is not None else None)
+
+
+class NetworkGeometry:
+    """ Node locations and link segment geometries of a network (see MacroscopicNetworkWrapper.geometry) as NumPy
+    coordinate arrays, in the coordinate reference system of the network. Nodes and link segments are in the order of
+    the corresponding tables of the network index. The polylines of all link segments share a single (flat) coordinate
+    array, the polyline of the link segment at position i comprises rows offsets[i] up to offsets[i + 1], oriented in
+    the direction of the link segment
+    """
+
+    # JTS WKB byte order (little endian) and geometry types, the geometries are shipped as (2D) WKB
+    WKB_LITTLE_ENDIAN = 2
+    WKB_LINE_STRING = 2
+
+    def __init__(self, node_ids: np.ndarray, node_coordinates: np.ndarray, link_segment_ids: np.ndarray,
+                 link_segment_offsets: np.ndarray, link_segment_coordinates: np.ndarray, crs: Optional[str]):
+        """ Initialiser of the network geometry
+        :param node_ids the ids of the nodes
+        :param node_coordinates (x, y) per node, NaN for nodes without location
+        :param link_segment_ids the ids of the link segments
+        :param link_segment_offsets start of the polyline of each link segment in the link segment coordinates, with an
+        additional last entry holding the total number of coordinates
+        :param link_segment_coordinates (x, y) per point of the link segment polylines
+        :param crs the coordinate reference system of the network (as WKT), None when not known
+        """
+        self.node_ids = node_ids
+        self.node_coordinates = node_coordinates
+        self.link_segment_ids = link_segment_ids
+        self.link_segment_offsets = link_segment_offsets
+        self.link_segment_coordinates = link_segment_coordinates
+        self.crs = crs
+
+    def link_segment_polyline(self, position: int) -> np.ndarray:
+        """ :param position of the link segment
+        :return (x, y) per point of the polyline of the link segment (a view on the link segment coordinates)
+        """
+        return self.link_segment_coordinates[self.link_segment_offsets[position]:self.link_segment_offsets[position + 1]]
+
+    @staticmethod
+    def of(java_network) -> "NetworkGeometry":
+        """ collect the geometry of a network. The geometries of each layer's nodes and link segments are shipped as a
+        single WKB geometry (collection) each, so the number of calls does not depend on the size of the network
+        :param java_network the Java (macroscopic) network
+        :return the network geometry
+        """
+        gateway_state = GatewayState.of(java_network)
+        java_layers, _ = _get_java_layers(java_network)
+        node_ids, node_coordinates = [], []
+        link_segment_ids, link_segment_polylines = [], []
+        for java_layer in java_layers:
+            java_nodes = GatewayUtils.to_java_object_array(java_layer.getNodes())
+            num_nodes = len(java_nodes)
+            node_ids.extend(GatewayUtils.invoke_to_python_strings(java_nodes, num_nodes, 'getId'))
+            node_coordinates.append(NetworkGeometry.__to_point_coordinates(
+                GatewayUtils.invoke_to_java_array(java_nodes, num_nodes, 'getPosition'), num_nodes, gateway_state))
+
+            java_link_segments = GatewayUtils.to_java_object_array(java_layer.getLinkSegments())
+            num_link_segments = len(java_link_segments)
+            link_segment_ids.extend(
+                GatewayUtils.invoke_to_python_strings(java_link_segments, num_link_segments, 'getId'))
+            link_segment_polylines.extend(NetworkGeometry.__to_link_segment_polylines(
+                java_link_segments, num_link_segments, gateway_state))
+
+        link_segment_offsets = np.zeros(len(link_segment_polylines) + 1, dtype=np.int64)
+        np.cumsum([len(polyline) for polyline in link_segment_polylines], out=link_segment_offsets[1:])
+        return NetworkGeometry(
+            np.array(node_ids, dtype=np.int64),
+            np.concatenate(node_coordinates) if node_coordinates else np.empty((0, 2)),
+            np.array(link_segment_ids, dtype=np.int64),
+            link_segment_offsets,
+            np.concatenate(link_segment_polylines) if link_segment_polylines else np.empty((0, 2)),
+            NetworkGeometry.__get_crs(java_network))
+
+    @staticmethod
+    def __get_crs(java_network) -> Optional[str]:
+        """ the coordinate reference system of the network as WKT, None when not available
+        """
+        try:
+            java_crs = java_network.getCoordinateReferenceSystem()
+            return java_crs.toWKT() if java_crs is not None else None
+        except Py4JError:
+            return None
+
+    @staticmethod
+    def __to_point_coordinates(java_points, num_points: int, gateway_state: GatewayState) -> np.ndarray:
+        """ (x, y) per point, shipped as a single WKB multi point when none are missing, per point otherwise
+        """
+        java_multi_point = NetworkGeometry.__create_geometry(
+            'createMultiPoint', 'org.locationtech.jts.geom.Point', java_points, num_points, gateway_state)
+        if java_multi_point is None:
+            return NetworkGeometry.__to_coordinates([java_points[index] for index in range(num_points)])
+
+        # WKB multi point: header (byte order, type, number of points), then per point its header and x, y
+        wkb_points = np.frombuffer(NetworkGeometry.__to_wkb(java_multi_point, gateway_state), count=num_points,
+                                   offset=9, dtype=np.dtype([('order', 'u1'), ('type', '<u4'), ('x', '<f8'),
+                                                             ('y', '<f8')]))
+        return np.column_stack((wkb_points['x'], wkb_points['y']))
+
+    @staticmethod
+    def __to_link_segment_polylines(java_link_segments, num_link_segments: int,
+                                    gateway_state: GatewayState) -> List[np.ndarray]:
+        """ polyline per link segment, the geometry of its parent link oriented in the direction of the link segment. The
+        geometries are shipped as a single WKB geometry collection when all links have a geometry, per link segment
+        otherwise (a straight line between its nodes when its link has no geometry)
+        """
+        directions_ab = [direction_ab == 'true' for direction_ab in GatewayUtils.invoke_to_python_strings(
+            java_link_segments, num_link_segments, 'isDirectionAb')]
+        java_links = GatewayUtils.invoke_to_java_array(java_link_segments, num_link_segments, 'getParentLink')
+        java_geometries = GatewayUtils.invoke_to_java_array(java_links, num_link_segments, 'getGeometry')
+
+        java_collection = NetworkGeometry.__create_geometry(
+            'createGeometryCollection', 'org.locationtech.jts.geom.Geometry', java_geometries, num_link_segments,
+            gateway_state)
+        if java_collection is not None:
+            wkb = NetworkGeometry.__to_wkb(java_collection, gateway_state)
+            # WKB geometry collection: header (byte order, type, number of geometries), then each geometry
+            polylines, position = [], 9
+            for _ in range(num_link_segments):
+                polyline, position = NetworkGeometry.__read_wkb_line_string(wkb, position)
+                polylines.append(polyline)
+        else:
+            polylines = []
+            for index in range(num_link_segments):
+                java_geometry = java_geometries[index]
+                if java_geometry is None:
+                    java_link_segment = java_link_segments[index]
+                    # already in the direction of the link segment
+                    directions_ab[index] = True
+                    polylines.append(NetworkGeometry.__to_coordinates(
+                        [java_link_segment.getUpstreamVertex().getPosition(),
+                         java_link_segment.getDownstreamVertex().getPosition()]))
+                else:
+                    polylines.append(NetworkGeometry.__read_wkb_line_string(
+                        NetworkGeometry.__to_wkb(java_geometry, gateway_state), 0)[0])
+        return [polyline if direction_ab else polyline[::-1] for polyline, direction_ab in zip(polylines, directions_ab)]
+
+    @staticmethod
+    def __to_coordinates(java_points: List) -> np.ndarray:
+        """ (x, y) per point collected per point, NaN for missing points
+        """
+        return np.array([(np.nan, np.nan) if java_point is None else (java_point.getX(), java_point.getY())
+                         for java_point in java_points], dtype=np.float64).reshape(-1, 2)
+
+    @staticmethod
+    def __create_geometry(create_method_name: str, geometry_class_name: str, java_geometries, num_geometries: int,
+                          gateway_state: GatewayState):
+        """ create a multi geometry of the geometries on the Java side, None when any is missing (or of another type)
+        """
+        java_geometry_class = GatewayUtils.get_java_class(geometry_class_name, gateway_state)
+        java_typed_geometries = gateway_state.python_2_java_gateway.new_array(java_geometry_class, num_geometries)
+        try:
+            GatewayUtils.get_java_class('java.lang.System', gateway_state).arraycopy(
+                java_geometries, 0, java_typed_geometries, 0, num_geometries)
+            return getattr(GatewayUtils.get_java_class('org.locationtech.jts.geom.GeometryFactory', gateway_state)(),
+                           create_method_name)(java_typed_geometries)
+        except Py4JError:
+            return None
+
+    @staticmethod
+    def __to_wkb(java_geometry, gateway_state: GatewayState) -> bytes:
+        """ 2D little endian WKB of the geometry, transferred as a single byte array
+        """
+        return GatewayUtils.get_java_class('org.locationtech.jts.io.WKBWriter', gateway_state)(
+            2, NetworkGeometry.WKB_LITTLE_ENDIAN).write(java_geometry)
+
+    @staticmethod
+    def __read_wkb_line_string(wkb: bytes, position: int) -> Tuple[np.ndarray, int]:
+        """ read the (x, y) coordinates of the WKB line string at the position
+        :return coordinates and the position after the line string
+        """
+        geometry_type, num_points = struct.unpack_from('<II', wkb, position + 1)
+        if geometry_type != NetworkGeometry.WKB_LINE_STRING:
+            raise Exception(f'Link geometry of WKB type {geometry_type} is not supported, only line strings')
+        coordinates = np.frombuffer(wkb, dtype='<f8', count=2 * num_points, offset=position + 9).reshape(-1, 2)
+        return coordinates, position + 9 + 16 * num_points
@@ -0,0 +1,307 @@
+import re
+import time
+from abc import abstractmethod
+from collections import deque
+from typing import Callable, Optional
+
+from py4j.protocol import Py4JError
+
+from planit import GatewayState
+from planit import GatewayUtils
+
+
+class IterationProgress:
+    """ Progress of a traffic assignment as of one of its iterations, reported by the IterationMonitor
+    """
+
+    def __init__(self, iteration: int, gap: Optional[float], time_period: Optional[str], time_period_index: int,
+                 iteration_duration: float, time_period_duration: float, elapsed: float, message: str):
+        """ Initialiser of the iteration progress
+        :param iteration the iteration index
+        :param gap the gap after the iteration, None when not reported
+        :param time_period the time period being assigned, None when not reported
+        :param time_period_index the index of the time period in the order the run assigns them (starting at 0)
+        :param iteration_duration the duration (seconds) of the iteration, i.e., since the previous reported iteration
+        :param time_period_duration the duration (seconds) of the time period so far, including this iteration
+        :param elapsed the duration (seconds) of the run so far
+        :param message the log message the progress is based on
+        """
+        self.iteration = iteration
+        self.gap = gap
+        self.time_period = time_period
+        self.time_period_index = time_period_index
+        self.iteration_duration = iteration_duration
+        self.time_period_duration = time_period_duration
+        self.elapsed = elapsed
+        self.message = message
+
+    def __repr__(self):
+        return (f"IterationProgress(iteration={self.iteration}, gap={self.gap}, time_period={self.time_period}, "
+                f"iteration_duration={self.iteration_duration:.3f}, "
+                f"time_period_duration={self.time_period_duration:.3f}, elapsed={self.elapsed:.3f})")
+
+
+class IterationMonitor:
+    """ Streams the progress of a running traffic assignment into a Python handler while attached. The PLANit Java
+    assignment reports each iteration (its index and gap, prefixed by its run id and time period, e.g.,
+    "[run id: 0] [tp: 0] [it: 3] Gap: 0.0012345678 (5 ms)") by logging it, so the monitor hooks into the PLANit
+    assignment loggers: a Java log handler with a Python filter, called back (via the Py4J callback server) from the
+    assignment thread for each log record reporting an iteration as it is logged. The handler is called on the callback
+    thread, before the assignment continues. An exception raised by it is not passed on to Java, instead the handler
+    is no longer called and the exception is raised once the monitor is used as context manager and exits, see check.
+
+    Records are guarded on the Java side before calling back: only records of at least LOG_LEVEL, logged by (the
+    descendants of) LOGGER_NAME, whose message matches ITERATION_PATTERN reach Python
+    """
+
+    # name of the Java logger (including its descendants) the iterations are reported by, i.e., the assignments
+    LOGGER_NAME = "org.goplanit.assignment"
+
+    # minimum java.util.logging level of the records reporting the iterations
+    LOG_LEVEL = "INFO"
+
+    # patterns of the iteration index, the gap, and the time period within a log message. The iteration pattern is
+    # also applied on the Java side (as java.util.regex.Pattern), so it must not use Python specific syntax
+    ITERATION_PATTERN = re.compile(r"\[\s*it\s*:?\s*(\d+)\s*\]|\biteration\b\D{0,3}(\d+)", re.IGNORECASE)
+    GAP_PATTERN = re.compile(r"\bgap\b\D{0,3}?([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)", re.IGNORECASE)
+    TIME_PERIOD_PATTERN = re.compile(r"\[\s*(?:tp|time ?period)\s*[:#]?\s*([^\]]+?)\s*\]", re.IGNORECASE)
+
+    class Java:
+        implements = ['java.util.logging.Filter']
+
+    def __init__(self, on_iteration: Callable[[IterationProgress], None], gateway_state: GatewayState = None):
+        """ Initialiser, the monitor only reports once attached
+        :param on_iteration handler called with the progress of each reported iteration
+        :param gateway_state the gateway (of a standalone Planit instance) of the assignment, default GatewayState.of()
+        """
+        self._on_iteration = on_iteration
+        self._gateway_state = gateway_state or GatewayState.of()
+        self._logger = None
+        self._handler = None
+        self._logger_handler = None
+        self.__reset()
+
+    def __enter__(self):
+        self.attach()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.detach()
+        if exc_type is None:
+            self.check()
+
+    @property
+    def num_iterations(self) -> int:
+        """ :return the number of iterations reported since attached
+        """
+        return self._num_iterations
+
+    def check(self):
+        """ Raise the exception the handler raised since attached, if any, or an exception when no iteration was
+        reported at all, i.e., the log messages of the assignment never matched ITERATION_PATTERN, in which case the
+        handler (and for example the stopping policies) silently did not apply
+        """
+        if self._handler_exception is not None:
+            raise self._handler_exception
+        if self._num_iterations == 0:
+            raise Exception(f'No iterations reported by the PLANit assignment loggers '
+                            f'({IterationMonitor.LOGGER_NAME}), none of their log messages matched '
+                            f'{IterationMonitor.ITERATION_PATTERN.pattern}')
+
+    def attach(self):
+        """ Start reporting the iterations of assignments running on the gateway
+        """
+        if self._handler is not None:
+            return
+        GatewayUtils.start_callback_server(self._gateway_state)
+        java_memory_handler = GatewayUtils.get_java_class('java.util.logging.MemoryHandler', self._gateway_state)
+        java_level = GatewayUtils.get_java_class(f'java.util.logging.Level.{IterationMonitor.LOG_LEVEL}',
+                                                 self._gateway_state)
+        # a memory handler never pushes to its target (push level OFF), it only serves to apply this filter
+        self._handler = java_memory_handler(
+            GatewayUtils.get_java_class('java.util.logging.ConsoleHandler', self._gateway_state)(), 1,
+            GatewayUtils.get_java_class('java.util.logging.Level.OFF', self._gateway_state))
+        self._handler.setLevel(java_level)
+        self._handler.setFilter(self)
+        # records are matched on the Java side first, by a handler pushing each record it accepts to this handler
+        try:
+            self._logger_handler = java_memory_handler(
+                self._handler, 1, GatewayUtils.get_java_class('java.util.logging.Level.ALL', self._gateway_state))
+            self._logger_handler.setLevel(java_level)
+            self._logger_handler.setFilter(self.__create_java_message_filter())
+        except Py4JError:
+            # the level and logger name still apply
+            self._logger_handler = self._handler
+        # the logger is held on to (via the gateway) so it is not garbage collected with the handler attached
+        self._logger = GatewayUtils.get_java_class('java.util.logging.Logger', self._gateway_state).getLogger(
+            IterationMonitor.LOGGER_NAME)
+        self.__reset()
+        self._logger.addHandler(self._logger_handler)
+
+    def detach(self):
+        """ Stop reporting iterations, a no-op when not attached or when the gateway is no longer running
+        """
+        if self._handler is None:
+            return
+        if self._gateway_state.gateway_is_running:
+            self._logger.removeHandler(self._logger_handler)
+            # closes the handler it pushes to as well
+            self._logger_handler.close()
+        self._handler = None
+        self._logger_handler = None
+        self._logger = None
+
+    def __create_java_message_filter(self):
+        """ Java filter (java.util.logging.Filter) accepting the log records whose message matches ITERATION_PATTERN,
+        built from method handles so it is applied without calling back into Python
+        """
+        gateway_state = self._gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        object_class = GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class
+        string_class = GatewayUtils.get_java_class('java.lang.String', gateway_state)._java_lang_class
+        boolean_class = GatewayUtils.get_java_class('java.lang.Boolean.TYPE', gateway_state)
+        log_record_class = GatewayUtils.get_java_class('java.util.logging.LogRecord', gateway_state)._java_lang_class
+        java_pattern = GatewayUtils.get_java_class('java.util.regex.Pattern', gateway_state)
+
+        # (LogRecord) -> boolean, Objects.toString renders an absent message as "null"
+        java_message = method_handles.filterReturnValue(
+            method_handles.publicLookup().findVirtual(log_record_class, 'getMessage', method_type.methodType(
+                string_class)),
+            method_handles.publicLookup().findStatic(
+                GatewayUtils.get_java_class('java.util.Objects', gateway_state)._java_lang_class, 'toString',
+                method_type.methodType(string_class, object_class)))
+        # (String) -> boolean, pattern.matcher(message).find()
+        matcher_class = GatewayUtils.get_java_class('java.util.regex.Matcher', gateway_state)._java_lang_class
+        java_matches = method_handles.filterReturnValue(
+            method_handles.publicLookup().findVirtual(java_pattern._java_lang_class, 'matcher', method_type.methodType(
+                matcher_class, GatewayUtils.get_java_class('java.lang.CharSequence', gateway_state)._java_lang_class))
+            .bindTo(java_pattern.compile(IterationMonitor.ITERATION_PATTERN.pattern, java_pattern.CASE_INSENSITIVE)),
+            method_handles.publicLookup().findVirtual(matcher_class, 'find', method_type.methodType(boolean_class))
+        ).asType(method_type.methodType(boolean_class, string_class))
+        return GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+            GatewayUtils.get_java_class('java.util.logging.Filter', gateway_state)._java_lang_class,
+            method_handles.filterReturnValue(java_message, java_matches))
+
+    def __reset(self):
+        """ start keeping track of the timings anew, as of now
+        """
+        self._start_time = self._last_time = self._time_period_start_time = time.time()
+        self._last_iteration = None
+        self._time_period = None
+        self._time_period_index = -1
+        self._num_iterations = 0
+        self._handler_exception = None
+
+    def isLoggable(self, record) -> bool:
+        """ Java callback (java.util.logging.Filter) for each log record of the PLANit loggers
+        :param record the Java log record
+        :return true, the monitor never filters out log records
+        """
+        if self._handler_exception is not None:
+            return True
+        try:
+            message = record.getMessage()
+            progress = self.parse(message, record.getMillis() / 1000.0) if message else None
+            if progress is not None:
+                self._num_iterations += 1
+                self._on_iteration(progress)
+        except Exception as exception:
+            # kept for the caller rather than passed on to the assignment, see check
+            self._handler_exception = exception
+        return True
+
+    def parse(self, message: str, log_time: float) -> Optional[IterationProgress]:
+        """ Derive the progress from a log message, keeping track of the timings across messages
+        :param message the log message
+        :param log_time the time (seconds since the epoch) the message was logged
+        :return the progress when the message reports an iteration, None otherwise
+        """
+        iteration_match = IterationMonitor.ITERATION_PATTERN.search(message)
+        if iteration_match is None:
+            return None
+        iteration = int(next(group for group in iteration_match.groups() if group is not None))
+        gap_match = IterationMonitor.GAP_PATTERN.search(message)
+        time_period_match = IterationMonitor.TIME_PERIOD_PATTERN.search(message)
+        time_period = time_period_match.group(1) if time_period_match is not None else None
+
+        # a new time period starts when reported as such, or when the iterations start over
+        if time_period != self._time_period or (self._last_iteration is not None and iteration < self._last_iteration):
+            self._time_period = time_period
+            self._time_period_index += 1
+            self._time_period_start_time = self._last_time
+        progress = IterationProgress(iteration, float(gap_match.group(1)) if gap_match is not None else None,
+                                     time_period, self._time_period_index, log_time - self._last_time,
+                                     log_time - self._time_period_start_time, log_time - self._start_time, message)
+        self._last_time = log_time
+        self._last_iteration = iteration
+        return progress
+
+
+class StoppingPolicy:
+    """ Base class of stopping policies defined in Python, evaluated per iteration of the assignment in addition to its
+    maximum number of iterations and epsilon, see StopCriterionWrapper.set_stopping_policies
+    """
+
+    def reset(self):
+        """ Called at the start of each time period, before its first iteration is evaluated
+        """
+        pass
+
+    @abstractmethod
+    def should_stop(self, progress: IterationProgress) -> bool:
+        """ Evaluate the progress of an iteration
+        :param progress of the iteration
+        :return true when the assignment of the time period should stop, false otherwise
+        """
+        pass
+
+
+class GapImprovementPolicy(StoppingPolicy):
+    """ Stop when the gap improved by less than the minimum improvement over the last window iterations, i.e., when the
+    assignment has plateaued
+    """
+
+    def __init__(self, window: int, min_improvement: float, relative: bool = True):
+        """ Initialiser
+        :param window number of iterations the improvement is measured over
+        :param min_improvement the minimum improvement of the gap over the window
+        :param relative when true the improvement is relative to the gap at the start of the window, absolute otherwise
+        """
+        self._window = window
+        self._min_improvement = min_improvement
+        self._relative = relative
+        self._gaps = deque(maxlen=window + 1)
+
+    def reset(self):
+        self._gaps.clear()
+
+    def should_stop(self, progress: IterationProgress) -> bool:
+        if progress.gap is None:
+            return False
+        self._gaps.append(progress.gap)
+        if len(self._gaps) <= self._window:
+            return False
+        improvement = self._gaps[0] - progress.gap
+        if self._relative:
+            if self._gaps[0] == 0:
+                return True
+            improvement /= abs(self._gaps[0])
+        return improvement < self._min_improvement
+
+
+class TimeBudgetPolicy(StoppingPolicy):
+    """ Stop once a wall-clock budget is exhausted, either for the run as a whole or for each time period
+    """
+
+    def __init__(self, budget: float, per_time_period: bool = False):
+        """ Initialiser
+        :param budget the wall-clock budget (seconds)
+        :param per_time_period when true the budget applies to each time period, otherwise to the run as a whole
+        """
+        self._budget = budget
+        self._per_time_period = per_time_period
+
+    def should_stop(self, progress: IterationProgress) -> bool:
+        duration = progress.time_period_duration if self._per_time_period else progress.elapsed
+        return duration >= self._budget
@@ -1,4 +1,6 @@
 import os
+from typing import Callable
+
 from planit import BaseWrapper, GatewayUtils
 from planit import MacroscopicNetworkWrapper 
 from planit import DemandsWrapper
@@ -11,17 +13,23 @@ from planit import OutputFormatter
 from planit import InitialCostWrapper
 from planit import TimePeriodWrapper
 from planit import InitialCost
+from planit import InitialCostCache
 from planit import GatewayState
+from planit import IterationMonitor
+from planit import IterationProgress
 
 class PlanitProject ():
     """ The Python equivalent of a PlanitsimpleProject used to conduct traffic assignment
         with a single network, zoning, demand combination that is parsed upon instantiation 
     """
     
-    def __init__(self, project_path=None):
+    def __init__(self, project_path=None, gateway_state: GatewayState = None):
         """Constructor of PLApython project wrapper which acts as an interface to the underlying PLANit Java code
         :param project_path the path location of the XML input file(s) to be used by PLANitIO
+        :param gateway_state the gateway state (of the Planit instance) to create the project on, default
+        GatewayState.of()
         """
+        self._gateway_state = gateway_state or GatewayState.of()
         self._project_instance = None
         self._assignment_configurator = None
         self._input_builder_instance = None
@@ -43,7 +51,7 @@ class PlanitProject ():
         """
         if project_path == None:
             project_path = os.getcwd()
-        self._project_instance = BaseWrapper(GatewayState.python_2_java_gateway.entry_point.initialiseSimpleProject(project_path))
+        self._project_instance = BaseWrapper(self._gateway_state.entry_point.initialiseSimpleProject(project_path))
     
         # The one macroscopic network, zoning, demand is created and populated and wrapped in a Python object (Note1:
         # to access public members in Java, we must collect it via the field method in the wrapper) (Note2: since we
@@ -53,7 +61,8 @@ class PlanitProject ():
         # the one zoning is created and populated
         self._zoning_instance = ZoningWrapper(self._project_instance.field("zonings").getFirst())
         # the one demands is created and populated
-        self._demands_instance = DemandsWrapper(self._project_instance.field("demands").getFirst())      
+        self._demands_instance = DemandsWrapper(self._project_instance.field("demands").getFirst(),
+                                                self._zoning_instance, self._network_instance)
         self._initial_cost_instance = InitialCost()
         
         # PLANIT_IO output formatter is activated by default, MemoryOutputFormatter is off by default
@@ -70,11 +79,11 @@ class PlanitProject ():
             """ Collects the arguments of the function 'name' (wrapper function within getattr).
             """
 
-            if GatewayState.gateway_is_running:
+            if self._gateway_state.gateway_is_running:
                 java_name = GatewayUtils.to_camelcase(name)
                 # pass all calls on to the underlying PLANit project java class which is obtained via the
                 # entry_point.getProject call
-                return getattr(GatewayState.planit_project, java_name)(*args) # invoke without arguments
+                return getattr(self._gateway_state.planit_project, java_name)(*args) # invoke without arguments
             else:
                 raise Exception('PLANit java interface not available')      
         return method
@@ -86,9 +95,15 @@ class PlanitProject ():
 
         time_periods_xml_id_set = self._initial_cost_instance.get_time_periods_xml_id_set()
         
-        if self._initial_cost_instance.get_default_initial_cost_file_location() != None:
-            default_initial_cost_counterpart = self._project_instance.create_and_register_initial_link_segment_cost(self._network_instance.java, self._initial_cost_instance.get_default_initial_cost_file_location())
-            default_initial_cost_wrapper = InitialCostWrapper(default_initial_cost_counterpart)
+        if self._initial_cost_instance.is_in_memory():
+            default_initial_cost_wrapper = self.__create_in_memory_initial_cost(None)
+            self._assignment_configurator.register_initial_link_segment_cost(default_initial_cost_wrapper.java)
+        elif self._initial_cost_instance.get_default_initial_cost_file_location() != None:
+            default_initial_cost_file_location = self._initial_cost_instance.get_default_initial_cost_file_location()
+            default_initial_cost_wrapper = self.__create_initial_cost(
+                default_initial_cost_file_location, None,
+                lambda: self._project_instance.create_and_register_initial_link_segment_cost(
+                    self._network_instance.java, default_initial_cost_file_location))
             self._assignment_configurator.register_initial_link_segment_cost(default_initial_cost_wrapper.java)
             
         if len(time_periods_xml_id_set) > 0:            
@@ -97,16 +112,49 @@ class PlanitProject ():
                 time_period = TimePeriodWrapper(time_period_counterpart)
                 time_period_xml_id = time_period.get_xml_id()
                 if time_period_xml_id in time_periods_xml_id_set:
-                    initial_cost_file_location = \
-                        self._initial_cost_instance.get_initial_cost_file_location_by_time_period_xml_id(
-                            time_period_xml_id)
-                    initial_cost_counterpart = \
-                        self._project_instance.create_and_register_initial_link_segment_cost(
-                            self._network_instance.java, initial_cost_file_location, time_period_counterpart)
-                    initial_cost_wrapper = InitialCostWrapper(initial_cost_counterpart)
+                    if self._initial_cost_instance.is_in_memory(time_period_xml_id):
+                        initial_cost_wrapper = self.__create_in_memory_initial_cost(time_period_xml_id, time_period)
+                    else:
+                        initial_cost_file_location = \
+                            self._initial_cost_instance.get_initial_cost_file_location_by_time_period_xml_id(
+                                time_period_xml_id)
+                        initial_cost_wrapper = self.__create_initial_cost(
+                            initial_cost_file_location, time_period_xml_id,
+                            lambda: self._project_instance.create_and_register_initial_link_segment_cost(
+                                self._network_instance.java, initial_cost_file_location, time_period_counterpart))
                     self._assignment_configurator.register_initial_link_segment_cost(
                         time_period.java, initial_cost_wrapper.get_time_period_costs(time_period).java)
                             
+    def __create_initial_cost(self, initial_cost_file_location: str, time_period_xml_id, create) -> InitialCostWrapper:
+        """ Provide the parsed initial costs of the file, reused from the InitialCostCache of the gateway session when
+        parsed before by a previous run of this project (never across projects, each has its own network)
+        :param initial_cost_file_location location of the initial cost file
+        :param time_period_xml_id XML id of the time period the initial costs apply to, None for all
+        :param create creates and registers the Java initial costs by parsing the file
+        :return wrapper of the parsed initial costs
+        """
+        return InitialCostCache.of(self._gateway_state).get_or_create(
+            initial_cost_file_location, self._network_instance, time_period_xml_id,
+            lambda: InitialCostWrapper(create()))
+
+    def __create_in_memory_initial_cost(self, time_period_xml_id, time_period: TimePeriodWrapper = None) \
+            -> InitialCostWrapper:
+        """ Create Java initial costs and set the in memory costs of the time period on them directly, see
+        InitialCost.set_costs
+        :param time_period_xml_id XML id of the time period the initial costs apply to, None for all
+        :param time_period the time period (wrapper) the initial costs apply to, None for all
+        :return wrapper of the initial costs
+        """
+        initial_cost_wrapper = InitialCostWrapper(GatewayUtils.get_java_class(
+            'org.goplanit.cost.physical.initial.InitialLinkSegmentCost', self._gateway_state)(
+            GatewayUtils.get_java_class('org.goplanit.utils.id.IdGroupingToken',
+                                        self._gateway_state).collectGlobalToken()))
+        for mode_xml_id, (link_segment_xml_ids, costs) in \
+                self._initial_cost_instance.get_in_memory_costs(time_period_xml_id).items():
+            initial_cost_wrapper.set_segment_costs(
+                self._network_instance, mode_xml_id, link_segment_xml_ids, costs, time_period)
+        return initial_cost_wrapper
+
     def set(self, assignment_component):
         """Set the traffic assignment component
         :param assignment_component the  assignment component
@@ -143,10 +191,16 @@ class PlanitProject ():
             self._io_output_formatter_instance = None
         elif formatter_component == OutputFormatter.MEMORY:
             self._activate_memory_output_formatter = False
+            if self._memory_output_formatter_instance is not None:
+                self._memory_output_formatter_instance.release_memory_maps()
             self._memory_output_formatter_instance = None
         
-    def run(self):
+    def run(self, on_iteration: Callable[[IterationProgress], None] = None):
         """Run the traffic assignment.  Register any output formatters which have been set up
+        :param on_iteration when provided, called with the progress (iteration, gap, timings) of each iteration of the
+        assignment while it runs, see IterationMonitor. Requires a standalone Planit instance, as do stopping policies
+        (see StopCriterionWrapper.set_stopping_policies). An exception raised by it, or no iteration being reported at
+        all, is raised once the assignment has finished
         """
         if (self._assignment_configurator == None):
             raise Exception("Called plan_it.run() with no Traffic Assignment set")
@@ -154,8 +208,26 @@ class PlanitProject ():
             self._assignment_configurator.register_output_formatter(self._io_output_formatter_instance.java);
         if (self._activate_memory_output_formatter):      
             self._assignment_configurator.register_output_formatter(self._memory_output_formatter_instance.java)
+            # output configuration might have changed since results were last collected
+            self._memory_output_formatter_instance.clear_cache()
         self.__register_initial_costs__()
-        self._project_instance.execute_all_traffic_assignments()   
+        stop_criterion = self._assignment_configurator.gap_function.stop_criterion
+        if on_iteration is None and not stop_criterion.stopping_policies:
+            self._project_instance.execute_all_traffic_assignments()
+            return
+
+        def handle_iteration(progress: IterationProgress):
+            if stop_criterion.stopping_policies:
+                stop_criterion._apply_stopping_policies(progress)
+            if on_iteration is not None:
+                on_iteration(progress)
+
+        stop_criterion._start_run()
+        try:
+            with IterationMonitor(handle_iteration, self._gateway_state):
+                self._project_instance.execute_all_traffic_assignments()
+        finally:
+            stop_criterion._end_run()   
                                         
     @property
     def assignment(self):
@@ -171,6 +243,12 @@ class PlanitProject ():
         """
         return self._network_instance
     
+    @property
+    def zoning(self):
+        """access to the zoning
+        """
+        return self._zoning_instance
+    
     @property
     def demands(self):
         """access to the demands
@@ -183,6 +261,13 @@ class PlanitProject ():
         """
         return self._io_output_formatter_instance
     
+    def release_memory_maps(self):
+        """Remove the files backing the results collected via memory.to_memmap, views on them must no longer be used.
+        Otherwise this happens when the memory output formatter is deactivated or the project is garbage collected
+        """
+        if self._memory_output_formatter_instance is not None:
+            self._memory_output_formatter_instance.release_memory_maps()
+
     @property
     def memory(self):
         """access to memory output formatter
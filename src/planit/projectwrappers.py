@@ -1,13 +1,31 @@
+import math
 import os
+import queue
+import shutil
+import tempfile
+import threading
+import uuid
+import weakref
+from typing import Dict, Iterator, List, Tuple
 
+import numpy as np
+import pandas as pd
 from py4j.java_gateway import get_field
+from py4j.protocol import Py4JError
+from py4j.protocol import Py4JJavaError
 from planit import BaseWrapper
+from planit import GatewayConfig
 from planit import GatewayUtils
 from planit import GatewayState
 from planit import OutputType
 from planit import UnitType
 from planit import PathIdType
 from planit import OutputProperty
+from planit import IterationProgress
+from planit import StoppingPolicy
+from planit import NetworkIndex
+from planit import NetworkGeometry
+from planit import NetworkEntityTable
 from planit import PhysicalCost
 from planit import VirtualCost
 from planit import Smoothing
@@ -49,7 +67,7 @@ class AssignmentWrapper(BaseWrapper):
     def __create_java_output_type(self, output_type):
         """ create an output type enum suitable to pass to java 
         """   
-        return GatewayState.python_2_java_gateway.entry_point.createEnum(output_type.java_class_name(), output_type.value)
+        return self.gateway_state.entry_point.createEnum(output_type.java_class_name(), output_type.value)
     
     def set(self, assignment_component):
         """ Configure an assignment component on this assignment instance. Note that all these go via the traffic assignment builder in Java
@@ -158,12 +176,226 @@ class AssignmentWrapper(BaseWrapper):
         return self._virtual_cost_instance
         
 class DemandsWrapper(BaseWrapper):
-    """ Wrapper around the Java Demands class instance
+    """ Wrapper around the Java Demands class instance. OD demand matrices can be exchanged as NumPy arrays, with
+    origins and destinations in the order of the OD zones of the zoning, see ZoningWrapper.od_zone_index
     """
     
-    def __init__(self, java_counterpart):
-        super().__init__(java_counterpart)    
-        
+    def __init__(self, java_counterpart, zoning_instance=None, network_instance=None):
+        super().__init__(java_counterpart)
+        self._zoning_instance = zoning_instance
+        self._network_instance = network_instance
+
+    def to_matrix(self, mode_xml_id: str, time_period_xml_id: str, sparse: bool = False):
+        """ Collect the OD demands (pcu/h) of a mode and time period in a single transfer
+        :param mode_xml_id XML id of the mode
+        :param time_period_xml_id XML id of the time period
+        :param sparse when true the non-zero demands are returned as COO triplets rather than as dense matrix
+        :return dense float64 matrix (origin x destination), or when sparse a tuple of origin positions, destination
+        positions (both int64) and demands (float64)
+        """
+        java_od_demands = self.__get_java_od_demands(mode_xml_id, time_period_xml_id)
+        java_od_zones, od_zones = self._zoning_instance._get_od_zones()
+        num_od_zones = len(od_zones)
+        try:
+            # the demand of each OD pair collected on the Java side, when sparse only of the non-zero OD pairs
+            gateway_state = GatewayState.of(java_od_demands)
+            java_demand_at = DemandsWrapper.__to_java_demand_at(java_od_demands, java_od_zones, num_od_zones)
+            if not sparse:
+                return DemandsWrapper.__collect_java_demands(java_demand_at, GatewayUtils.get_java_class(
+                    'java.util.stream.IntStream', gateway_state).range(0, num_od_zones * num_od_zones),
+                    num_od_zones * num_od_zones).reshape(num_od_zones, num_od_zones)
+            java_positions = GatewayUtils.get_java_class('java.util.stream.IntStream', gateway_state).range(
+                0, num_od_zones * num_od_zones).filter(DemandsWrapper.__to_java_is_non_zero(java_demand_at)).toArray()
+            positions = GatewayUtils.to_numpy_array(java_positions, 'int', len(java_positions), gateway_state)
+            demands = DemandsWrapper.__collect_java_demands(java_demand_at, GatewayUtils.get_java_class(
+                'java.util.Arrays', gateway_state).stream(java_positions), len(positions))
+            origins, destinations = np.divmod(positions.astype(np.int64), num_od_zones)
+            return origins, destinations, demands
+        except Py4JError:
+            # per OD pair, e.g., when the demands do not allow their methods to be invoked from the Java side
+            matrix = self._to_matrix_per_pair(mode_xml_id, time_period_xml_id)
+        if not sparse:
+            return matrix
+        origins, destinations = np.nonzero(matrix)
+        return origins.astype(np.int64), destinations.astype(np.int64), matrix[origins, destinations]
+
+    def set_matrix(self, mode_xml_id: str, time_period_xml_id: str, matrix):
+        """ Set the OD demands (pcu/h) of a mode and time period in a single transfer, e.g., to run a scenario with
+        modified demand without re-initialising the project. The demands of the mode and time period must exist
+        :param mode_xml_id XML id of the mode
+        :param time_period_xml_id XML id of the time period
+        :param matrix dense matrix (origin x destination) replacing all demands, or a tuple of origin positions,
+        destination positions and demands (COO triplets) setting only these OD pairs
+        """
+        java_od_demands = self.__get_java_od_demands(mode_xml_id, time_period_xml_id)
+        java_od_zones, od_zones = self._zoning_instance._get_od_zones()
+        num_od_zones = len(od_zones)
+        origins, destinations, demands = DemandsWrapper.__to_od_triplets(matrix, num_od_zones)
+        try:
+            # the demands (and for triplets their OD positions) transferred in bulk and set on the Java side
+            gateway_state = GatewayState.of(java_od_demands)
+            java_demands = GatewayUtils.to_java_array(GatewayUtils.get_java_class('double', gateway_state), demands,
+                                                      gateway_state)
+            if origins is not None:
+                GatewayUtils.invoke_per_position(
+                    java_od_demands, 'setValue', [(java_od_zones, origins), (java_od_zones, destinations),
+                                                  java_demands], len(demands))
+                return
+            # the OD pair of each position of the flattened matrix derived on the Java side
+            method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+            method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+            java_set_demand_at = DemandsWrapper.__to_java_od_pair_method(
+                java_od_demands, 'setValue', java_od_zones, num_od_zones,
+                method_handles.arrayElementGetter(java_demands.getClass()).bindTo(java_demands))
+            GatewayUtils.get_java_class('java.util.stream.IntStream', gateway_state).range(0, len(demands)).forEach(
+                GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+                    GatewayUtils.get_java_class('java.util.function.IntConsumer', gateway_state)._java_lang_class,
+                    java_set_demand_at.asType(method_type.methodType(
+                        GatewayUtils.get_java_class('java.lang.Void.TYPE', gateway_state),
+                        GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)))))
+        except Py4JError:
+            # per OD pair, e.g., when the demands do not allow their methods to be invoked from the Java side
+            self._set_matrix_per_pair(mode_xml_id, time_period_xml_id, matrix)
+
+    def _to_matrix_per_pair(self, mode_xml_id: str, time_period_xml_id: str) -> np.ndarray:
+        """ to_matrix (dense) with a call per OD pair, the fallback when the demands can not be collected in bulk
+        """
+        java_od_demands = self.__get_java_od_demands(mode_xml_id, time_period_xml_id)
+        java_od_zones, od_zones = self._zoning_instance._get_od_zones()
+        num_od_zones = len(od_zones)
+        od_zone_counterparts = [java_od_zones[index] for index in range(num_od_zones)]
+        return np.array([[java_od_demands.getValue(origin, destination) or 0.0
+                          for destination in od_zone_counterparts] for origin in od_zone_counterparts],
+                        dtype=np.float64).reshape(num_od_zones, num_od_zones)
+
+    def _set_matrix_per_pair(self, mode_xml_id: str, time_period_xml_id: str, matrix):
+        """ set_matrix with a call per OD pair, the fallback when the demands can not be set in bulk
+        """
+        java_od_demands = self.__get_java_od_demands(mode_xml_id, time_period_xml_id)
+        java_od_zones, od_zones = self._zoning_instance._get_od_zones()
+        origins, destinations, demands = DemandsWrapper.__to_od_triplets(matrix, len(od_zones))
+        if origins is None:
+            origins, destinations = np.divmod(np.arange(len(demands), dtype=np.int64), len(od_zones))
+        for origin, destination, demand in zip(origins.tolist(), destinations.tolist(), demands.tolist()):
+            java_od_demands.setValue(java_od_zones[origin], java_od_zones[destination], demand)
+
+    def __get_java_od_demands(self, mode_xml_id: str, time_period_xml_id: str):
+        """ the Java OD demands of the mode and time period
+        """
+        time_period_counterpart = TimePeriodsWrapper(self.field("timePeriods")).get_by_xml_id(time_period_xml_id)
+        mode_counterpart = self._network_instance.get_mode_by_xml_id(mode_xml_id)
+        if time_period_counterpart is None or mode_counterpart is None:
+            raise Exception(f'Unknown mode {mode_xml_id} or time period {time_period_xml_id} for OD demands')
+        java_od_demands = self._java_counterpart.get(mode_counterpart, time_period_counterpart)
+        if java_od_demands is None:
+            raise Exception(f'No OD demands for mode {mode_xml_id} and time period {time_period_xml_id}')
+        return java_od_demands
+
+    @staticmethod
+    def __to_java_od_pair_method(java_od_demands, method_name: str, java_od_zones, num_od_zones: int,
+                                 java_value_at=None):
+        """ Java method handle (int position) -> Object invoking a method of the OD demands with the origin and
+        destination of the position in a flattened (origin x destination) matrix, derived on the Java side as
+        position / num_od_zones and position % num_od_zones, and when given the value of java_value_at, a method handle
+        (int position) -> value, at the position. The method handle is built like the one of
+        GatewayUtils.invoke_per_position, but without transferring the positions of all OD pairs
+        """
+        gateway_state = GatewayState.of(java_od_demands)
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        int_class = GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)
+        java_position_to_object = method_type.methodType(
+            GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class, int_class)
+
+        java_od_zone_at = method_handles.arrayElementGetter(java_od_zones.getClass()).bindTo(java_od_zones)
+        java_arguments_at = []
+        for math_method_name in ['floorDiv', 'floorMod']:
+            java_od_position_at = method_handles.insertArguments(method_handles.publicLookup().findStatic(
+                GatewayUtils.get_java_class('java.lang.Math', gateway_state)._java_lang_class, math_method_name,
+                method_type.methodType(int_class, int_class, int_class)), 1, GatewayUtils.to_java_array(
+                    GatewayUtils.get_java_class('java.lang.Object', gateway_state), [num_od_zones], gateway_state))
+            java_arguments_at.append(method_handles.filterReturnValue(java_od_position_at, java_od_zone_at).asType(
+                java_position_to_object))
+        if java_value_at is not None:
+            java_arguments_at.append(java_value_at.asType(java_position_to_object))
+
+        java_method = GatewayUtils.to_method_handle(
+            java_od_demands, method_name, len(java_arguments_at), gateway_state).asType(
+            method_type.genericMethodType(len(java_arguments_at)))
+        java_method = method_handles.filterArguments(java_method, 0, GatewayUtils.to_java_array(
+            GatewayUtils.get_java_class('java.lang.invoke.MethodHandle', gateway_state), java_arguments_at,
+            gateway_state))
+        return method_handles.permuteArguments(java_method, java_position_to_object, GatewayUtils.to_java_array(
+            GatewayUtils.get_java_class('int', gateway_state), [0] * len(java_arguments_at), gateway_state))
+
+    @staticmethod
+    def __to_java_demand_at(java_od_demands, java_od_zones, num_od_zones: int):
+        """ Java method handle (int position) -> double, the demand of the OD pair at the position in a flattened
+        (origin x destination) matrix, absent demands (null) become 0.0
+        """
+        gateway_state = GatewayState.of(java_od_demands)
+        int_class = GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)
+        return GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state).explicitCastArguments(
+            DemandsWrapper.__to_java_od_pair_method(java_od_demands, 'getValue', java_od_zones, num_od_zones),
+            GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state).methodType(
+                GatewayUtils.get_java_class('java.lang.Double.TYPE', gateway_state), int_class))
+
+    @staticmethod
+    def __to_java_is_non_zero(java_demand_at):
+        """ Java IntPredicate testing whether the demand at a position, see __to_java_demand_at, is non-zero, i.e.,
+        Double.compare(Math.abs(demand), 0.0) != 0. The comparison result is cast to boolean, which keeps its lowest
+        bit (see MethodHandles.explicitCastArguments), so -1 and 1 become true and 0 becomes false
+        """
+        gateway_state = GatewayState.of(java_demand_at)
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        double_class = GatewayUtils.get_java_class('java.lang.Double.TYPE', gateway_state)
+        int_class = GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)
+        java_compare = method_handles.insertArguments(method_handles.publicLookup().findStatic(
+            GatewayUtils.get_java_class('java.lang.Double', gateway_state)._java_lang_class, 'compare',
+            method_type.methodType(int_class, double_class, double_class)), 1, GatewayUtils.to_java_array(
+                GatewayUtils.get_java_class('java.lang.Object', gateway_state), [0.0], gateway_state))
+        java_abs = method_handles.publicLookup().findStatic(
+            GatewayUtils.get_java_class('java.lang.Math', gateway_state)._java_lang_class, 'abs',
+            method_type.methodType(double_class, double_class))
+        java_is_non_zero_at = method_handles.explicitCastArguments(
+            method_handles.filterReturnValue(java_demand_at, method_handles.filterReturnValue(java_abs, java_compare)),
+            method_type.methodType(GatewayUtils.get_java_class('java.lang.Boolean.TYPE', gateway_state), int_class))
+        return GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+            GatewayUtils.get_java_class('java.util.function.IntPredicate', gateway_state)._java_lang_class,
+            java_is_non_zero_at)
+
+    @staticmethod
+    def __collect_java_demands(java_demand_at, java_positions, num_positions: int) -> np.ndarray:
+        """ the demands at the positions of a Java IntStream, see __to_java_demand_at, collected on the Java side and
+        transferred in bulk
+        """
+        gateway_state = GatewayState.of(java_demand_at)
+        java_demands = java_positions.mapToDouble(GatewayUtils.get_java_class(
+            'java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+            GatewayUtils.get_java_class('java.util.function.IntToDoubleFunction', gateway_state)._java_lang_class,
+            java_demand_at)).toArray()
+        return GatewayUtils.to_numpy_array(java_demands, 'double', num_positions, gateway_state)
+
+    @staticmethod
+    def __to_od_triplets(matrix, num_od_zones: int) -> Tuple:
+        """ validated origin positions, destination positions and (float64) demands of COO triplets, or of a dense
+        matrix its flattened (float64) demands, in which case the origin and destination positions are None
+        """
+        if isinstance(matrix, tuple):
+            origins, destinations, demands = (np.asarray(triplet).ravel() for triplet in matrix)
+            if not len(origins) == len(destinations) == len(demands):
+                raise Exception(f'{len(origins)} origins, {len(destinations)} destinations and {len(demands)} demands '
+                                f'provided, they should be of equal length')
+            if len(origins) > 0 and (min(origins.min(), destinations.min()) < 0 or
+                                     max(origins.max(), destinations.max()) >= num_od_zones):
+                raise Exception(f'OD zone positions should be in the range [0, {num_od_zones})')
+            return origins.astype(np.int64), destinations.astype(np.int64), demands.astype(np.float64)
+        demands = np.asarray(matrix)
+        if demands.shape != (num_od_zones, num_od_zones):
+            raise Exception(f'Demand matrix of shape {demands.shape} provided for {num_od_zones} OD zones')
+        return None, None, demands.ravel().astype(np.float64)
+
 class GapFunctionWrapper(BaseWrapper):
     """ Wrapper around the Java GapFunction class instance
     """
@@ -193,6 +425,50 @@ class InitialCostWrapper(BaseWrapper):
         """
         return InitialCostModesWrapper(self._java_counterpart.getTimePeriodAgnosticCosts())
 
+    def set_segment_costs(self, network_instance, mode_xml_id: str, link_segment_xml_ids, costs, time_period=None):
+        """Set the initial costs of link segments of a mode, in a constant number of calls regardless of the number of
+        link segments (see GatewayUtils.invoke_per_position). Nothing is set when the mode or any link segment is
+        unknown
+        :param network_instance the network (wrapper) of the link segments
+        :param mode_xml_id XML id of the mode the costs apply to
+        :param link_segment_xml_ids XML ids of the link segments
+        :param costs the cost per link segment, aligned with link_segment_xml_ids
+        :param time_period the time period (wrapper) the costs apply to, None for the time period agnostic costs
+        """
+        link_segment_xml_ids = [str(link_segment_xml_id) for link_segment_xml_id in link_segment_xml_ids]
+        java_modes, mode_positions = network_instance._locate_modes([mode_xml_id])
+        if mode_positions[0] is None:
+            raise Exception(f'Unknown mode {mode_xml_id} when setting initial costs')
+        java_link_segments, link_segment_positions = network_instance._locate_link_segments(
+            mode_xml_id, link_segment_xml_ids)
+        unknown_xml_ids = [link_segment_xml_id for link_segment_xml_id, link_segment_position
+                           in zip(link_segment_xml_ids, link_segment_positions) if link_segment_position is None]
+        if unknown_xml_ids:
+            raise Exception(f'{len(unknown_xml_ids)} unknown link segment(s) when setting initial costs of mode '
+                            f'{mode_xml_id}, e.g., {unknown_xml_ids[:10]}')
+        num_link_segments = len(link_segment_xml_ids)
+        if num_link_segments == 0:
+            return
+
+        gateway_state = GatewayState.of(self._java_counterpart)
+        arguments = [(java_modes, [mode_positions[0]] * num_link_segments),
+                     (java_link_segments, link_segment_positions),
+                     GatewayUtils.to_java_array(GatewayUtils.get_java_class('double', gateway_state),
+                                                np.asarray(costs, dtype=np.float64), gateway_state)]
+        if time_period is not None:
+            arguments.insert(0, (GatewayUtils.to_java_array(GatewayUtils.get_java_class(
+                'java.lang.Object', gateway_state), [time_period.java], gateway_state), [0] * num_link_segments))
+        try:
+            GatewayUtils.invoke_per_position(self._java_counterpart, 'setSegmentCost', arguments, num_link_segments)
+        except Py4JError:
+            # per link segment, e.g., when the initial costs do not allow their methods to be invoked from the Java side
+            java_mode = java_modes[mode_positions[0]]
+            time_period_arguments = [time_period.java] if time_period is not None else []
+            for cost, link_segment_position in zip(np.asarray(costs, dtype=np.float64).tolist(),
+                                                   link_segment_positions):
+                self._java_counterpart.setSegmentCost(
+                    *time_period_arguments, java_mode, java_link_segments[link_segment_position], cost)
+
 class InitialCostModesWrapper(BaseWrapper):
     """ Wrapper around the Java InitialCostModes class instance which tracks initial costs across modes but without    
         any knowledge of what time period (if any) it belongs to
@@ -244,18 +520,444 @@ class MacroscopicLinkSegmentTypeWrapper(BaseWrapper):
         super().__init__(java_counterpart)      
  
 class MacroscopicNetworkWrapper(BaseWrapper):
-    """ Wrapper around the Java physical network class instance
+    """ Wrapper around the Java physical network class instance. Lookups of its modes, transport layers, link segment
+    types and link segments by XML id are served from indexes (XML id to Java object) that are built lazily, once per
+    network. When an XML id is not found, its index is rebuilt if the number of entities changed since it was built, use
+    invalidate_indexes after any other change to the network
     """
     
     def __init__(self, java_counterpart):
         super().__init__(java_counterpart)
+        # per container, its entities as Java array, their position by XML id, and the number of entities
+        self._xml_id_indexes = {}
+        # per mode XML id, the transport layer of the mode and the layer's XML id
+        self._layers_by_mode_xml_id = {}
+        self._index = None
+
+    def invalidate_indexes(self):
+        """ Discard all lookup indexes as well as the index snapshot, they are rebuilt on their next use
+        """
+        self._xml_id_indexes.clear()
+        self._layers_by_mode_xml_id.clear()
+        self._index = None
+
+    def index(self) -> NetworkIndex:
+        """ Snapshot of the ids, XML ids and external ids of the modes, nodes, link segment types and link segments of
+        the network, collected in bulk on first access and kept until invalidate_indexes, e.g., to join results or
+        prepare parameters by local lookups
+        :return the network index
+        """
+        if self._index is None:
+            self._index = NetworkIndex.of(self._java_counterpart)
+        return self._index
+
+    def geometry(self) -> NetworkGeometry:
+        """ Node locations and link segment polylines of the network as NumPy coordinate arrays, shipped in bulk rather
+        than via a conversion to (and reading of) geometry files. Collected anew on each call
+        :return the network geometry
+        """
+        return NetworkGeometry.of(self._java_counterpart)
+
+    def get_mode_by_xml_id(self, mode_xml_id: str):
+        """ :param mode_xml_id XML id of the mode
+        :return the Java mode, None when not present
+        """
+        return self.__get_by_xml_id(('modes',), self._java_counterpart.getModes, mode_xml_id)
+
+    def get_layer_by_mode_xml_id(self, mode_xml_id: str):
+        """ :param mode_xml_id XML id of the mode
+        :return the Java transport layer supporting the mode, None when the mode is not present
+        """
+        layer = self.__get_layer(mode_xml_id)
+        return layer[0] if layer is not None else None
+
+    def get_link_segment_type_by_xml_id(self, mode_xml_id: str, link_segment_type_xml_id: str):
+        """ :param mode_xml_id XML id of a mode of the transport layer of the link segment type
+        :param link_segment_type_xml_id XML id of the link segment type
+        :return the Java link segment type, None when not present
+        """
+        layer = self.__get_layer(mode_xml_id)
+        if layer is None:
+            return None
+        # cannot use field "linkSegmentTypes", the layer is an InfrastructureLayer to py4j which cannot access fields of
+        # the derived type, hence the method is called for it to find the derived implementation
+        return self.__get_by_xml_id(('link_segment_types', layer[1]), layer[0].getLinkSegmentTypes,
+                                    link_segment_type_xml_id)
+
+    def get_link_segment_by_xml_id(self, mode_xml_id: str, link_segment_xml_id: str):
+        """ :param mode_xml_id XML id of a mode of the transport layer of the link segment
+        :param link_segment_xml_id XML id of the link segment
+        :return the Java link segment, None when not present
+        """
+        layer = self.__get_layer(mode_xml_id)
+        if layer is None:
+            return None
+        return self.__get_by_xml_id(('link_segments', layer[1]), layer[0].getLinkSegments, link_segment_xml_id)
+
+    def __get_layer(self, mode_xml_id: str):
+        """ the transport layer of the mode and its XML id, None when the mode is not present
+        """
+        layer = self._layers_by_mode_xml_id.get(mode_xml_id)
+        if layer is None:
+            mode_counterpart = self.get_mode_by_xml_id(mode_xml_id)
+            if mode_counterpart is None:
+                return None
+            layer_counterpart = self._java_counterpart.getTransportLayers().get(mode_counterpart)
+            if layer_counterpart is None:
+                return None
+            layer = self._layers_by_mode_xml_id[mode_xml_id] = (layer_counterpart, layer_counterpart.getXmlId())
+        return layer
+
+    def _locate_modes(self, mode_xml_ids: List[str]) -> Tuple:
+        """ the modes as Java array and the positions in it of the modes with the XML ids, e.g., to pass them on to Java
+        in bulk, see GatewayUtils.invoke_per_position
+        :param mode_xml_ids XML ids of the modes
+        :return Java array of the modes and a position per XML id, None when not present
+        """
+        return self.__locate_by_xml_ids(('modes',), self._java_counterpart.getModes, mode_xml_ids)
+
+    def _locate_link_segments(self, mode_xml_id: str, link_segment_xml_ids: List[str]) -> Tuple:
+        """ the link segments of the transport layer of a mode as Java array and the positions in it of the link
+        segments with the XML ids, see _locate_modes
+        :param mode_xml_id XML id of a mode of the transport layer of the link segments
+        :param link_segment_xml_ids XML ids of the link segments
+        :return Java array of the link segments (None when the mode is not present) and a position per XML id, None
+        when not present
+        """
+        layer = self.__get_layer(mode_xml_id)
+        if layer is None:
+            return None, [None] * len(link_segment_xml_ids)
+        return self.__locate_by_xml_ids(('link_segments', layer[1]), layer[0].getLinkSegments, link_segment_xml_ids)
+
+    def __get_by_xml_id(self, index_key: tuple, get_java_container, xml_id: str):
+        """ entity of a container by XML id via its index, see __locate_by_xml_ids
+        :return the Java entity, None when not present
+        """
+        java_entities, positions = self.__locate_by_xml_ids(index_key, get_java_container, [xml_id])
+        return java_entities[positions[0]] if positions[0] is not None else None
+
+    def __locate_by_xml_ids(self, index_key: tuple, get_java_container, xml_ids: List[str]) -> Tuple:
+        """ positions of entities of a container by XML id via its index, building or rebuilding the index when needed
+        :param index_key key of the container's index
+        :param get_java_container provides the Java container, only called when the index is (re)built or checked
+        :param xml_ids XML ids of the entities
+        :return the indexed Java entities (array) and the position of each entity in it, None when not present
+        """
+        index = self._xml_id_indexes.get(index_key)
+        if index is None:
+            index = self.__build_index(index_key, get_java_container())
+        positions = [index[1].get(xml_id) for xml_id in xml_ids]
+        if None in positions:
+            java_container = get_java_container()
+            if java_container.size() != index[2]:
+                index = self.__build_index(index_key, java_container)
+                positions = [index[1].get(xml_id) for xml_id in xml_ids]
+        return index[0], positions
+
+    def __build_index(self, index_key: tuple, java_container) -> tuple:
+        """ index the entities of the container by XML id, in a single pass
+        """
+        java_entities = GatewayUtils.to_java_object_array(java_container)
+        num_entities = len(java_entities)
+        xml_ids = GatewayUtils.invoke_to_python_strings(java_entities, num_entities, 'getXmlId')
+        index = self._xml_id_indexes[index_key] = (
+            java_entities, {xml_id: position for position, xml_id in enumerate(xml_ids)}, num_entities)
+        return index
         
 class MemoryOutputIteratorWrapper(BaseWrapper):
-    """Wrapper class around MemoryOutputIterator class
+    """Wrapper class around MemoryOutputIterator class. Besides the Java style has_next/next/get_keys/get_values access,
+    it can be iterated over directly, yielding a (keys, values) tuple per row
     """
-    
-    def __init__(self, java_counterpart):
+
+    # default number of rows fetched from Java before they are yielded when iterating
+    CHUNK_SIZE = 10000
+
+    # interval (seconds) at which a blocked prefetch thread checks whether iteration was abandoned
+    PREFETCH_POLL_INTERVAL = 0.1
+
+    def __init__(self, java_counterpart, key_properties: Dict[OutputProperty, int] = None,
+                 value_properties: Dict[OutputProperty, int] = None, chunk_size: int = None, prefetch: int = 0):
+        """
+        :param java_counterpart Java counterpart for MemoryOutputIterator object
+        :param key_properties the position of each output key property, when known rows are decoded based on them
+        :param value_properties the position of each output value property, when known rows are decoded based on them
+        :param chunk_size number of rows fetched from Java before they are yielded when iterating, default CHUNK_SIZE
+        :param prefetch maximum number of chunks fetched ahead on a background thread while iterating, 0 to fetch each
+        chunk only when it is requested
+        """
         super().__init__(java_counterpart)
+        chunk_size = chunk_size if chunk_size is not None else MemoryOutputIteratorWrapper.CHUNK_SIZE
+        if not isinstance(chunk_size, int) or not 0 < chunk_size < 2 ** 31:
+            raise Exception(f'Chunk size should be a positive int (within the Java int range), found {chunk_size}')
+        self._key_properties = key_properties
+        self._value_properties = value_properties
+        self._chunk_size = chunk_size
+        self._prefetch = prefetch
+
+    def __iter__(self) -> Iterator[Tuple[tuple, tuple]]:
+        """Iterate over the remaining rows, each as a tuple of its keys and a tuple of its values, see iter_chunks
+        """
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def iter_chunks(self) -> Iterator[List[Tuple[tuple, tuple]]]:
+        """Iterate over the remaining rows in chunks, rows are fetched from Java a chunk at a time so memory use is
+        bounded by the chunk size. When the output properties are known, each chunk is transferred in a constant number
+        of calls (see _iter_string_chunks) and decoded according to their output property (see
+        OutputProperty.numpy_dtype, absent values become None, or NaN for floating point values), otherwise each entry
+        is accessed separately.
+
+        With prefetch enabled, chunks are fetched on a background thread (using its own Py4J connection) while the
+        caller processes the current chunk, with at most prefetch chunks waiting to be consumed. The Java iterator
+        must then not be accessed directly until iteration has finished or the iterator over the chunks is closed
+        :return iterator over the non-empty chunks, each a list of (keys, values) tuples
+        """
+        if self._prefetch > 0:
+            yield from MemoryOutputIteratorWrapper.__prefetch(self.__iter_fetched_chunks(), self._prefetch)
+        else:
+            yield from self.__iter_fetched_chunks()
+
+    def __iter_fetched_chunks(self) -> Iterator[List[Tuple[tuple, tuple]]]:
+        """ fetch and decode the chunks of remaining rows, see iter_chunks
+        """
+        if self._key_properties is None or self._value_properties is None:
+            yield from self.__iter_java_chunks()
+            return
+
+        key_decoders = MemoryOutputIteratorWrapper.__entry_decoders(self._key_properties)
+        value_decoders = MemoryOutputIteratorWrapper.__entry_decoders(self._value_properties)
+        for chunk in self._iter_string_chunks(len(key_decoders), len(value_decoders)):
+            if chunk:
+                yield [(tuple(decode(entry) for decode, entry in zip(key_decoders, keys)),
+                        tuple(decode(entry) for decode, entry in zip(value_decoders, values)))
+                       for keys, values in chunk]
+
+    def _iter_string_chunks(self, num_keys: int, num_values: int) -> Iterator[List[Tuple[List[str], List[str]]]]:
+        """Iterate over the remaining rows in chunks of the Java string representation of their keys and values. Each
+        chunk is fetched in a constant number of calls: a function advancing the Java iterator and rendering the keys
+        and values of the row as a single string is applied to (at most) chunk size rows on the Java side and the rows
+        are transferred as a single string, see __to_java_chunk_functions. When that is not possible, e.g., the iterator
+        is not a public Java class, the keys and values of each row are transferred in a single call each (see
+        GatewayUtils.to_python_strings)
+        :param num_keys number of keys per row
+        :param num_values number of values per row
+        :return iterator over the chunks, each a list of (keys, values) tuples, at least one (possibly empty) chunk
+        """
+        try:
+            java_has_next, java_next_row = self.__to_java_chunk_functions(num_keys, num_values)
+        except Py4JError:
+            java_has_next, java_next_row = None, None
+
+        has_yielded = False
+        while True:
+            if java_has_next is not None:
+                chunk = self.__fetch_java_chunk(java_has_next, java_next_row, num_keys, num_values)
+            else:
+                chunk = self.__fetch_row_by_row(num_keys, num_values)
+            if len(chunk) < self._chunk_size:
+                # the iterator is exhausted
+                if chunk or not has_yielded:
+                    yield chunk
+                return
+            yield chunk
+            has_yielded = True
+
+    def __to_java_chunk_functions(self, num_keys: int, num_values: int) -> Tuple:
+        """ Java functions (int) -> boolean testing whether the iterator has a next row, and (int) -> String advancing
+        the iterator and rendering the keys and values of the row joined by GatewayConfig.BULK_STRING_SEPARATOR, built
+        from method handles of the iterator (the int argument is ignored), see GatewayUtils.invoke_per_position
+        """
+        gateway_state = self.gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        java_class = GatewayUtils.get_java_class('java.lang.Class', gateway_state)
+        string_class = GatewayUtils.get_java_class('java.lang.String', gateway_state)._java_lang_class
+        object_array_class = java_class.forName('[Ljava.lang.Object;')
+        separator = GatewayConfig.BULK_STRING_SEPARATOR
+
+        # () -> String rendering the keys, respectively values, array, via String.format(format, Object... entries)
+        java_format = method_handles.publicLookup().findStatic(
+            string_class, 'format', method_type.methodType(string_class, string_class, object_array_class))
+        java_entries_to_string = []
+        for method_name, entries_format in [
+                ('getKeys', separator.join(['%s'] * num_keys)),
+                ('getValues', (separator if num_keys and num_values else '') + separator.join(['%s'] * num_values))]:
+            java_entries = GatewayUtils.to_method_handle(self._java_counterpart, method_name, 0, gateway_state).asType(
+                method_type.methodType(object_array_class))
+            java_entries_to_string.append(method_handles.filterReturnValue(
+                java_entries, method_handles.insertArguments(java_format, 0, GatewayUtils.to_java_array(
+                    GatewayUtils.get_java_class('java.lang.Object', gateway_state), [entries_format], gateway_state))))
+
+        # () -> String concatenating the rendered keys and values
+        java_row = method_handles.publicLookup().findVirtual(
+            string_class, 'concat', method_type.methodType(string_class, string_class))
+        java_row = method_handles.foldArguments(java_row, java_entries_to_string[0])
+        java_row = method_handles.foldArguments(java_row, java_entries_to_string[1])
+        return self.__to_java_row_functions(java_row)
+
+    def _iter_java_row_chunks(self, chunk_size: int = None) -> Iterator[Tuple]:
+        """Iterate over the remaining rows in chunks collected on the Java side, without transferring them: a function
+        advancing the Java iterator and pairing the keys and values arrays of the row is applied to (at most) chunk size
+        rows, see MemoryOutputFormatterWrapper.to_numpy. Raises Py4JError when the iterator can not be accessed this way
+        :param chunk_size maximum number of rows per chunk, default the chunk size of this iterator
+        :return iterator over the chunks, each a tuple of a Java Object array with an entry per row, each a Java List of
+        its keys and values arrays, and the number of rows, at least one (possibly empty) chunk is provided
+        """
+        chunk_size = chunk_size or self._chunk_size
+        gateway_state = self.gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        object_class = GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class
+        list_class = GatewayUtils.get_java_class('java.util.List', gateway_state)._java_lang_class
+
+        # () -> List.of(keys, values)
+        java_row = method_handles.publicLookup().findStatic(
+            list_class, 'of', method_type.methodType(list_class, object_class, object_class))
+        for method_name in ['getKeys', 'getValues']:
+            java_row = method_handles.foldArguments(java_row, GatewayUtils.to_method_handle(
+                self._java_counterpart, method_name, 0, gateway_state).asType(method_type.methodType(object_class)))
+        java_has_next, java_next_row = self.__to_java_row_functions(java_row)
+
+        has_yielded = False
+        while True:
+            java_rows = GatewayUtils.get_java_class('java.util.stream.IntStream', gateway_state).range(
+                0, chunk_size).takeWhile(java_has_next).mapToObj(java_next_row).toArray()
+            num_rows = len(java_rows)
+            if num_rows > 0 or not has_yielded:
+                yield java_rows, num_rows
+                has_yielded = True
+            if num_rows < chunk_size:
+                # the iterator is exhausted
+                return
+
+    def __to_java_row_functions(self, java_row) -> Tuple:
+        """ Java functions (int) -> boolean testing whether the iterator has a next row, and (int) -> Object advancing
+        the iterator and applying the method handle java_row, () -> Object, to the row (the int argument is ignored)
+        """
+        gateway_state = self.gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        java_next_row = method_handles.foldArguments(java_row, GatewayUtils.to_method_handle(
+            self._java_counterpart, 'next', 0, gateway_state).asType(method_type.methodType(
+                GatewayUtils.get_java_class('java.lang.Void.TYPE', gateway_state))))
+        java_has_next = GatewayUtils.to_method_handle(self._java_counterpart, 'hasNext', 0, gateway_state).asType(
+            method_type.methodType(GatewayUtils.get_java_class('java.lang.Boolean.TYPE', gateway_state)))
+
+        java_ignored_int = GatewayUtils.to_java_array(
+            GatewayUtils.get_java_class('java.lang.Class', gateway_state),
+            [GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state)], gateway_state)
+        java_proxies = GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state)
+        return (java_proxies.asInterfaceInstance(
+                    GatewayUtils.get_java_class('java.util.function.IntPredicate', gateway_state)._java_lang_class,
+                    method_handles.dropArguments(java_has_next, 0, java_ignored_int)),
+                java_proxies.asInterfaceInstance(
+                    GatewayUtils.get_java_class('java.util.function.IntFunction', gateway_state)._java_lang_class,
+                    method_handles.dropArguments(java_next_row, 0, java_ignored_int)))
+
+    def __fetch_java_chunk(self, java_has_next, java_next_row, num_keys: int,
+                           num_values: int) -> List[Tuple[List[str], List[str]]]:
+        """ fetch the next chunk of rows on the Java side, transferred as a single string, see _iter_string_chunks
+        """
+        gateway_state = self.gateway_state
+        java_rows = GatewayUtils.get_java_class('java.util.stream.IntStream', gateway_state).range(
+            0, self._chunk_size).takeWhile(java_has_next).mapToObj(java_next_row).collect(
+            GatewayUtils.get_java_class('java.util.stream.Collectors', gateway_state).joining(
+                GatewayConfig.BULK_RECORD_SEPARATOR))
+        if not java_rows:
+            return []
+        chunk = []
+        for row in java_rows.split(GatewayConfig.BULK_RECORD_SEPARATOR):
+            entries = row.split(GatewayConfig.BULK_STRING_SEPARATOR)
+            chunk.append((entries[:num_keys], entries[num_keys:num_keys + num_values]))
+        return chunk
+
+    def __fetch_row_by_row(self, num_keys: int, num_values: int) -> List[Tuple[List[str], List[str]]]:
+        """ fetch the next chunk of rows with two calls per row, see _iter_string_chunks
+        """
+        chunk = []
+        while len(chunk) < self._chunk_size and self.has_next():
+            self.next()
+            chunk.append((GatewayUtils.to_python_strings(self.get_keys(), num_keys),
+                          GatewayUtils.to_python_strings(self.get_values(), num_values)))
+        return chunk
+
+    def __iter_java_chunks(self) -> Iterator[List[Tuple[tuple, tuple]]]:
+        """ chunks of rows of which the keys and values are accessed entry by entry, converted by Py4J
+        """
+        chunk = []
+        while self.has_next():
+            self.next()
+            chunk.append((tuple(self.get_keys()), tuple(self.get_values())))
+            if len(chunk) >= self._chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def __prefetch(chunks: Iterator[list], max_chunks: int) -> Iterator[list]:
+        """ consume the chunks on a background thread, buffering at most max_chunks of them, exceptions raised while
+        fetching are re-raised in the caller's thread. When the returned iterator is closed before it is exhausted,
+        the background thread stops after the chunk it is fetching
+        """
+        buffer = queue.Queue(maxsize=max_chunks)
+        stopped = threading.Event()
+        end_of_chunks = object()
+
+        def put(item) -> bool:
+            while not stopped.is_set():
+                try:
+                    buffer.put(item, timeout=MemoryOutputIteratorWrapper.PREFETCH_POLL_INTERVAL)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def fetch():
+            try:
+                for chunk in chunks:
+                    if not put(chunk):
+                        return
+            except Exception as exception:
+                put(exception)
+                return
+            put(end_of_chunks)
+
+        fetch_thread = threading.Thread(target=fetch, name="planit-memory-output-prefetch", daemon=True)
+        fetch_thread.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is end_of_chunks:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stopped.set()
+            fetch_thread.join()
+
+    @staticmethod
+    def __entry_decoders(output_properties: Dict[OutputProperty, int]) -> List:
+        """ per position of the keys or values array, the function decoding the Java string representation of its
+        entries, positions without an (active) output property keep the string representation
+        """
+        entry_decoders = [lambda entry: entry] * (max(output_properties.values(), default=-1) + 1)
+        for output_property, position in output_properties.items():
+            entry_decoders[position] = MemoryOutputIteratorWrapper.__entry_decoder(output_property)
+        return entry_decoders
+
+    @staticmethod
+    def __entry_decoder(output_property: OutputProperty):
+        """ function decoding the Java string representation of an entry of the given output property
+        """
+        dtype = output_property.numpy_dtype()
+        if dtype == "int64":
+            return lambda entry: None if entry in ("", "null") else int(entry)
+        elif dtype == "float64":
+            return lambda entry: math.nan if entry in ("", "null") else float(entry)
+        return lambda entry: None if entry == "null" else entry
+
        
 class ModeWrapper(BaseWrapper):
     """ Wrapper around the Java mode class instance
@@ -302,20 +1004,21 @@ class OutputTypeConfigurationWrapper(BaseWrapper):
     def __create_java_unit_type(self, unit_type: UnitType):
         """ create a unit type enum suitable to pass to java 
         """   
-        return GatewayState.python_2_java_gateway.entry_point.createEnum(unit_type.java_class_name(), unit_type.value)
+        return self.gateway_state.entry_point.createEnum(unit_type.java_class_name(), unit_type.value)
     
     def __create_java_unit_types(self, unit_types):
         """ create a java unit type array instance based on the given type enum suitable to pass to java
         :param unit_types list of Python UnitTypes
         :return Java array of java UnitTypes 
         """              
-        _unit_type_class = GatewayState.python_2_java_gateway.jvm.org.goplanit.utils.unit.UnitType
-        return GatewayUtils.to_java_array(_unit_type_class,[self.__create_java_unit_type(unit_type) for unit_type in unit_types])     
+        _unit_type_class = self.gateway_state.jvm.org.goplanit.utils.unit.UnitType
+        return GatewayUtils.to_java_array(
+            _unit_type_class, [self.__create_java_unit_type(unit_type) for unit_type in unit_types], self.gateway_state)     
         
     def __create_java_unit(self, unit_type: UnitType):
         """ create a java unit instance based on the given type enum suitable to pass to java 
         """           
-        return GatewayState.python_2_java_gateway.jvm.org.goplanit.utils.unit.Unit.of(self.__create_java_unit_type(unit_type))
+        return self.gateway_state.jvm.org.goplanit.utils.unit.Unit.of(self.__create_java_unit_type(unit_type))
     
     def __create_java_unit(self, numerator_unit_types, denominator_unit_types):
         """ create a java unit instance based on the given numerator and denominator types in Python list form
@@ -325,12 +1028,13 @@ class OutputTypeConfigurationWrapper(BaseWrapper):
         """           
         java_numerator_unit_types = self.__create_java_unit_types(numerator_unit_types)
         java_denominator_unit_types = self.__create_java_unit_types(denominator_unit_types)
-        return GatewayState.python_2_java_gateway.jvm.org.goplanit.utils.unit.Unit.of(java_numerator_unit_types, java_denominator_unit_types)            
+        return self.gateway_state.jvm.org.goplanit.utils.unit.Unit.of(
+            java_numerator_unit_types, java_denominator_unit_types)            
         
     def __create_java_output_property(self, output_property : OutputProperty):
         """ create an output type enum suitable to pass to java 
         """   
-        return GatewayState.python_2_java_gateway.entry_point.createEnum(output_property.java_class_name(), output_property.value)                  
+        return self.gateway_state.entry_point.createEnum(output_property.java_class_name(), output_property.value)                  
         
     def add(self, output_property : OutputProperty):
         """Add an output type property to the current output type configuration
@@ -385,11 +1089,101 @@ class SmoothingWrapper(BaseWrapper):
         super().__init__(java_counterpart)
         
 class StopCriterionWrapper(BaseWrapper):
-    """ Wrapper around the Java StopCriterion class instance
+    """ Wrapper around the Java StopCriterion class instance, besides the maximum number of iterations and epsilon, it
+    supports stopping policies defined in Python
     """
     
     def __init__(self, java_counterpart):
         super().__init__(java_counterpart)
+        self._stopping_policies = []
+        self._policy_stops = {}
+        self._configured_max_iterations = None
+        self._max_iterations_lowered = False
+        self._time_period_index = None
+        self._first_iteration = None
+
+    def set_stopping_policies(self, *stopping_policies: StoppingPolicy):
+        """ Set the Python stopping policies, evaluated per iteration while the assignment runs (see IterationMonitor,
+        requires a standalone Planit instance), the assignment of a time period stops as soon as any of them decides
+        so. Stopping is achieved by lowering the maximum number of iterations to the current iteration, so the
+        assignment stops at the latest after the next iteration.
+
+        The configured maximum is restored when the first iteration of the next time period is reported, and after the
+        run. Since the next time period may evaluate its first iteration against the lowered maximum before reporting
+        it, the maximum is never lowered to (the index of) the first iteration of a time period: a policy stopping a
+        time period at its first iteration lets it run one more iteration. Time periods are told apart as reported by
+        the IterationMonitor, i.e., by their time period prefix or by the iterations starting over
+        :param stopping_policies the policies, none to remove the current ones
+        """
+        self._stopping_policies = list(stopping_policies)
+
+    @property
+    def stopping_policies(self) -> List[StoppingPolicy]:
+        """ :return the Python stopping policies
+        """
+        return self._stopping_policies
+
+    @property
+    def policy_stops(self) -> Dict[int, IterationProgress]:
+        """ :return the progress at which a stopping policy stopped the assignment per time period index of the last run
+        """
+        return self._policy_stops
+
+    def _apply_stopping_policies(self, progress: IterationProgress):
+        """ evaluate the stopping policies for the progress of an iteration, while the assignment waits
+        """
+        if progress.time_period_index != self._time_period_index:
+            # a new time period, which runs up to the configured maximum unless stopped by a policy
+            self._time_period_index = progress.time_period_index
+            self._first_iteration = progress.iteration
+            if self._configured_max_iterations is None:
+                self._configured_max_iterations = self.get_max_iterations()
+            self.__restore_max_iterations()
+            for stopping_policy in self._stopping_policies:
+                stopping_policy.reset()
+        if self._time_period_index in self._policy_stops:
+            return
+        # every policy is evaluated, so each keeps track of all iterations
+        stop = [stopping_policy.should_stop(progress) for stopping_policy in self._stopping_policies]
+        if any(stop):
+            self._policy_stops[self._time_period_index] = progress
+            # never lowered to the first iteration of the time period, as the next time period may evaluate its first
+            # iteration against the lowered maximum before it is restored, so a time period stopped at its first
+            # iteration runs one extra iteration (see set_stopping_policies)
+            self.set_max_iterations(max(progress.iteration, self._first_iteration + 1))
+            self._max_iterations_lowered = True
+
+    def __restore_max_iterations(self):
+        """ restore the configured maximum number of iterations when lowered by a stopping policy
+        """
+        if self._max_iterations_lowered:
+            self.set_max_iterations(self._configured_max_iterations)
+            self._max_iterations_lowered = False
+
+    def _start_run(self):
+        """ prepare applying the stopping policies to a new run, restoring the configured maximum number of iterations
+        first when that failed at the end of the previous run
+        """
+        self.__restore_max_iterations()
+        self._policy_stops = {}
+        self._configured_max_iterations = None
+        self._time_period_index = None
+        self._first_iteration = None
+
+    def _end_run(self):
+        """ restore the configured maximum number of iterations after a run, also when the run raised (see
+        PlanitProject.run, which calls it in a finally clause), so a lowered maximum never carries over to the next run
+        """
+        try:
+            self.__restore_max_iterations()
+        except Py4JError:
+            # the gateway has gone, e.g., the JVM was terminated to cancel the run, which must not mask the exception
+            # of the run. The maximum remains marked as lowered, so the next run restores it first
+            return
+        finally:
+            self._time_period_index = None
+            self._first_iteration = None
+        self._configured_max_iterations = None
     
 class TimePeriodWrapper(BaseWrapper):
     """ Wrapper around the Java time period class instance
@@ -425,6 +1219,32 @@ class ZoningWrapper(BaseWrapper):
     
     def __init__(self, java_counterpart):
         super().__init__(java_counterpart)
+        # the OD zones as Java array and their table, collected on first use
+        self._od_zones = None
+
+    def invalidate_indexes(self):
+        """ Discard the OD zone index, it is rebuilt on its next use
+        """
+        self._od_zones = None
+
+    def od_zone_index(self) -> NetworkEntityTable:
+        """ Ids, XML ids and external ids of the OD zones, collected in bulk on first access and kept until
+        invalidate_indexes. Its order is the order of the origins and destinations of OD matrices, see
+        DemandsWrapper.to_matrix
+        :return table of the OD zones
+        """
+        return self._get_od_zones()[1]
+
+    def _get_od_zones(self) -> Tuple:
+        """ the OD zones as Java array and their table
+        """
+        if self._od_zones is None:
+            java_od_zones = GatewayUtils.to_java_object_array(self._java_counterpart.getOdZones())
+            num_od_zones = len(java_od_zones)
+            self._od_zones = (java_od_zones, NetworkEntityTable.of(
+                *(GatewayUtils.invoke_to_python_strings(java_od_zones, num_od_zones, method_name)
+                  for method_name in ['getId', 'getXmlId', 'getExternalId'])))
+        return self._od_zones
         
 ##########################################################
 # Double derived wrappers
@@ -436,12 +1256,8 @@ class BPRCostWrapper(PhysicalCostWrapper):
     
     def __init__(self, java_counterpart, network_instance):
         super().__init__(java_counterpart)
+        # modes, layers, link segment types and link segments are looked up via the (indexed) network
         self._network_instance = network_instance
-        modes_counterpart = self._network_instance.get_modes()
-        self._modes_instance = ModesWrapper(modes_counterpart)
-        
-        layers_counterpart = network_instance.get_transport_layers()
-        self._layers_instance = TransportLayersWrapper(layers_counterpart)        
         
         
     def set_default_parameters(self, alpha: float, beta: float, mode_xml_id:str =None, link_segment_type_xml_id:str =None):
@@ -454,17 +1270,12 @@ class BPRCostWrapper(PhysicalCostWrapper):
         if (mode_xml_id == None):
             self._java_counterpart.setDefaultParameters(alpha, beta)
         else:
-            mode_counterpart = self._modes_instance.get_by_xml_id(mode_xml_id)
+            mode_counterpart = self._network_instance.get_mode_by_xml_id(mode_xml_id)
             if (link_segment_type_xml_id == None):
                 self._java_counterpart.setDefaultParameters(mode_counterpart, alpha, beta)
             else:
-                layer_counterpart = self._layers_instance.get(mode_counterpart)
-                # cannot use field "linkSegmentTypes" for some reason, likely because layer_counterpart is a InfrastructureLayer to py4j and it cannot access field of 
-                # derived type, hence we must call method for it to find the derived implementation
-                link_segment_types_counterpart = layer_counterpart.getLinkSegmentTypes()
-                link_segment_types_instance = LinkSegmentTypesWrapper(link_segment_types_counterpart)
-                
-                link_segment_type_counterpart = link_segment_types_instance.get_by_xml_id(link_segment_type_xml_id)
+                link_segment_type_counterpart = self._network_instance.get_link_segment_type_by_xml_id(
+                    mode_xml_id, link_segment_type_xml_id)
                 self.setDefaultParameters(link_segment_type_counterpart, mode_counterpart, alpha, beta)
                 
     def set_parameters(self, alpha: float, beta:float, mode_xml_id: str, link_segment_xml_id: str):
@@ -474,14 +1285,81 @@ class BPRCostWrapper(PhysicalCostWrapper):
         :param mode_xml_id, parameters only apply to this mode
         :param link_segment_xml_id, parameters apply to this link segment 
         """        
-        mode_counterpart = self._modes_instance.get_by_xml_id(mode_xml_id)
-        layer_counterpart = self._layers_instance.get(mode_counterpart)
-        link_segments_counterpart = layer_counterpart.getLinkSegments()
-        link_segments_instance = LinkSegmentsWrapper(link_segments_counterpart)
-        
-        link_segment_counterpart = link_segments_instance.get_by_xml_id(link_segment_xml_id)        
-        self._java_counterpart.setParameters(link_segment_counterpart, mode_counterpart, alpha, beta)  
-        
+        mode_counterpart = self._network_instance.get_mode_by_xml_id(mode_xml_id)
+        link_segment_counterpart = self._network_instance.get_link_segment_by_xml_id(mode_xml_id, link_segment_xml_id)
+        self._java_counterpart.setParameters(link_segment_counterpart, mode_counterpart, alpha, beta)
+
+    def set_parameters_bulk(self, alpha, beta=None, mode_xml_id=None, link_segment_xml_id=None):
+        """Set the BPR functions parameters of many link segments at once, e.g., calibrated parameters of all link
+        segments. The link segments are resolved by XML id via the network's index and all XML ids are validated before
+        any parameters are set. The parameters are transferred in bulk and set on the Java side, in a constant number of
+        calls per mode, see GatewayUtils.invoke_per_position
+        :param alpha values of the alpha parameter, or a DataFrame with columns link_segment_xml_id, mode_xml_id, alpha
+        and beta in which case the other arguments are omitted
+        :param beta values of the beta parameter
+        :param mode_xml_id XML ids of the modes the parameters apply to
+        :param link_segment_xml_id XML ids of the link segments the parameters apply to
+        Each of alpha, beta, mode_xml_id and link_segment_xml_id is either an array (or list) with a value per link
+        segment, or a single value applying to all of them
+        """
+        if isinstance(alpha, pd.DataFrame):
+            parameters = alpha
+            missing_columns = [column for column in ['link_segment_xml_id', 'mode_xml_id', 'alpha', 'beta']
+                               if column not in parameters.columns]
+            if missing_columns:
+                raise Exception(f'Columns {missing_columns} missing when setting BPR parameters in bulk')
+            alpha, beta = parameters['alpha'].to_numpy(), parameters['beta'].to_numpy()
+            mode_xml_id, link_segment_xml_id = parameters['mode_xml_id'].to_numpy(), \
+                parameters['link_segment_xml_id'].to_numpy()
+        for name, value in [('alpha', alpha), ('beta', beta), ('mode_xml_id', mode_xml_id),
+                            ('link_segment_xml_id', link_segment_xml_id)]:
+            if any(entry is None for entry in np.asarray(value, dtype=object).ravel().tolist()):
+                raise Exception(f'{name} is required when setting BPR parameters in bulk')
+        alphas, betas, mode_xml_ids, link_segment_xml_ids = np.broadcast_arrays(
+            np.asarray(alpha, dtype=np.float64), np.asarray(beta, dtype=np.float64),
+            np.asarray(mode_xml_id).astype(str), np.asarray(link_segment_xml_id).astype(str))
+        if np.isnan(alphas).any() or np.isnan(betas).any():
+            raise Exception('alpha and beta should not be NaN when setting BPR parameters in bulk')
+
+        # resolve all modes and link segments first, so nothing is set when any XML id is unknown
+        bulk_mode_xml_ids = np.unique(mode_xml_ids).tolist()
+        java_modes, mode_positions = self._network_instance._locate_modes(bulk_mode_xml_ids)
+        unknown_xml_ids = [bulk_mode_xml_id for bulk_mode_xml_id, mode_position
+                           in zip(bulk_mode_xml_ids, mode_positions) if mode_position is None]
+        if unknown_xml_ids:
+            raise Exception(f'Unknown mode(s) {unknown_xml_ids} when setting BPR parameters')
+        mode_groups = []
+        unknown_xml_ids = []
+        for bulk_mode_xml_id, mode_position in zip(bulk_mode_xml_ids, mode_positions):
+            in_mode = np.flatnonzero(mode_xml_ids == bulk_mode_xml_id)
+            java_link_segments, link_segment_positions = self._network_instance._locate_link_segments(
+                bulk_mode_xml_id, link_segment_xml_ids[in_mode].tolist())
+            unknown_xml_ids.extend(bulk_link_segment_xml_id for bulk_link_segment_xml_id, link_segment_position
+                                   in zip(link_segment_xml_ids[in_mode].tolist(), link_segment_positions)
+                                   if link_segment_position is None)
+            mode_groups.append((in_mode, mode_position, java_link_segments, link_segment_positions))
+        if unknown_xml_ids:
+            raise Exception(f'{len(unknown_xml_ids)} unknown link segment(s) when setting BPR parameters, e.g., '
+                            f'{unknown_xml_ids[:10]}')
+
+        gateway_state = GatewayState.of(self._java_counterpart)
+        double_class = GatewayUtils.get_java_class('double', gateway_state)
+        for in_mode, mode_position, java_link_segments, link_segment_positions in mode_groups:
+            try:
+                GatewayUtils.invoke_per_position(
+                    self._java_counterpart, 'setParameters',
+                    [(java_link_segments, link_segment_positions), (java_modes, [mode_position] * len(in_mode)),
+                     GatewayUtils.to_java_array(double_class, alphas[in_mode], gateway_state),
+                     GatewayUtils.to_java_array(double_class, betas[in_mode], gateway_state)],
+                    len(in_mode))
+            except Py4JError:
+                # per link segment, e.g., when the cost does not allow its methods to be invoked from the Java side
+                mode_counterpart = java_modes[mode_position]
+                for bulk_alpha, bulk_beta, link_segment_position in zip(
+                        alphas[in_mode].tolist(), betas[in_mode].tolist(), link_segment_positions):
+                    self._java_counterpart.setParameters(
+                        java_link_segments[link_segment_position], mode_counterpart, bulk_alpha, bulk_beta)
+
 class FreeFlowCostWrapper(PhysicalCostWrapper):
     """Wrapper around the FreeFlowLinkTravelTimeCost instance
     """
@@ -492,6 +1370,14 @@ class FreeFlowCostWrapper(PhysicalCostWrapper):
 class MemoryOutputFormatterWrapper(OutputFormatterWrapper):
     """ Wrapper around the Java PlanItOutputFormatter class instance
     """
+
+    # number of rows written at once by to_memmap, bounding the memory used by the JVM (or by Python when it spills the
+    # results to disk itself)
+    MEMORY_MAP_CHUNK_SIZE = 65536
+
+    # value of absent (null) entries in the int64 columns collected by to_numpy and to_memmap, PLANit ids and iteration
+    # indices are never negative. to_dataframe provides them as missing values (pd.NA)
+    ABSENT_INTEGER = -1
     
     def __init__(self, java_counterpart, demands_instance, network_instance):
         """
@@ -502,26 +1388,41 @@ class MemoryOutputFormatterWrapper(OutputFormatterWrapper):
         super().__init__(java_counterpart)
         self._demands_instance = demands_instance
         self._network_instance = network_instance
+
+        # Java enum instances and the (ordered) output properties per output type are resolved once and cached, since
+        # they do not change once results are available
+        self._java_enums = {}
+        self._output_properties = {}
+
+        # directory holding the files backing the memory mapped results, created upon first use and removed upon
+        # release_memory_maps, or otherwise once this formatter is garbage collected
+        self._memory_map_directory = None
+        self._memory_map_finalizer = None
                    
-    def iterator(self, mode_xml_id: str, time_period_xml_id: str, no_iterations: int, output_type: OutputType):
-        """Return the  wrapper for MemoryOutputIterator object for this MemoryOutputFormatter
+    def iterator(self, mode_xml_id: str, time_period_xml_id: str, no_iterations: int, output_type: OutputType,
+                 chunk_size: int = None, prefetch: int = 0):
+        """Return the  wrapper for MemoryOutputIterator object for this MemoryOutputFormatter, which can be iterated
+        over directly, i.e., for keys, values in memory.iterator(...), fetching its rows in chunks
         :param mode_xml_id the external Id of the current mode
         :param time_period_xml_id the external Id of the current time period
         :param no_iterations the iteration the output iterator applies to
         :param output_type the output type for the current output
+        :param chunk_size number of rows fetched before they are yielded, default MemoryOutputIteratorWrapper.CHUNK_SIZE
+        :param prefetch maximum number of chunks fetched ahead on a background thread while the caller processes the
+        current chunk, 0 (default) for no prefetching
         :return the wrapper for the memory output iterator
         """
         time_periods_counterpart = self._demands_instance.field("timePeriods")
         time_periods = TimePeriodsWrapper(time_periods_counterpart)
         time_period_counterpart = time_periods.get_by_xml_id(time_period_xml_id);
         time_period = TimePeriodWrapper(time_period_counterpart)        
-        modes_counterpart = self._network_instance.get_modes()
-        modes = ModesWrapper(modes_counterpart)
-        mode_counterpart = modes.get_by_xml_id(mode_xml_id)
+        mode_counterpart = self._network_instance.get_mode_by_xml_id(mode_xml_id)
         mode = ModeWrapper(mode_counterpart)       
-        output_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(output_type.java_class_name(), output_type.value)
+        output_type_instance = self.__to_java_enum(output_type)
         memory_output_iterator_counterpart = self._java_counterpart.getIterator(mode.java, time_period.java, no_iterations, output_type_instance)
-        memory_output_iterator = MemoryOutputIteratorWrapper(memory_output_iterator_counterpart)
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        memory_output_iterator = MemoryOutputIteratorWrapper(
+            memory_output_iterator_counterpart, key_positions, value_positions, chunk_size, prefetch)
         return memory_output_iterator
    
     def get_position_of_output_value_property(self, output_type, output_property):
@@ -530,9 +1431,11 @@ class MemoryOutputFormatterWrapper(OutputFormatterWrapper):
         :param output_property the specified output value property
         :result the position in the results array of the specified property
         """
-        output_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(output_type.java_class_name(), output_type.value)
-        output_property_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(output_property.java_class_name(), output_property.value)
-        position = self._java_counterpart.getPositionOfOutputValueProperty(output_type_instance, output_property_instance)
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        if output_property in value_positions:
+            return value_positions[output_property]
+        position = self._java_counterpart.getPositionOfOutputValueProperty(
+            self.__to_java_enum(output_type), self.__to_java_enum(output_property))
         return position
     
     def get_position_of_output_key_property(self, output_type, output_property):
@@ -541,10 +1444,445 @@ class MemoryOutputFormatterWrapper(OutputFormatterWrapper):
           :param output_property the specified output property
           :result the position in the results array of the specified key property
         """
-        output_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(output_type.java_class_name(), output_type.value)
-        output_property_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(output_property.java_class_name(), output_property.value)
-        position = self._java_counterpart.getPositionOfOutputKeyProperty(output_type_instance, output_property_instance)
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        if output_property in key_positions:
+            return key_positions[output_property]
+        position = self._java_counterpart.getPositionOfOutputKeyProperty(
+            self.__to_java_enum(output_type), self.__to_java_enum(output_property))
         return position
+
+    def get_output_key_properties(self, output_type: OutputType) -> List[OutputProperty]:
+        """Returns the output key properties of the output type ordered by their position in the keys array, see
+        get_position_of_output_key_property for their positions
+        :param output_type the output type for the current output
+        :return the active output key properties, in order of their position in the keys array
+        """
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        return list(key_positions)
+
+    def get_output_value_properties(self, output_type: OutputType) -> List[OutputProperty]:
+        """Returns the output value properties of the output type ordered by their position in the values array, see
+        get_position_of_output_value_property for their positions
+        :param output_type the output type for the current output
+        :return the active output value properties, in order of their position in the values array
+        """
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        return list(value_positions)
+
+    def to_numpy(self, mode_xml_id: str, time_period_xml_id: str, iteration: int, output_type: OutputType) \
+            -> Dict[OutputProperty, np.ndarray]:
+        """Collect all results of the memory output formatter for the given mode, time period, iteration and output
+        type in columnar form. Rather than accessing each key and value entry of each row separately, the rows are
+        transferred in chunks of MemoryOutputIteratorWrapper.CHUNK_SIZE rows, each in a constant number of calls, as
+        typed numpy arrays based on the output property they belong to (see OutputProperty.numpy_dtype). Absent
+        values are None in textual columns, NaN in floating point columns and
+        ABSENT_INTEGER in integer columns.
+
+        The rows of each chunk are collected on the Java side (see MemoryOutputIteratorWrapper._iter_java_row_chunks),
+        from which each numeric column is extracted as a Java primitive array and transferred in binary form (see
+        GatewayUtils.to_numpy_array), and each textual column as a single string. When the rows can not be accessed on
+        the Java side, all entries are transferred as strings instead, see MemoryOutputIteratorWrapper.iter_chunks
+        :param mode_xml_id the xml id of the mode
+        :param time_period_xml_id the xml id of the time period
+        :param iteration the iteration the output applies to
+        :param output_type the output type for the current output
+        :return a numpy array per active output property, key properties first, each in order of their position
+        """
+        try:
+            chunks = [{output_property: GatewayUtils.to_numpy_array(
+                           java_column, MemoryOutputFormatterWrapper.__to_java_primitive(output_property), num_rows,
+                           self.gateway_state) if output_property.numpy_dtype() != "object" else java_column
+                       for output_property, java_column in java_columns.items()}
+                      for java_columns, num_rows in self.__iter_java_column_chunks(
+                          mode_xml_id, time_period_xml_id, iteration, output_type)]
+        except Py4JError:
+            # the rows can not be accessed on the Java side, they are transferred as strings instead
+            chunks = list(self.__to_numpy_chunks(mode_xml_id, time_period_xml_id, iteration, output_type))
+        if len(chunks) == 1:
+            return chunks[0]
+        return {output_property: np.concatenate([chunk[output_property] for chunk in chunks])
+                for output_property in chunks[0]}
+
+    def to_memmap(self, mode_xml_id: str, time_period_xml_id: str, iteration: int, output_type: OutputType) \
+            -> Dict[OutputProperty, np.ndarray]:
+        """Collect all results as to_numpy does, but with the numeric columns backed by files rather than memory, for
+        outputs too large to (also) keep in memory. The rows are collected on the Java side in chunks of
+        MEMORY_MAP_CHUNK_SIZE rows, and of each chunk each numeric column is extracted and appended to its file by the
+        JVM (with a FileChannel, in native byte order), so its entries are not transferred over the gateway and the JVM
+        holds a single chunk at a time. Afterwards each file is memory mapped as a read-only numpy.memmap view. Columns
+        of strings (xml ids, path strings) are transferred in a single call per chunk and kept in memory. This relies on
+        the JVM sharing the file system, which holds for the gateways started by Planit.
+
+        When the rows can not be accessed on the Java side (see MemoryOutputIteratorWrapper._iter_java_row_chunks), the
+        results are instead transferred in chunks of MEMORY_MAP_CHUNK_SIZE rows which are decoded and appended to the
+        files by Python, i.e., they are spilled to disk rather than shared without copying.
+
+        The files remain available until release_memory_maps is called (also by the project when the memory output
+        formatter is deactivated), or this formatter is garbage collected, after which the views must no longer be used
+        :param mode_xml_id the xml id of the mode
+        :param time_period_xml_id the xml id of the time period
+        :param iteration the iteration the output applies to
+        :param output_type the output type for the current output
+        :return a numpy array per active output property, key properties first, each in order of their position
+        """
+        file_root = os.path.join(self.__get_memory_map_directory(), uuid.uuid4().hex)
+        gateway_state = self.gateway_state
+        object_columns = {}
+        num_rows = 0
+        try:
+            # the numeric columns are appended to their file a chunk at a time, bounding the memory used by the JVM
+            java_file_channels = {}
+            try:
+                for java_columns, num_chunk_rows in self.__iter_java_column_chunks(
+                        mode_xml_id, time_period_xml_id, iteration, output_type,
+                        MemoryOutputFormatterWrapper.MEMORY_MAP_CHUNK_SIZE):
+                    for output_property, java_column in java_columns.items():
+                        if output_property.numpy_dtype() == "object":
+                            object_columns.setdefault(output_property, []).append(java_column)
+                            continue
+                        java_file_channel = java_file_channels.get(output_property)
+                        if java_file_channel is None:
+                            java_file_channel = java_file_channels[output_property] = GatewayUtils.get_java_class(
+                                'java.io.FileOutputStream', gateway_state)(
+                                f'{file_root}_{output_property.value}.bin').getChannel()
+                        self.__write_java_column(java_file_channel, java_column, num_chunk_rows, output_property)
+                    num_rows += num_chunk_rows
+            finally:
+                for java_file_channel in java_file_channels.values():
+                    java_file_channel.close()
+        except Py4JError:
+            return self.__to_spilled_memmap(mode_xml_id, time_period_xml_id, iteration, output_type, file_root)
+
+        columns = {}
+        for output_property in self.get_output_key_properties(output_type) + \
+                self.get_output_value_properties(output_type):
+            dtype = output_property.numpy_dtype()
+            if dtype == "object":
+                columns[output_property] = np.concatenate(object_columns[output_property])
+            elif num_rows == 0:
+                # an empty file can not be memory mapped
+                columns[output_property] = np.empty(0, dtype=dtype)
+            else:
+                columns[output_property] = np.memmap(f'{file_root}_{output_property.value}.bin', dtype=dtype,
+                                                     mode='r', shape=(num_rows,))
+        return columns
+
+    def __to_spilled_memmap(self, mode_xml_id: str, time_period_xml_id: str, iteration: int,
+                            output_type: OutputType, file_root: str) -> Dict[OutputProperty, np.ndarray]:
+        """ to_memmap for which the results are transferred in chunks and written to the files by Python
+        """
+        file_names = {}
+        object_columns = {}
+        num_rows = 0
+        chunks = self.__to_numpy_chunks(mode_xml_id, time_period_xml_id, iteration, output_type,
+                                        MemoryOutputFormatterWrapper.MEMORY_MAP_CHUNK_SIZE)
+        for chunk in chunks:
+            for output_property, column in chunk.items():
+                if column.dtype == object:
+                    object_columns.setdefault(output_property, []).append(column)
+                    continue
+                file_name = file_names.setdefault(output_property, f'{file_root}_spilled_{output_property.value}.bin')
+                with open(file_name, 'ab') as column_file:
+                    column.tofile(column_file)
+            num_rows += len(next(iter(chunk.values()))) if chunk else 0
+
+        columns = {}
+        for output_property in self.get_output_key_properties(output_type) + \
+                self.get_output_value_properties(output_type):
+            dtype = output_property.numpy_dtype()
+            if output_property in object_columns:
+                columns[output_property] = np.concatenate(object_columns[output_property])
+            elif num_rows == 0:
+                # an empty file can not be memory mapped
+                columns[output_property] = np.empty(0, dtype=dtype)
+            else:
+                columns[output_property] = np.memmap(file_names[output_property], dtype=dtype, mode='r',
+                                                     shape=(num_rows,))
+        return columns
+
+    def __to_java_entry_function(self, row_index: int, position: int):
+        """ method handle (Object row) -> Object providing the entry at the position of the keys (row_index 0) or values
+        (row_index 1) array of a row collected by MemoryOutputIteratorWrapper._iter_java_row_chunks
+        """
+        gateway_state = self.gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        java_object = GatewayUtils.get_java_class('java.lang.Object', gateway_state)
+        object_class = java_object._java_lang_class
+        list_class = GatewayUtils.get_java_class('java.util.List', gateway_state)._java_lang_class
+        object_array_class = GatewayUtils.get_java_class('java.lang.Class', gateway_state).forName(
+            '[Ljava.lang.Object;')
+        to_object = method_type.methodType(object_class, object_class)
+
+        java_row_entries = method_handles.insertArguments(
+            method_handles.publicLookup().findVirtual(list_class, 'get', method_type.methodType(
+                object_class, GatewayUtils.get_java_class('java.lang.Integer.TYPE', gateway_state))),
+            1, GatewayUtils.to_java_array(java_object, [row_index], gateway_state))
+        java_entry_at = method_handles.insertArguments(
+            method_handles.arrayElementGetter(object_array_class), 1,
+            GatewayUtils.to_java_array(java_object, [position], gateway_state))
+        return method_handles.filterReturnValue(java_row_entries.asType(to_object), java_entry_at.asType(to_object))
+
+    def __transfer_java_column(self, java_rows, num_rows: int, java_entry,
+                               output_property: OutputProperty) -> np.ndarray:
+        """ transfer the entries of a textual column of the rows collected on the Java side as a single string
+        """
+        gateway_state = self.gateway_state
+        if num_rows == 0:
+            return np.empty(0, dtype=object)
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        object_class = GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class
+        string_class = GatewayUtils.get_java_class('java.lang.String', gateway_state)._java_lang_class
+        java_to_string = method_handles.filterReturnValue(java_entry, method_handles.publicLookup().findStatic(
+            string_class, 'valueOf', method_type.methodType(string_class, object_class)))
+        java_column = GatewayUtils.get_java_class('java.util.Arrays', gateway_state).stream(java_rows).map(
+            GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+                GatewayUtils.get_java_class('java.util.function.Function', gateway_state)._java_lang_class,
+                java_to_string)).collect(
+            GatewayUtils.get_java_class('java.util.stream.Collectors', gateway_state).joining(
+                GatewayConfig.BULK_STRING_SEPARATOR))
+        return MemoryOutputFormatterWrapper.__to_numpy_column(
+            java_column.split(GatewayConfig.BULK_STRING_SEPARATOR), output_property)
+
+    def __iter_java_column_chunks(self, mode_xml_id: str, time_period_xml_id: str, iteration: int,
+                                  output_type: OutputType, chunk_size: int = None) -> Iterator[Tuple[Dict, int]]:
+        """ Collect the results in columnar form in chunks of rows collected on the Java side, see
+        MemoryOutputIteratorWrapper._iter_java_row_chunks. Raises Py4JError when the rows can not be accessed this way
+        :param mode_xml_id the xml id of the mode
+        :param time_period_xml_id the xml id of the time period
+        :param iteration the iteration the output applies to
+        :param output_type the output type for the current output
+        :param chunk_size maximum number of rows per chunk, default MemoryOutputIteratorWrapper.CHUNK_SIZE
+        :return iterator over the chunks, each a tuple of a column per active output property and the number of rows.
+        Numeric columns are Java primitive arrays (see __to_java_primitive), textual columns numpy arrays
+        """
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        # the method handles extracting each column are created once for all chunks
+        java_column_functions = {}
+        for row_index, positions in enumerate([key_positions, value_positions]):
+            for output_property, position in positions.items():
+                java_entry = self.__to_java_entry_function(row_index, position)
+                java_column_functions[output_property] = java_entry if output_property.numpy_dtype() == "object" \
+                    else self.__to_java_primitive_function(java_entry, output_property)
+
+        memory_output_iterator = self.iterator(mode_xml_id, time_period_xml_id, iteration, output_type, chunk_size)
+        for java_rows, num_rows in memory_output_iterator._iter_java_row_chunks():
+            java_columns = {}
+            for output_property, java_column_function in java_column_functions.items():
+                if output_property.numpy_dtype() == "object":
+                    java_columns[output_property] = self.__transfer_java_column(
+                        java_rows, num_rows, java_column_function, output_property)
+                else:
+                    java_columns[output_property] = self.__collect_java_column(
+                        java_rows, java_column_function, output_property)
+            yield java_columns, num_rows
+
+    @staticmethod
+    def __to_java_primitive(output_property: OutputProperty) -> str:
+        """ Java primitive type of the entries of a numeric output property
+        """
+        return 'long' if output_property.numpy_dtype() == "int64" else 'double'
+
+    def __to_java_primitive_function(self, java_entry, output_property: OutputProperty):
+        """ Java ToLongFunction, respectively ToDoubleFunction, (Object row) -> primitive providing the entry of a
+        numeric column of a row, unboxing (and if needed converting) the Number entry, or NaN, respectively
+        ABSENT_INTEGER, for absent (null) entries
+        :param java_entry method handle (Object row) -> Object providing the entry, see __to_java_entry_function
+        :param output_property the numeric output property of the column
+        :return the Java function
+        """
+        gateway_state = self.gateway_state
+        method_handles = GatewayUtils.get_java_class('java.lang.invoke.MethodHandles', gateway_state)
+        method_type = GatewayUtils.get_java_class('java.lang.invoke.MethodType', gateway_state)
+        object_class = GatewayUtils.get_java_class('java.lang.Object', gateway_state)._java_lang_class
+        if MemoryOutputFormatterWrapper.__to_java_primitive(output_property) == 'long':
+            primitive_class = GatewayUtils.get_java_class('java.lang.Long.TYPE', gateway_state)
+            absent_value = MemoryOutputFormatterWrapper.ABSENT_INTEGER
+            function_name = 'ToLongFunction'
+        else:
+            primitive_class = GatewayUtils.get_java_class('java.lang.Double.TYPE', gateway_state)
+            absent_value = math.nan
+            function_name = 'ToDoubleFunction'
+
+        java_to_primitive = method_handles.guardWithTest(
+            method_handles.publicLookup().findStatic(
+                GatewayUtils.get_java_class('java.util.Objects', gateway_state)._java_lang_class, 'isNull',
+                method_type.methodType(GatewayUtils.get_java_class('java.lang.Boolean.TYPE', gateway_state),
+                                       object_class)),
+            method_handles.dropArguments(
+                method_handles.constant(primitive_class, absent_value), 0, GatewayUtils.to_java_array(
+                    GatewayUtils.get_java_class('java.lang.Class', gateway_state), [object_class], gateway_state)),
+            method_handles.explicitCastArguments(
+                method_handles.identity(object_class), method_type.methodType(primitive_class, object_class)))
+        return GatewayUtils.get_java_class('java.lang.invoke.MethodHandleProxies', gateway_state).asInterfaceInstance(
+            GatewayUtils.get_java_class(f'java.util.function.{function_name}', gateway_state)._java_lang_class,
+            method_handles.filterReturnValue(java_entry, java_to_primitive))
+
+    def __collect_java_column(self, java_rows, java_function, output_property: OutputProperty):
+        """ the entries of a numeric column of the rows collected on the Java side as Java primitive array
+        :param java_rows the rows, see MemoryOutputIteratorWrapper._iter_java_row_chunks
+        :param java_function the function providing the entry of a row, see __to_java_primitive_function
+        :param output_property the numeric output property of the column
+        :return Java long, respectively double, array
+        """
+        java_primitive = MemoryOutputFormatterWrapper.__to_java_primitive(output_property)
+        java_rows_stream = GatewayUtils.get_java_class('java.util.Arrays', self.gateway_state).stream(java_rows)
+        if java_primitive == 'long':
+            return java_rows_stream.mapToLong(java_function).toArray()
+        return java_rows_stream.mapToDouble(java_function).toArray()
+
+    def __write_java_column(self, java_file_channel, java_column, num_rows: int, output_property: OutputProperty):
+        """ append the entries of a numeric column collected on the Java side to a file on the Java side, in native byte
+        order, so they are not transferred over the gateway
+        :param java_file_channel the Java FileChannel of the file
+        :param java_column the Java primitive array of the entries, see __collect_java_column
+        :param num_rows number of entries
+        :param output_property the numeric output property of the column
+        """
+        if num_rows == 0:
+            return
+        gateway_state = self.gateway_state
+        java_byte_order = GatewayUtils.get_java_class('java.nio.ByteOrder', gateway_state)
+        java_buffer = GatewayUtils.get_java_class('java.nio.ByteBuffer', gateway_state).allocate(
+            num_rows * np.dtype(output_property.numpy_dtype()).itemsize).order(java_byte_order.nativeOrder())
+        as_buffer = 'asLongBuffer' if MemoryOutputFormatterWrapper.__to_java_primitive(output_property) == 'long' \
+            else 'asDoubleBuffer'
+        getattr(java_buffer, as_buffer)().put(java_column)
+        while java_buffer.hasRemaining():
+            java_file_channel.write(java_buffer)
+
+    def release_memory_maps(self):
+        """Remove the files backing all results collected via to_memmap, any views on them must no longer be used
+        """
+        if self._memory_map_finalizer is not None:
+            self._memory_map_finalizer()
+        self._memory_map_directory = None
+        self._memory_map_finalizer = None
+
+    def to_dataframe(self, mode_xml_id: str, time_period_xml_id: str, iteration: int, output_type: OutputType) \
+            -> pd.DataFrame:
+        """Collect all results of the memory output formatter for the given mode, time period, iteration and output
+        type in a DataFrame with a column per active output property, named by the output property, and typed
+        according to OutputProperty.pandas_dtype. Integer columns with absent values use the nullable Int64 dtype
+        :param mode_xml_id the xml id of the mode
+        :param time_period_xml_id the xml id of the time period
+        :param iteration the iteration the output applies to
+        :param output_type the output type for the current output
+        :return the DataFrame, key property columns first, each in order of their position
+        """
+        columns = self.to_numpy(mode_xml_id, time_period_xml_id, iteration, output_type)
+        return pd.DataFrame({output_property.value: MemoryOutputFormatterWrapper.__to_series(column, output_property)
+                             for output_property, column in columns.items()})
+
+    def __get_memory_map_directory(self) -> str:
+        """ directory of the files backing the memory mapped results, created when not yet present
+        """
+        if self._memory_map_directory is None:
+            self._memory_map_directory = tempfile.mkdtemp(prefix='planit_memory_output_')
+            self._memory_map_finalizer = weakref.finalize(
+                self, shutil.rmtree, self._memory_map_directory, ignore_errors=True)
+        return self._memory_map_directory
+
+    def __to_numpy_chunks(self, mode_xml_id: str, time_period_xml_id: str, iteration: int, output_type: OutputType,
+                          chunk_size: int = None) -> Iterator[Dict[OutputProperty, np.ndarray]]:
+        """ Collect the results in columnar form in chunks of rows, each chunk is transferred in a constant number of
+        calls, see MemoryOutputIteratorWrapper._iter_string_chunks
+        :param mode_xml_id the xml id of the mode
+        :param time_period_xml_id the xml id of the time period
+        :param iteration the iteration the output applies to
+        :param output_type the output type for the current output
+        :param chunk_size maximum number of rows per chunk, default MemoryOutputIteratorWrapper.CHUNK_SIZE
+        :return iterator over the chunks, each a numpy array per active output property, at least one chunk is provided
+        """
+        key_positions, value_positions = self.__output_property_positions(output_type)
+        # the keys and values arrays hold (at least) an entry up to the largest position of an active property
+        num_keys = max(key_positions.values(), default=-1) + 1
+        num_values = max(value_positions.values(), default=-1) + 1
+
+        memory_output_iterator = self.iterator(mode_xml_id, time_period_xml_id, iteration, output_type, chunk_size)
+        for rows in memory_output_iterator._iter_string_chunks(num_keys, num_values):
+            columns = {}
+            for output_property, position in key_positions.items():
+                columns[output_property] = MemoryOutputFormatterWrapper.__to_numpy_column(
+                    [keys[position] for keys, values in rows], output_property)
+            for output_property, position in value_positions.items():
+                columns[output_property] = MemoryOutputFormatterWrapper.__to_numpy_column(
+                    [values[position] for keys, values in rows], output_property)
+            yield columns
+
+    def clear_cache(self):
+        """Clear the cached output property positions, only required when the output configuration has changed after
+        results were collected, e.g., when re-running an assignment with different output properties
+        """
+        self._output_properties.clear()
+
+    def __to_java_enum(self, python_enum):
+        """ Java counterpart of an output type or output property enum, created once and cached
+        :param python_enum the Python enum to convert
+        :return java enum instance
+        """
+        java_enum = self._java_enums.get(python_enum)
+        if java_enum is None:
+            java_enum = self.gateway_state.entry_point.createEnum(
+                python_enum.java_class_name(), python_enum.value)
+            self._java_enums[python_enum] = java_enum
+        return java_enum
+
+    def __output_property_positions(self, output_type: OutputType):
+        """ Positions of the key and value output properties of the output type, resolved once per output type
+        :param output_type the output type for the current output
+        :return tuple of key and value property to position dicts, each ordered by position
+        """
+        if output_type not in self._output_properties:
+            self._output_properties[output_type] = (
+                self.__resolve_output_properties(output_type, self._java_counterpart.getPositionOfOutputKeyProperty),
+                self.__resolve_output_properties(output_type, self._java_counterpart.getPositionOfOutputValueProperty))
+        return self._output_properties[output_type]
+
+    def __resolve_output_properties(self, output_type: OutputType, get_java_position) -> Dict[OutputProperty, int]:
+        """ Collect the output properties for which the Java position getter provides a valid position
+        :param output_type the output type for the current output
+        :param get_java_position Java position getter, either for key or value properties
+        :return output property to position, ordered by position
+        """
+        output_type_instance = self.__to_java_enum(output_type)
+        positions = {}
+        for output_property in OutputProperty:
+            try:
+                position = get_java_position(output_type_instance, self.__to_java_enum(output_property))
+            except Py4JJavaError:
+                # property not present for this output type
+                continue
+            if position is not None and position >= 0:
+                positions[output_property] = position
+        return dict(sorted(positions.items(), key=lambda entry: entry[1]))
+
+    @staticmethod
+    def __to_numpy_column(entries: List[str], output_property: OutputProperty) -> np.ndarray:
+        """ convert the Java string representation of all entries of a single output property to a typed numpy array
+        :param entries the Java string representations, where 'null' signifies absence of a value
+        :param output_property the property the entries belong to
+        :return typed numpy array
+        """
+        dtype = output_property.numpy_dtype()
+        if dtype == "int64":
+            return np.array([MemoryOutputFormatterWrapper.ABSENT_INTEGER if entry in ("", "null") else int(entry)
+                             for entry in entries], dtype=np.int64)
+        elif dtype == "float64":
+            return np.array([math.nan if entry in ("", "null") else float(entry) for entry in entries],
+                            dtype=np.float64)
+        return np.array([None if entry == "null" else entry for entry in entries], dtype=object)
+
+    @staticmethod
+    def __to_series(column: np.ndarray, output_property: OutputProperty) -> pd.Series:
+        """ typed pandas series of a column collected by to_numpy, see OutputProperty.pandas_dtype
+        """
+        if output_property.numpy_dtype() == "int64":
+            absent = column == MemoryOutputFormatterWrapper.ABSENT_INTEGER
+            if absent.any():
+                return pd.Series(pd.arrays.IntegerArray(np.asarray(column, dtype=np.int64), absent))
+        return pd.Series(column, dtype=output_property.pandas_dtype())
                    
 class PlanItOutputFormatterWrapper(OutputFormatterWrapper):
     """ Wrapper around the Java PlanItOutputFormatter class instance
@@ -574,13 +1912,15 @@ class OriginDestinationOutputTypeConfigurationWrapper(OutputTypeConfigurationWra
     def activate(self, od_skim_sub_output_type):
         """Activate an OD skim output type
         """
-        od_skim_sub_output_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(od_skim_sub_output_type.java_class_name(), od_skim_sub_output_type.value)
+        od_skim_sub_output_type_instance = self.gateway_state.entry_point.createEnum(
+            od_skim_sub_output_type.java_class_name(), od_skim_sub_output_type.value)
         self._java_counterpart.activateOdSkimOutputType(od_skim_sub_output_type_instance)
  
     def deactivate(self, od_skim_sub_output_type):
         """Deactivate an OD skim output type
         """
-        od_skim_sub_output_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(od_skim_sub_output_type.java_class_name(), od_skim_sub_output_type.value)
+        od_skim_sub_output_type_instance = self.gateway_state.entry_point.createEnum(
+            od_skim_sub_output_type.java_class_name(), od_skim_sub_output_type.value)
         self._java_counterpart.deactivateOdSkimOutputType(od_skim_sub_output_type_instance)         
         
 class PathOutputTypeConfigurationWrapper(OutputTypeConfigurationWrapper):
@@ -591,6 +1931,7 @@ class PathOutputTypeConfigurationWrapper(OutputTypeConfigurationWrapper):
         super().__init__(java_counterpart)
         
     def set_path_id_type(self,  path_id_type : PathIdType):
-        path_id_type_instance = GatewayState.python_2_java_gateway.entry_point.createEnum(path_id_type.java_class_name(), path_id_type.value)
+        path_id_type_instance = self.gateway_state.entry_point.createEnum(
+            path_id_type.java_class_name(), path_id_type.value)
         self._java_counterpart.setPathIdentificationType(path_id_type_instance)
         
\ No newline at end of file
@@ -0,0 +1,181 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from planit import JvmOptions
+from planit import OutputFormatter
+from planit import OutputType
+from planit import Planit
+from planit import PlanitProject
+from planit import TrafficAssignment
+
+# Planit instance of a worker process of the ScenarioRunner, its JVM is reused for all scenarios of that worker
+_worker_planit = None
+
+
+class ScenarioSpec:
+    """ Specification of a single traffic assignment scenario to run with the ScenarioRunner, i.e., a variant of a
+    project. It only holds plain Python values, such that it can be passed on to a worker process.
+    """
+
+    def __init__(self,
+                 project_path: str,
+                 name: str = None,
+                 traffic_assignment: TrafficAssignment = TrafficAssignment.TRADITIONAL_STATIC,
+                 default_bpr_parameters: Tuple = None,
+                 bpr_parameters: List[Tuple] = None,
+                 max_iterations: int = None,
+                 epsilon: float = None,
+                 initial_costs: Dict[Optional[str], str] = None,
+                 output_types: List[OutputType] = None,
+                 memory_outputs: List[Tuple[OutputType, str, str, int]] = None,
+                 output_directory: str = None):
+        """ Initialiser of the scenario specification
+        :param project_path the path location of the XML input file(s) to be used by PLANitIO
+        :param name to identify the scenario, also used as name root of its output files, default the project path
+        :param traffic_assignment the traffic assignment to conduct
+        :param default_bpr_parameters arguments of physical_cost.set_default_parameters, e.g., (alpha, beta,
+        mode_xml_id, link_segment_type_xml_id), not set when None
+        :param bpr_parameters list of arguments of physical_cost.set_parameters, e.g., (alpha, beta, mode_xml_id,
+        link_segment_xml_id), one call per entry
+        :param max_iterations maximum number of iterations of the stop criterion, not set when None
+        :param epsilon the convergence epsilon of the stop criterion, not set when None
+        :param initial_costs initial cost file location per time period xml id, the None key registers the default.
+        Files are parsed for each scenario, as each runs on a new project (see InitialCostCache)
+        :param output_types the output types to activate, default link output only
+        :param memory_outputs the results to collect as DataFrames (see MemoryOutputFormatterWrapper.to_dataframe), each
+        as (output_type, mode_xml_id, time_period_xml_id, iteration)
+        :param output_directory when provided the PLANitIO output files are persisted here, otherwise results are only
+        kept in memory
+        """
+        self.project_path = project_path
+        self.name = name if name is not None else project_path
+        self.traffic_assignment = traffic_assignment
+        self.default_bpr_parameters = default_bpr_parameters
+        self.bpr_parameters = bpr_parameters if bpr_parameters is not None else []
+        self.max_iterations = max_iterations
+        self.epsilon = epsilon
+        self.initial_costs = initial_costs if initial_costs is not None else {}
+        self.output_types = output_types if output_types is not None else [OutputType.LINK]
+        self.memory_outputs = memory_outputs if memory_outputs is not None else []
+        self.output_directory = output_directory
+
+
+class ScenarioResult:
+    """ Result of a scenario run by the ScenarioRunner
+    """
+
+    def __init__(self, index: int, spec: ScenarioSpec, results: Dict[Tuple[OutputType, str, str, int], pd.DataFrame],
+                 duration: float, exception: str = None):
+        """ Initialiser of the scenario result
+        :param index of the scenario in the list of scenarios provided to the runner
+        :param spec the scenario specification
+        :param results the collected DataFrame per entry of the spec's memory outputs
+        :param duration of running the scenario (seconds), including collection of its results
+        :param exception formatted exception when the scenario failed, None otherwise
+        """
+        self.index = index
+        self.spec = spec
+        self.results = results
+        self.duration = duration
+        self.exception = exception
+
+    @property
+    def succeeded(self) -> bool:
+        """ :return true when the scenario ran without exception, false otherwise
+        """
+        return self.exception is None
+
+
+class ScenarioRunner:
+    """ Runs a batch of scenarios across a pool of worker processes. Each worker process has its own Planit instance,
+    i.e., its own gateway and JVM, which is started once and reused for all scenarios the worker runs. Results are
+    streamed back as scenarios finish.
+    """
+
+    def __init__(self, max_workers: int = None, debug_info: bool = False, jvm_options: JvmOptions = None):
+        """ Initialiser of the scenario runner
+        :param max_workers the number of worker processes (and thus JVMs), default the number of processors
+        :param debug_info passed on to the Planit instance of each worker
+        :param jvm_options passed on to the Planit instance of each worker, e.g., to divide the memory over the JVMs
+        """
+        self._max_workers = max_workers if max_workers is not None else os.cpu_count()
+        self._debug_info = debug_info
+        self._jvm_options = jvm_options
+
+    def run(self, scenarios: List[ScenarioSpec]) -> Iterator[ScenarioResult]:
+        """ Run the scenarios, yielding each result as soon as its scenario has finished, so in order of completion
+        rather than in order of the scenarios (use ScenarioResult.index to match them up). A failing scenario does
+        not affect the others, its result holds the exception instead
+        :param scenarios the scenarios to run
+        :return iterator over the scenario results
+        """
+        if not scenarios:
+            return
+        with ProcessPoolExecutor(max_workers=min(self._max_workers, len(scenarios)), initializer=_initialise_worker,
+                                 initargs=(self._debug_info, self._jvm_options)) as executor:
+            futures = [executor.submit(_run_scenario, index, spec) for index, spec in enumerate(scenarios)]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run_all(self, scenarios: List[ScenarioSpec]) -> List[ScenarioResult]:
+        """ Run the scenarios and collect all results in order of the scenarios
+        :param scenarios the scenarios to run
+        :return the scenario results, one per scenario
+        """
+        return sorted(self.run(scenarios), key=lambda result: result.index)
+
+
+def _initialise_worker(debug_info: bool, jvm_options: JvmOptions):
+    """ start the gateway (and JVM) of a worker process of the ScenarioRunner
+    """
+    global _worker_planit
+    _worker_planit = Planit(debug_info=debug_info, jvm_options=jvm_options)
+
+
+def _run_scenario(index: int, spec: ScenarioSpec) -> ScenarioResult:
+    """ configure and run a single scenario on the Planit instance of the worker process
+    """
+    start_time = time.perf_counter()
+    try:
+        # a new project on the worker's gateway for each scenario, rather than a new JVM
+        project = PlanitProject(spec.project_path, _worker_planit.gateway_state)
+        _configure_scenario(project, spec)
+        project.run()
+        results = {memory_output: project.memory.to_dataframe(memory_output[1], memory_output[2], memory_output[3],
+                                                              memory_output[0])
+                   for memory_output in spec.memory_outputs}
+        return ScenarioResult(index, spec, results, time.perf_counter() - start_time)
+    except Exception:
+        # Java exceptions can not be transferred to the main process as is, so the formatted exception is passed on
+        return ScenarioResult(index, spec, {}, time.perf_counter() - start_time, traceback.format_exc())
+
+
+def _configure_scenario(project: PlanitProject, spec: ScenarioSpec):
+    """ configure the project according to the scenario specification
+    """
+    project.set(spec.traffic_assignment)
+    if spec.default_bpr_parameters is not None:
+        project.assignment.physical_cost.set_default_parameters(*spec.default_bpr_parameters)
+    for bpr_parameters in spec.bpr_parameters:
+        project.assignment.physical_cost.set_parameters(*bpr_parameters)
+    if spec.max_iterations is not None:
+        project.assignment.gap_function.stop_criterion.set_max_iterations(spec.max_iterations)
+    if spec.epsilon is not None:
+        project.assignment.gap_function.stop_criterion.set_epsilon(spec.epsilon)
+    for time_period_xml_id, initial_cost_file_location in spec.initial_costs.items():
+        project.initial_cost.set(initial_cost_file_location, time_period_xml_id)
+
+    for output_type in spec.output_types:
+        project.assignment.activate_output(output_type)
+    project.activate(OutputFormatter.MEMORY)
+    if spec.output_directory is None:
+        project.deactivate(OutputFormatter.PLANIT_IO)
+    else:
+        project.output.set_xml_name_root(spec.name)
+        project.output.set_csv_name_root(spec.name)
+        project.output.set_output_directory(spec.output_directory)
@@ -1,6 +1,7 @@
 import os
 
 from py4j.java_gateway import get_field
+from planit import GatewayState
 from planit import GatewayUtils
 
 from numpy import string_
@@ -20,18 +21,28 @@ class BaseWrapper(object):
 
     def __getattr__(self, name):
         """All methods invoked on the assignment wrapper are passed on to the Java equivalent class after
-        transforming the method to Java style coding convention
+        transforming the method to Java style coding convention. Only invoked for attributes that cannot be found
+        otherwise, so the dispatching method is cached on the instance upon first access, which means subsequent
+        accesses bypass this method (and the name conversion) altogether
         """
+        # special methods and the java counterpart itself (absent when not yet constructed, e.g., while copying) are
+        # never forwarded
+        if name == '_java_counterpart' or (name.startswith('__') and name.endswith('__')):
+            raise AttributeError(name)
+
+        # bound Py4J member of the underlying Java object, e.g., of the PLANit project java class which is obtained
+        # via the entry_point.getProject call
+        java_member = getattr(self._java_counterpart, GatewayUtils.to_camelcase(name))
+        # arguments are converted on the gateway of the Planit instance the Java counterpart belongs to
+        gateway_state = self.gateway_state
 
         def method(*args):  # collects the arguments of the function 'name' (wrapper function within getattr)
-            java_name = GatewayUtils.to_camelcase(name)
-            # pass all calls on to the underlying PLANit project java class which is obtained via the
-            # entry_point.getProject call
             if (args):
-                return getattr(self._java_counterpart, java_name)(*GatewayUtils.convert_args_to_java(args))
+                return java_member(*GatewayUtils.convert_args_to_java(args, gateway_state))
             else:
-                return getattr(self._java_counterpart, java_name)()
+                return java_member()
 
+        self.__dict__[name] = method
         return method
 
     @property
@@ -42,6 +53,12 @@ class BaseWrapper(object):
             raise Exception("No Java counterpart has been found for " + self.__class__.__name__)
         return self._java_counterpart
 
+    @property
+    def gateway_state(self) -> GatewayState:
+        """ access to the gateway state (of the Planit instance) the underlying Java object belongs to
+        """
+        return GatewayState.of(self._java_counterpart)
+
     def field(self, field_name: str):
         """ collect a publicly available member on the java object
         """
@@ -6,9 +6,14 @@ sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../..
 ABSOLUTE_PATH = os.path.dirname(__file__)
 ABSOLUTE_PATH_TEST_DATA = os.path.join(ABSOLUTE_PATH, '..', '..', 'testdata')
 
+import asyncio
 import gc
 import unittest
 import math
+import tempfile
+import time
+import numpy as np
+import pandas as pd
 from test_utils import PlanItHelper
 from planit import *
 
@@ -127,6 +132,93 @@ class TestSuiteAssignment(unittest.TestCase):
         os.chdir(old_cwd)
         gc.collect()
 
+    def test_explanatory_memory_output_to_numpy(self):
+        # Explanatory unit test, which saves results to memory only and collects them in bulk as numpy arrays, results
+        # are compared against the row based memory output iterator
+
+        #change cwd to current dir
+        old_cwd = os.getcwd()
+        os.chdir(ABSOLUTE_PATH)
+
+        print("Running test_explanatory with results collected from memory in bulk")
+        description = "explanatory"
+        max_iterations = 2
+        epsilon = 0.001
+        plan_it = Planit()
+        assignment_project = plan_it.project()
+
+        PlanItHelper.run_test(assignment_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+
+        columns = assignment_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations, OutputType.LINK)
+
+        self.assertTrue(OutputProperty.FLOW in columns)
+        self.assertEqual(columns[OutputProperty.FLOW].dtype, np.float64)
+        self.assertTrue(np.all(columns[OutputProperty.FLOW] == 1))
+        self.assertTrue(np.allclose(columns[OutputProperty.LINK_SEGMENT_COST], 10, rtol=0.001))
+
+        # the columns match the rows accessed one by one
+        flow_position = assignment_project.memory.get_position_of_output_value_property(OutputType.LINK,
+                                                                                        OutputProperty.FLOW)
+        flows = []
+        memory_output_iterator_link = assignment_project.memory.iterator(mode_xml_id, time_period_xml_id,
+                                                                         max_iterations, OutputType.LINK)
+        while memory_output_iterator_link.has_next():
+            memory_output_iterator_link.next()
+            values = memory_output_iterator_link.get_values()
+            flows.append([values[position] for position in range(len(values))][flow_position])
+
+        self.assertTrue(np.array_equal(columns[OutputProperty.FLOW], np.array(flows, dtype=np.float64)))
+
+        os.chdir(old_cwd)
+        gc.collect()
+
+    def test_explanatory_memory_output_to_dataframe(self):
+        # Explanatory unit test, which saves results to memory only and collects them as a typed DataFrame
+
+        #change cwd to current dir
+        old_cwd = os.getcwd()
+        os.chdir(ABSOLUTE_PATH)
+
+        print("Running test_explanatory with results collected from memory as DataFrame")
+        description = "explanatory"
+        max_iterations = 2
+        epsilon = 0.001
+        plan_it = Planit()
+        assignment_project = plan_it.project()
+
+        PlanItHelper.run_test(assignment_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+
+        link_df = assignment_project.memory.to_dataframe(mode_xml_id, time_period_xml_id, max_iterations,
+                                                         OutputType.LINK)
+        self.assertEqual(link_df[OutputProperty.FLOW.value].dtype, np.float64)
+        self.assertEqual(link_df[OutputProperty.LINK_SEGMENT_ID.value].dtype, np.int64)
+        self.assertTrue((link_df[OutputProperty.FLOW.value] == 1).all())
+
+        path_df = assignment_project.memory.to_dataframe(mode_xml_id, time_period_xml_id, max_iterations,
+                                                         OutputType.PATH)
+        self.assertEqual(path_df[OutputProperty.ORIGIN_ZONE_XML_ID.value].dtype, "category")
+        self.assertEqual(path_df[OutputProperty.PATH_STRING.value].dtype, "string")
+        od_path = path_df[(path_df[OutputProperty.ORIGIN_ZONE_XML_ID.value] == "1") &
+                          (path_df[OutputProperty.DESTINATION_ZONE_XML_ID.value] == "2")]
+        self.assertEqual(od_path[OutputProperty.PATH_STRING.value].iloc[0], "[1,2]")
+
+        # positions are resolved once per output type and reused afterwards
+        path_position = assignment_project.memory.get_position_of_output_value_property(OutputType.PATH,
+                                                                                        OutputProperty.PATH_STRING)
+        self.assertTrue(OutputProperty.PATH_STRING in assignment_project.memory.get_output_value_properties(
+            OutputType.PATH))
+        self.assertEqual(assignment_project.memory.get_position_of_output_value_property(
+            OutputType.PATH, OutputProperty.PATH_STRING), path_position)
+
+        os.chdir(old_cwd)
+        gc.collect()
+
     def test_explanatory(self):
         # corresponds to testExplanatory() in Java
 
@@ -194,6 +286,176 @@ class TestSuiteAssignment(unittest.TestCase):
 
         gc.collect()
 
+    def test_explanatory_memory_output_to_memmap(self):
+        # Explanatory unit test, which collects results from memory as file backed read-only arrays
+
+        #change cwd to current dir
+        old_cwd = os.getcwd()
+        os.chdir(ABSOLUTE_PATH)
+
+        print("Running test_explanatory with results collected from memory as memory mapped arrays")
+        description = "explanatory"
+        max_iterations = 2
+        epsilon = 0.001
+        plan_it = Planit()
+        assignment_project = plan_it.project()
+
+        PlanItHelper.run_test(assignment_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        columns = assignment_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations, OutputType.LINK)
+        mapped_columns = assignment_project.memory.to_memmap(mode_xml_id, time_period_xml_id, max_iterations,
+                                                             OutputType.LINK)
+        self.assertEqual(list(mapped_columns), list(columns))
+        flow = mapped_columns[OutputProperty.FLOW]
+        self.assertTrue(isinstance(flow, np.memmap))
+        self.assertFalse(flow.flags.writeable)
+        self.assertTrue(np.array_equal(flow, columns[OutputProperty.FLOW]))
+        for output_property, column in columns.items():
+            self.assertTrue(np.array_equal(mapped_columns[output_property], column,
+                                           equal_nan=column.dtype == np.float64))
+        # the numeric columns are written by the JVM rather than spilled to disk from Python
+        self.assertNotIn('_spilled_', os.path.basename(flow.filename))
+
+        # the rows are written a chunk at a time, resulting in the same columns
+        original_chunk_size = MemoryOutputFormatterWrapper.MEMORY_MAP_CHUNK_SIZE
+        MemoryOutputFormatterWrapper.MEMORY_MAP_CHUNK_SIZE = 2
+        try:
+            chunked_columns = assignment_project.memory.to_memmap(mode_xml_id, time_period_xml_id, max_iterations,
+                                                                  OutputType.LINK)
+        finally:
+            MemoryOutputFormatterWrapper.MEMORY_MAP_CHUNK_SIZE = original_chunk_size
+        self.assertTrue(len(columns[OutputProperty.FLOW]) > 2)
+        for output_property, column in columns.items():
+            self.assertTrue(np.array_equal(chunked_columns[output_property], column,
+                                           equal_nan=column.dtype == np.float64))
+        del chunked_columns
+
+        # files backing the arrays are removed once released
+        flow_file_name = flow.filename
+        del flow, mapped_columns
+        assignment_project.release_memory_maps()
+        self.assertFalse(os.path.exists(flow_file_name))
+
+        os.chdir(old_cwd)
+        gc.collect()
+
+    def test_explanatory_memory_output_iteration(self):
+        # Explanatory unit test, which streams results from memory row by row, fetched in chunks
+
+        #change cwd to current dir
+        old_cwd = os.getcwd()
+        os.chdir(ABSOLUTE_PATH)
+
+        print("Running test_explanatory with results iterated over in chunks")
+        description = "explanatory"
+        max_iterations = 2
+        epsilon = 0.001
+        plan_it = Planit()
+        assignment_project = plan_it.project()
+
+        PlanItHelper.run_test(assignment_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        columns = assignment_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations, OutputType.LINK)
+        key_properties = assignment_project.memory.get_output_key_properties(OutputType.LINK)
+
+        rows = []
+        for keys, values in assignment_project.memory.iterator(mode_xml_id, time_period_xml_id, max_iterations,
+                                                               OutputType.LINK, chunk_size=2):
+            rows.append((keys, values))
+        self.assertEqual(len(rows), len(columns[OutputProperty.FLOW]))
+        # entries are at the position of their output property, as are the columns collected by to_numpy
+        for output_property in key_properties:
+            position = assignment_project.memory.get_position_of_output_key_property(OutputType.LINK, output_property)
+            self.assertEqual([keys[position] for keys, values in rows], list(columns[output_property]))
+        flow_position = assignment_project.memory.get_position_of_output_value_property(OutputType.LINK,
+                                                                                        OutputProperty.FLOW)
+        self.assertTrue(np.allclose([values[flow_position] for keys, values in rows], columns[OutputProperty.FLOW]))
+
+        # chunks hold at most the chunk size number of rows
+        memory_output_iterator = assignment_project.memory.iterator(mode_xml_id, time_period_xml_id, max_iterations,
+                                                                    OutputType.LINK, chunk_size=2)
+        chunk_sizes = [len(chunk) for chunk in memory_output_iterator.iter_chunks()]
+        self.assertEqual(sum(chunk_sizes), len(rows))
+        self.assertTrue(all(0 < chunk_size <= 2 for chunk_size in chunk_sizes))
+
+        os.chdir(old_cwd)
+        gc.collect()
+
+    def test_explanatory_warm_start_from_memory_output(self):
+        # Explanatory unit test, which warm starts a run from the link segment costs of a previous run held in memory
+
+        print("Running test_explanatory warm started from a previous run")
+        description = "explanatory"
+        max_iterations = 2
+        epsilon = 0.001
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        plan_it = Planit()
+        previous_project = plan_it.create_project(ABSOLUTE_PATH)
+        PlanItHelper.run_test(previous_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+        previous_costs = previous_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations,
+                                                          OutputType.LINK)
+
+        # in memory, directly from the previous run's results
+        warm_project = PlanitProject(ABSOLUTE_PATH, plan_it.gateway_state)
+        warm_project.initial_cost.set_from_memory_output(previous_project.memory, mode_xml_id, time_period_xml_id,
+                                                         max_iterations)
+        PlanItHelper.run_test(warm_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+        warm_costs = warm_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations, OutputType.LINK)
+
+        # the same costs via an initial cost file, as before
+        with tempfile.TemporaryDirectory() as directory:
+            initial_cost_file_location = os.path.join(directory, "initial_link_segment_costs.csv")
+            pd.DataFrame({"Link Segment Xml Id": previous_costs[OutputProperty.LINK_SEGMENT_XML_ID],
+                          "Mode Xml Id": mode_xml_id,
+                          "Cost": previous_costs[OutputProperty.LINK_SEGMENT_COST]}).to_csv(
+                initial_cost_file_location, index=False)
+            file_project = PlanitProject(ABSOLUTE_PATH, plan_it.gateway_state)
+            file_project.initial_cost.set(initial_cost_file_location, time_period_xml_id)
+            PlanItHelper.run_test(file_project, max_iterations, epsilon, description, 1, deactivate_file_output=True)
+        file_costs = file_project.memory.to_numpy(mode_xml_id, time_period_xml_id, max_iterations, OutputType.LINK)
+
+        self.assertTrue(np.allclose(warm_costs[OutputProperty.LINK_SEGMENT_COST],
+                                    file_costs[OutputProperty.LINK_SEGMENT_COST]))
+        self.assertTrue(np.allclose(warm_costs[OutputProperty.FLOW], file_costs[OutputProperty.FLOW]))
+
+        # costs of unknown link segments are rejected when registered
+        invalid_project = PlanitProject(ABSOLUTE_PATH, plan_it.gateway_state)
+        invalid_project.initial_cost.set_costs(mode_xml_id, {"unknown link segment": 1.0})
+        with self.assertRaises(Exception):
+            PlanItHelper.run_test(invalid_project, max_iterations, epsilon, description, 1,
+                                  deactivate_file_output=True)
+        gc.collect()
+
+    def test_explanatory_scenario_runner(self):
+        # Explanatory variants run in parallel worker processes, each with its own gateway, match a sequential run
+        print("Running test_explanatory as a batch of scenarios")
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        num_scenarios = 4
+        scenarios = [ScenarioSpec(ABSOLUTE_PATH, name=f"explanatory_{max_iterations}", max_iterations=max_iterations,
+                                  epsilon=0.001, output_types=[OutputType.LINK],
+                                  memory_outputs=[(OutputType.LINK, mode_xml_id, time_period_xml_id, max_iterations)])
+                     for max_iterations in range(1, num_scenarios + 1)]
+
+        sequential_results = ScenarioRunner(max_workers=1).run_all(scenarios)
+
+        parallel_results = []
+        for result in ScenarioRunner(max_workers=2).run(scenarios):
+            self.assertTrue(result.succeeded, result.exception)
+            parallel_results.append(result)
+
+        self.assertEqual(len(parallel_results), num_scenarios)
+        for result in sorted(parallel_results, key=lambda result: result.index):
+            link_df = result.results[(OutputType.LINK, mode_xml_id, time_period_xml_id, result.spec.max_iterations)]
+            self.assertTrue((link_df[OutputProperty.FLOW.value] == 1).all())
+            self.assertTrue(link_df.equals(sequential_results[result.index].results[
+                (OutputType.LINK, mode_xml_id, time_period_xml_id, result.spec.max_iterations)]))
+
     def test_2_SIMO_MISO_route_choice_single_mode_with_initial_costs_and_one_iteration_and_three_time_periods(self):
         # corresponds to
         # test_2_SIMO_MISO_route_choice_single_mode_with_initial_costs_and_one_iteration_and_three_time_periods() in
@@ -323,6 +585,136 @@ class TestSuiteAssignment(unittest.TestCase):
             PlanItHelper.compare_csv_files_and_clean_up(OutputType.OD, description, od_csv_file_name, project_path))
         gc.collect()
 
+    def test_5_SIMO_MISO_route_choice_two_modes_memory_output_prefetch(self):
+        # Iterating over path results from memory yields the same rows with and without prefetching the next chunk
+        # while the current one is processed
+
+        # prep
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'SIMOMISOrouteChoiceTwoModes')
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        max_iterations = 500
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+
+        # setup
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.assignment.physical_cost.set_default_parameters(0.8, 4.5, "2", "1")
+        assignment_project.assignment.output_configuration.set_persist_only_final_Iteration(True)
+        assignment_project.assignment.activate_output(OutputType.PATH)
+        assignment_project.assignment.path_configuration.set_path_id_type(PathIdType.NODE_XML_ID)
+        assignment_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+        assignment_project.assignment.gap_function.stop_criterion.set_epsilon(0.0000000001)
+        assignment_project.activate(OutputFormatter.MEMORY)
+        assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+        assignment_project.run()
+
+        # iterate
+        rows = {}
+        for prefetch in [0, 2]:
+            memory_output_iterator = assignment_project.memory.iterator(
+                mode_xml_id, time_period_xml_id, max_iterations, OutputType.PATH, chunk_size=1, prefetch=prefetch)
+            rows[prefetch] = []
+            for chunk in memory_output_iterator.iter_chunks():
+                rows[prefetch].extend(chunk)
+
+        self.assertTrue(len(rows[0]) > 0)
+        self.assertEqual(rows[2], rows[0])
+        gc.collect()
+
+    def test_2_SIMO_MISO_route_choice_iteration_progress(self):
+        # The progress of each iteration is reported while the assignment runs, without persisting the iterations
+
+        # prep
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'SIMOMISOrouteChoiceTwoModes')
+        max_iterations = 500
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+
+        # setup
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.assignment.physical_cost.set_default_parameters(0.8, 4.5, "2", "1")
+        assignment_project.assignment.output_configuration.set_persist_only_final_Iteration(True)
+        assignment_project.assignment.activate_output(OutputType.LINK)
+        assignment_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+        assignment_project.assignment.gap_function.stop_criterion.set_epsilon(0.0000000001)
+        assignment_project.activate(OutputFormatter.MEMORY)
+        assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+
+        progresses = []
+        assignment_project.run(on_iteration=progresses.append)
+        self.assertTrue(len(progresses) > 0)
+        # the patterns match the messages the assignment actually logs: each iteration is reported once, in order and
+        # with its gap, and no other log records are reported
+        iterations = [progress.iteration for progress in progresses]
+        self.assertEqual(iterations, list(range(iterations[0], iterations[0] + len(iterations))))
+        self.assertTrue(all(progress.gap is not None and progress.gap >= 0 for progress in progresses))
+        self.assertTrue(all(progress.iteration <= max_iterations for progress in progresses))
+        self.assertTrue(all(progress.iteration_duration >= 0 for progress in progresses))
+        self.assertEqual([progress.elapsed for progress in progresses],
+                         sorted(progress.elapsed for progress in progresses))
+        gc.collect()
+
+    def test_2_SIMO_MISO_route_choice_async_run_with_progress_and_cancellation(self):
+        # The assignment is awaited without blocking the event loop, reporting progress, and can be cancelled
+
+        # prep
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'SIMOMISOrouteChoiceTwoModes')
+        mode_xml_id = "1"
+        time_period_xml_id = "0"
+        max_iterations = 500
+
+        def configure(assignment_project):
+            assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+            assignment_project.assignment.physical_cost.set_default_parameters(0.8, 4.5, "2", "1")
+            assignment_project.assignment.output_configuration.set_persist_only_final_Iteration(True)
+            assignment_project.assignment.activate_output(OutputType.LINK)
+            assignment_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+            assignment_project.assignment.gap_function.stop_criterion.set_epsilon(0.0000000001)
+            assignment_project.activate(OutputFormatter.MEMORY)
+            assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+
+        async def run():
+            async with AsyncPlanit() as plan_it:
+                # run to completion, while the event loop remains responsive
+                assignment_project = await plan_it.create_project(project_path)
+                configure(assignment_project)
+                iterations = []
+                ticks = []
+
+                async def tick():
+                    while True:
+                        ticks.append(time.perf_counter())
+                        await asyncio.sleep(0.01)
+
+                ticker = asyncio.ensure_future(tick())
+                await assignment_project.run(on_progress=lambda progress: iterations.append(progress.iteration))
+                ticker.cancel()
+                self.assertTrue(len(ticks) > 1)
+                self.assertEqual(iterations, sorted(iterations))
+                self.assertTrue(all(iteration <= max_iterations for iteration in iterations))
+                link_results = await plan_it.call(assignment_project.memory.to_dataframe, mode_xml_id,
+                                                  time_period_xml_id, max_iterations, OutputType.LINK)
+                self.assertTrue(len(link_results) > 0)
+
+                # cancelling a run terminates its JVM, which can be started again afterwards
+                assignment_project = await plan_it.create_project(project_path)
+                configure(assignment_project)
+                run_task = asyncio.ensure_future(assignment_project.run())
+                await asyncio.sleep(0.1)
+                if not run_task.done():
+                    run_task.cancel()
+                    with self.assertRaises(asyncio.CancelledError):
+                        await run_task
+                    self.assertFalse(plan_it.is_running)
+                    await plan_it.start()
+                    self.assertTrue(plan_it.is_running)
+
+        asyncio.run(run())
+        gc.collect()
+
     def test_2_SIMO_MISO_route_choice_single_mode_with_initial_costs_and_500_iterations(self):
         # Unit test for route 2 with initial costs and 500 iterations (corresponds to test_2_SIMO_MISO_route_choice_single_mode_with_initial_costs_and_500_iterations() in Java)
 
@@ -352,6 +744,107 @@ class TestSuiteAssignment(unittest.TestCase):
             PlanItHelper.compare_csv_files_and_clean_up(OutputType.OD, description, od_csv_file_name, project_path))
         gc.collect()
 
+    def test_2_SIMO_MISO_route_choice_single_mode_with_cached_initial_costs(self):
+        # The initial cost file is only parsed once when the same project is run repeatedly
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'SIMOMISOrouteChoiceSingleModeWithInitialCosts500Iterations')
+        max_iterations = 5
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        assignment_project.initial_cost.set(
+            os.path.join(project_path, "initial_link_segment_costs.csv"))
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.assignment.activate_output(OutputType.LINK)
+        assignment_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+        assignment_project.activate(OutputFormatter.MEMORY)
+        assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+
+        cache = InitialCostCache.of(plan_it.gateway_state)
+        cache.clear()
+        assignment_project.run()
+        assignment_project.run()
+        self.assertEqual(cache.info()['misses'], 1)
+        self.assertEqual(cache.info()['hits'], 1)
+
+        # another project parses its own network, so the parsed initial costs can not be reused by it
+        other_project = plan_it.create_project(project_path)
+        other_project.initial_cost.set(os.path.join(project_path, "initial_link_segment_costs.csv"))
+        other_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        other_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+        other_project.activate(OutputFormatter.MEMORY)
+        other_project.deactivate(OutputFormatter.PLANIT_IO)
+        other_project.run()
+        self.assertEqual(cache.info()['misses'], 2)
+        self.assertEqual(cache.info()['size'], 2)
+
+        # the entries of a project are dropped once it is gone
+        del assignment_project
+        gc.collect()
+        self.assertEqual(cache.info()['size'], 1)
+        gc.collect()
+
+    def test_2_SIMO_MISO_route_choice_single_mode_with_initial_costs_and_stopping_policy(self):
+        # The 500 iteration run stops once its gap no longer improves, rather than at the iteration cap
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'SIMOMISOrouteChoiceSingleModeWithInitialCosts500Iterations')
+        max_iterations = 500
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        assignment_project.initial_cost.set(
+            os.path.join(project_path, "initial_link_segment_costs.csv"))
+
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.assignment.activate_output(OutputType.LINK)
+        stop_criterion = assignment_project.assignment.gap_function.stop_criterion
+        stop_criterion.set_max_iterations(max_iterations)
+        stop_criterion.set_epsilon(0.0000000001)
+        stop_criterion.set_stopping_policies(GapImprovementPolicy(10, 0.01), TimeBudgetPolicy(60))
+        assignment_project.activate(OutputFormatter.MEMORY)
+        assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+
+        progresses = []
+        assignment_project.run(on_iteration=progresses.append)
+        print(f"Stopped by policy: {stop_criterion.policy_stops}")
+        self.assertTrue(len(stop_criterion.policy_stops) > 0)
+        self.assertTrue(progresses[-1].iteration < max_iterations)
+        # the configured maximum is restored for subsequent runs
+        self.assertEqual(stop_criterion.get_max_iterations(), max_iterations)
+        gc.collect()
+
+    def test_4_bi_directional_links_route_choice_single_mode_with_two_time_periods_and_stopping_policy(self):
+        # Each time period is stopped by the policy on its own, the maximum lowered for the first time period does not
+        # cut the second one short
+
+        class StopAtIterationPolicy(StoppingPolicy):
+            def should_stop(self, progress):
+                return progress.iteration >= 5
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'route_choice', 'xml', 'biDirectionalLinksRouteChoiceSingleModeWithTwoTimePeriods')
+        max_iterations = 500
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.assignment.activate_output(OutputType.LINK)
+        stop_criterion = assignment_project.assignment.gap_function.stop_criterion
+        stop_criterion.set_max_iterations(max_iterations)
+        stop_criterion.set_epsilon(0.0)
+        stop_criterion.set_stopping_policies(StopAtIterationPolicy())
+        assignment_project.activate(OutputFormatter.MEMORY)
+        assignment_project.deactivate(OutputFormatter.PLANIT_IO)
+
+        progresses = []
+        assignment_project.run(on_iteration=progresses.append)
+        self.assertEqual(sorted(stop_criterion.policy_stops), [0, 1])
+        for time_period_index in [0, 1]:
+            iterations = [progress.iteration for progress in progresses
+                          if progress.time_period_index == time_period_index]
+            self.assertTrue(5 <= max(iterations) <= 6)
+        self.assertEqual(stop_criterion.get_max_iterations(), max_iterations)
+        gc.collect()
+
     def test_4_bi_directional_links_route_choice_single_mode_with_two_time_periods(self):
         # corresponds to test_4_bi_directional_links_route_choice_single_mode_with_two_time_periods() in Java
 
@@ -446,6 +939,205 @@ class TestSuiteAssignment(unittest.TestCase):
             PlanItHelper.compare_csv_files_and_clean_up(OutputType.OD, description, od_csv_file_name, project_path))
         gc.collect()
 
+    def test_mode_test_bulk_parameters(self):
+        # test_mode_test() with its BPR parameters set in bulk, which should yield identical results
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+        description = "mode_test"
+        csv_file_name = "Time_Period_1_2.csv"
+        od_csv_file_name = "Time_Period_1_1.csv"
+        xml_file_name = "Time_Period_1.xml"
+        max_iterations = 2
+        epsilon = 0.0000000001
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+
+        # setup
+        assignment_project.set(TrafficAssignment.TRADITIONAL_STATIC)
+        assignment_project.set(GapFunction.LINK_BASED_RELATIVE)
+        assignment_project.assignment.output_configuration.set_persist_only_final_Iteration(True)
+        assignment_project.assignment.activate_output(OutputType.LINK)
+        assignment_project.assignment.link_configuration.remove(OutputProperty.TIME_PERIOD_XML_ID)
+        assignment_project.assignment.link_configuration.remove(OutputProperty.TIME_PERIOD_ID)
+        assignment_project.assignment.link_configuration.remove(OutputProperty.MAXIMUM_SPEED)
+
+        assignment_project.assignment.activate_output(OutputType.OD)
+        assignment_project.assignment.od_configuration.deactivate(OdSkimSubOutputType.NONE)
+        assignment_project.assignment.od_configuration.remove(OutputProperty.TIME_PERIOD_XML_ID)
+        assignment_project.assignment.od_configuration.remove(OutputProperty.RUN_ID)
+        assignment_project.assignment.activate_output(OutputType.PATH)
+        assignment_project.assignment.path_configuration.set_path_id_type(PathIdType.NODE_XML_ID)
+        assignment_project.assignment.gap_function.stop_criterion.set_max_iterations(max_iterations)
+        assignment_project.assignment.gap_function.stop_criterion.set_epsilon(epsilon)
+
+        assignment_project.output.set_xml_name_root(description)
+        assignment_project.output.set_csv_name_root(description)
+        assignment_project.output.set_output_directory(project_path)
+
+        physical_cost = assignment_project.assignment.physical_cost
+        physical_cost.set_default_parameters(0.8, 4.5, "1", "1")
+        # unknown link segments are reported without setting any of the parameters
+        with self.assertRaises(Exception):
+            physical_cost.set_parameters_bulk([1.0, 1.0], 5.0, "1", ["3", "unknown"])
+        # as are omitted parameters, modes or link segments
+        with self.assertRaises(Exception):
+            physical_cost.set_parameters_bulk(1.0, mode_xml_id="1", link_segment_xml_id="3")
+        with self.assertRaises(Exception):
+            physical_cost.set_parameters_bulk(1.0, 5.0, link_segment_xml_id="3")
+        with self.assertRaises(Exception):
+            physical_cost.set_parameters_bulk(pd.DataFrame({'link_segment_xml_id': ["3"], 'alpha': [1.0]}))
+        physical_cost.set_parameters_bulk(pd.DataFrame(
+            {'link_segment_xml_id': ["3"], 'mode_xml_id': ["1"], 'alpha': [1.0], 'beta': [5.0]}))
+
+        assignment_project.run()
+
+        # tests
+        PlanItHelper.delete_file(OutputType.LINK, description, xml_file_name, project_path)
+        self.assertTrue(
+            PlanItHelper.compare_csv_files_and_clean_up(OutputType.LINK, description, csv_file_name, project_path))
+        PlanItHelper.delete_file(OutputType.PATH, description, xml_file_name, project_path)
+        self.assertTrue(
+            PlanItHelper.compare_csv_files_and_clean_up(OutputType.PATH, description, csv_file_name, project_path))
+        PlanItHelper.delete_file(OutputType.OD, description, xml_file_name, project_path)
+        self.assertTrue(
+            PlanItHelper.compare_csv_files_and_clean_up(OutputType.OD, description, od_csv_file_name, project_path))
+        gc.collect()
+
+    def test_mode_test_network_xml_id_lookups(self):
+        # lookups by XML id served from the lazily built network indexes match the network
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        network = assignment_project.network
+
+        self.assertEqual(network.get_mode_by_xml_id("1").getXmlId(), "1")
+        self.assertIsNone(network.get_mode_by_xml_id("unknown"))
+        self.assertEqual(network.get_layer_by_mode_xml_id("1").getXmlId(),
+                         network.get_transport_layers().get(network.get_mode_by_xml_id("1")).getXmlId())
+        self.assertEqual(network.get_link_segment_type_by_xml_id("1", "1").getXmlId(), "1")
+        self.assertEqual(network.get_link_segment_by_xml_id("1", "3").getXmlId(), "3")
+        self.assertIsNone(network.get_link_segment_by_xml_id("1", "unknown"))
+        self.assertIsNone(network.get_link_segment_by_xml_id("unknown", "3"))
+
+        network.invalidate_indexes()
+        self.assertEqual(network.get_link_segment_by_xml_id("1", "3").getXmlId(), "3")
+        gc.collect()
+
+    def test_mode_test_network_index(self):
+        # the network index snapshot matches the network and is kept until invalidated
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        network = assignment_project.network
+
+        network_index = network.index()
+        self.assertIs(network.index(), network_index)
+        self.assertEqual(network_index.link_segments.ids.dtype, np.int64)
+        link_segment_id = network_index.link_segments.id_of("3")
+        self.assertEqual(link_segment_id, network.get_link_segment_by_xml_id("1", "3").getId())
+        self.assertEqual(network_index.link_segments.xml_id_of(link_segment_id), "3")
+        self.assertEqual(network_index.modes.id_of("1"), network.get_mode_by_xml_id("1").getId())
+        self.assertEqual(len(network_index.nodes), len(set(network_index.nodes.ids.tolist())))
+        self.assertTrue(len(network_index.link_segment_types) > 0)
+
+        network.invalidate_indexes()
+        self.assertIsNot(network.index(), network_index)
+        gc.collect()
+
+    def test_mode_test_network_geometry(self):
+        # node locations and link segment polylines shipped as coordinate arrays, aligned with the network index
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        network = assignment_project.network
+
+        network_index = network.index()
+        network_geometry = network.geometry()
+        self.assertEqual(network_geometry.node_ids.tolist(), network_index.nodes.ids.tolist())
+        self.assertEqual(network_geometry.node_coordinates.shape, (len(network_index.nodes), 2))
+        self.assertEqual(network_geometry.link_segment_ids.tolist(), network_index.link_segments.ids.tolist())
+        self.assertEqual(len(network_geometry.link_segment_offsets), len(network_index.link_segments) + 1)
+        self.assertEqual(network_geometry.link_segment_offsets[-1], len(network_geometry.link_segment_coordinates))
+
+        # a link segment's polyline runs from its upstream to its downstream node
+        link_segment = network.get_link_segment_by_xml_id("1", "3")
+        polyline = network_geometry.link_segment_polyline(
+            network_index.link_segments.positions_by_xml_id["3"])
+        for coordinates, java_node in [(polyline[0], link_segment.getUpstreamVertex()),
+                                       (polyline[-1], link_segment.getDownstreamVertex())]:
+            node_coordinates = network_geometry.node_coordinates[network_index.nodes.positions_by_id[java_node.getId()]]
+            self.assertTrue(np.allclose(coordinates, node_coordinates, equal_nan=True))
+        gc.collect()
+
+    def test_mode_test_od_demand_matrix(self):
+        # OD demands exchanged as dense and sparse (COO) matrices in the order of the OD zones of the zoning
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        demands = assignment_project.demands
+        od_zones = assignment_project.zoning.od_zone_index()
+        origin, destination = od_zones.positions_by_xml_id["1"], od_zones.positions_by_xml_id["2"]
+
+        matrix = demands.to_matrix("1", "0")
+        self.assertEqual(matrix.dtype, np.float64)
+        self.assertEqual(matrix.shape, (len(od_zones), len(od_zones)))
+        self.assertTrue(matrix[origin, destination] > 0)
+        self.assertEqual(np.count_nonzero(matrix), 1)
+        origins, destinations, values = demands.to_matrix("1", "0", sparse=True)
+        self.assertEqual((origins.tolist(), destinations.tolist(), values.tolist()),
+                         ([origin], [destination], [matrix[origin, destination]]))
+
+        # dense replaces all demands, sparse only the given OD pairs
+        demands.set_matrix("1", "0", matrix * 2)
+        self.assertTrue(np.allclose(demands.to_matrix("1", "0"), matrix * 2))
+        demands.set_matrix("1", "0", ([destination], [origin], [10.0]))
+        updated_matrix = demands.to_matrix("1", "0")
+        self.assertAlmostEqual(updated_matrix[destination, origin], 10.0)
+        self.assertAlmostEqual(updated_matrix[origin, destination], matrix[origin, destination] * 2)
+
+        with self.assertRaises(Exception):
+            demands.set_matrix("1", "0", np.zeros((len(od_zones) + 1, len(od_zones))))
+        gc.collect()
+
+    def test_mode_test_od_demand_matrix_round_trip(self):
+        # OD demands set and collected in bulk on the Java side match the per OD pair fallback, dense and sparse
+
+        project_path = os.path.join(ABSOLUTE_PATH_TEST_DATA, 'mode_test', 'xml', 'simple')
+
+        plan_it = Planit()
+        assignment_project = plan_it.create_project(project_path)
+        demands = assignment_project.demands
+        num_od_zones = len(assignment_project.zoning.od_zone_index())
+        random = np.random.default_rng(42)
+
+        dense_matrix = random.uniform(0.0, 100.0, (num_od_zones, num_od_zones))
+        demands.set_matrix("1", "0", dense_matrix)
+        self.assertTrue(np.array_equal(demands._to_matrix_per_pair("1", "0"), dense_matrix))
+        self.assertTrue(np.array_equal(demands.to_matrix("1", "0"), dense_matrix))
+
+        origins = random.integers(0, num_od_zones, 3)
+        destinations = random.integers(0, num_od_zones, 3)
+        sparse_demands = random.uniform(0.0, 100.0, 3)
+        demands._set_matrix_per_pair("1", "0", np.zeros((num_od_zones, num_od_zones)))
+        demands.set_matrix("1", "0", (origins, destinations, sparse_demands))
+        bulk_matrix = demands.to_matrix("1", "0")
+        self.assertTrue(np.array_equal(bulk_matrix, demands._to_matrix_per_pair("1", "0")))
+        demands._set_matrix_per_pair("1", "0", (origins, destinations, sparse_demands))
+        self.assertTrue(np.array_equal(demands.to_matrix("1", "0"), bulk_matrix))
+        sparse_origins, sparse_destinations, sparse_values = demands.to_matrix("1", "0", sparse=True)
+        self.assertTrue(np.array_equal(bulk_matrix[sparse_origins, sparse_destinations], sparse_values))
+        self.assertEqual(len(sparse_values), np.count_nonzero(bulk_matrix))
+        gc.collect()
+
     def test_basic_shortest_path_algorithm_a_to_c(self):
         # corresponds to test_basic_shortest_path_algorithm_a_to_c() in Java)
 
@@ -0,0 +1,457 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../..', 'src'))
+
+import asyncio
+import gc
+import numpy as np
+import socket
+import subprocess
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from planit import *
+
+
+class TestSuiteGateway(unittest.TestCase):
+
+    def test_wait_for_java_gateway(self):
+        # a listening socket is considered ready, a port without listener is not within the timeout
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
+            server_socket.bind(('127.0.0.1', 0))
+            server_socket.listen()
+            port = server_socket.getsockname()[1]
+            GatewayUtils.wait_for_java_gateway(None, '127.0.0.1', port, timeout=1)
+        with self.assertRaises(Exception):
+            GatewayUtils.wait_for_java_gateway(None, '127.0.0.1', port, timeout=0.1)
+
+        # a terminated process is detected rather than waited upon
+        terminated_process = subprocess.Popen([sys.executable, '-c', 'pass'])
+        terminated_process.wait()
+        with self.assertRaises(Exception):
+            GatewayUtils.wait_for_java_gateway(terminated_process, '127.0.0.1', port, timeout=10)
+
+    def test_read_java_gateway_port(self):
+        # the port is read from the first line of output, anything else is reported rather than connected to
+        announcing_process = subprocess.Popen([sys.executable, '-c', 'print(25341); print("started")'],
+                                              stdout=subprocess.PIPE)
+        self.assertEqual(GatewayUtils.read_java_gateway_port(announcing_process, timeout=10), 25341)
+        announcing_process.wait()
+        for announcement in ['no port', '', '0', '70000']:
+            failing_process = subprocess.Popen([sys.executable, '-c', f'print({announcement!r})'],
+                                               stdout=subprocess.PIPE)
+            with self.assertRaisesRegex(Exception, 'rather than its port'):
+                GatewayUtils.read_java_gateway_port(failing_process, timeout=10)
+            failing_process.wait()
+        silent_process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'],
+                                          stdout=subprocess.PIPE)
+        with self.assertRaisesRegex(Exception, 'did not announce its port'):
+            GatewayUtils.read_java_gateway_port(silent_process, timeout=0.5)
+        silent_process.kill()
+        silent_process.wait()
+
+    def test_resolve_classpath(self):
+        # only existing jars are on the classpath, resolved once and cached by version in memory and on disk
+        original_release_share_path = GatewayConfig.RELEASE_SHARE_PATH
+        original_classpath_cache_file = GatewayConfig.CLASSPATH_CACHE_FILE
+        with tempfile.TemporaryDirectory() as release_share_path:
+            planit_jar = os.path.join(release_share_path, 'planit', f'planit-{Version.planit}.jar')
+            os.makedirs(os.path.dirname(planit_jar))
+            open(planit_jar, 'w').close()
+            GatewayConfig.RELEASE_SHARE_PATH = release_share_path
+            GatewayConfig.CLASSPATH_CACHE_FILE = os.path.join(release_share_path, 'classpath_cache.json')
+            try:
+                jars = GatewayUtils.resolve_classpath()
+                self.assertTrue(planit_jar in jars)
+                self.assertTrue(all(os.path.isfile(jar) for jar in jars))
+                self.assertTrue(os.path.isfile(GatewayConfig.CLASSPATH_CACHE_FILE))
+
+                # served from the cache file in another process, i.e., with an empty in-memory cache, without discovery
+                GatewayUtils._classpath_cache.clear()
+                open(os.path.join(release_share_path, 'planit', 'undiscovered.jar'), 'w').close()
+                self.assertEqual(GatewayUtils.resolve_classpath(), jars)
+
+                # a removed jar invalidates the cached classpath
+                os.remove(planit_jar)
+                self.assertFalse(planit_jar in GatewayUtils.resolve_classpath())
+            finally:
+                GatewayConfig.RELEASE_SHARE_PATH = original_release_share_path
+                GatewayConfig.CLASSPATH_CACHE_FILE = original_classpath_cache_file
+                GatewayUtils._classpath_cache.clear()
+
+    def test_iteration_progress_parsing(self):
+        monitor = IterationMonitor(lambda progress: None, GatewayState())
+        start_time = time.time()
+        progress = monitor.parse("[run 0] [tp 0] Iteration 1: gap: 0.5", start_time + 1)
+        self.assertEqual((progress.iteration, progress.gap, progress.time_period), (1, 0.5, "0"))
+        progress = monitor.parse("[run 0] [tp 0] Iteration 2: gap: 1.2E-4", start_time + 3)
+        self.assertEqual((progress.iteration, progress.gap), (2, 1.2E-4))
+        self.assertAlmostEqual(progress.iteration_duration, 2, places=3)
+        self.assertIsNone(monitor.parse("network loaded", start_time + 4))
+        # the next time period
+        progress = monitor.parse("[run 0] [tp 1] Iteration 1: gap: 0.3", start_time + 6)
+        self.assertEqual((progress.iteration, progress.time_period, progress.time_period_index), (1, "1", 1))
+        self.assertAlmostEqual(progress.time_period_duration, 3, places=3)
+        self.assertAlmostEqual(progress.elapsed, 6, places=0)
+        # iterations only known to restart, without gap
+        progress = monitor.parse("Iteration 1", start_time + 7)
+        self.assertEqual((progress.iteration, progress.gap, progress.time_period), (1, None, None))
+        self.assertAlmostEqual(progress.time_period_duration, 1, places=3)
+
+        # as reported by the PLANit assignments, i.e., with the iteration prefix of its log messages
+        monitor = IterationMonitor(lambda progress: None, GatewayState())
+        progress = monitor.parse("[run id: 0] [tp: 0] [it: 3] Gap: 0.0012345678 (5 ms)", start_time + 1)
+        self.assertEqual((progress.iteration, progress.gap, progress.time_period), (3, 0.0012345678, "0"))
+        self.assertIsNone(monitor.parse("[run id: 0] Assignment converged in 3 iterations", start_time + 2))
+
+    def test_iteration_monitor_errors(self):
+        class LogRecord:
+            def __init__(self, message):
+                self.message = message
+
+            def getMessage(self):
+                return self.message
+
+            def getMillis(self):
+                return time.time() * 1000
+
+        # an exception of the handler is kept rather than passed on to Java, and the handler is no longer called
+        reported_iterations = []
+
+        def on_iteration(progress):
+            reported_iterations.append(progress.iteration)
+            if progress.iteration == 2:
+                raise ValueError('handler failed')
+
+        monitor = IterationMonitor(on_iteration, GatewayState())
+        for iteration in range(1, 4):
+            self.assertTrue(monitor.isLoggable(LogRecord(f"[run id: 0] [tp: 0] [it: {iteration}] Gap: 0.1")))
+        self.assertEqual(reported_iterations, [1, 2])
+        with self.assertRaisesRegex(ValueError, 'handler failed'):
+            monitor.check()
+
+        # a run without any message matching the iteration pattern is reported as well
+        monitor = IterationMonitor(on_iteration, GatewayState())
+        self.assertTrue(monitor.isLoggable(LogRecord("[run id: 0] assignment started")))
+        self.assertEqual(monitor.num_iterations, 0)
+        with self.assertRaisesRegex(Exception, 'No iterations reported'):
+            monitor.check()
+        monitor.isLoggable(LogRecord("[run id: 0] [tp: 0] [it: 1] Gap: 0.1"))
+        self.assertEqual(monitor.num_iterations, 1)
+        monitor.check()
+
+    def test_stopping_policies(self):
+        def progress(iteration, gap, elapsed=0.0, time_period_duration=0.0):
+            return IterationProgress(iteration, gap, None, 0, 0.0, time_period_duration, elapsed, "")
+
+        plateau = GapImprovementPolicy(2, 0.1)
+        gaps = [1.0, 0.5, 0.3, 0.29, 0.28]
+        self.assertEqual([plateau.should_stop(progress(i, gap)) for i, gap in enumerate(gaps)],
+                         [False, False, False, False, True])
+        plateau.reset()
+        self.assertFalse(plateau.should_stop(progress(0, 0.28)))
+        self.assertFalse(plateau.should_stop(progress(1, None)))
+
+        absolute_plateau = GapImprovementPolicy(1, 0.05, relative=False)
+        self.assertFalse(absolute_plateau.should_stop(progress(0, 1.0)))
+        self.assertTrue(absolute_plateau.should_stop(progress(1, 0.96)))
+
+        budget = TimeBudgetPolicy(10)
+        self.assertFalse(budget.should_stop(progress(0, None, elapsed=9.9, time_period_duration=9.9)))
+        self.assertTrue(budget.should_stop(progress(1, None, elapsed=10.0)))
+        per_time_period_budget = TimeBudgetPolicy(10, per_time_period=True)
+        self.assertFalse(per_time_period_budget.should_stop(progress(1, None, elapsed=15.0, time_period_duration=5.0)))
+
+    def test_async_progress_tasks(self):
+        # coroutine progress handlers run as tasks which are referenced until done, also after the run completed
+        class FakeAsyncPlanit:
+            async def _run_cancellable(self, function, *args):
+                return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+        class FakeProject:
+            def run(self, on_iteration):
+                for iteration in range(1, 4):
+                    on_iteration(IterationProgress(iteration, None, None, 0, 0.0, 0.0, 0.0, ""))
+
+        async def run_with_progress():
+            reported = []
+            released = asyncio.Event()
+
+            async def on_progress(progress):
+                await released.wait()
+                reported.append(progress.iteration)
+
+            async_project = AsyncPlanitProject(FakeAsyncPlanit(), FakeProject())
+            await async_project.run(on_progress=on_progress)
+            progress_tasks = set(async_project._progress_tasks)
+            self.assertEqual(len(progress_tasks), 3)
+            released.set()
+            await asyncio.wait(progress_tasks)
+            self.assertEqual(async_project._progress_tasks, set())
+            self.assertEqual(sorted(reported), [1, 2, 3])
+
+        asyncio.run(run_with_progress())
+
+    def test_initial_cost_cache(self):
+        class FakeNetwork:
+            pass
+
+        cache = InitialCostCache(max_size=2)
+        network = FakeNetwork()
+        with tempfile.TemporaryDirectory() as directory:
+            initial_cost_file_location = os.path.join(directory, "initial_link_segment_costs.csv")
+            with open(initial_cost_file_location, "w") as initial_cost_file:
+                initial_cost_file.write("Link Segment Xml Id,Mode Xml Id,Cost\n1,1,10\n")
+
+            self.assertEqual(cache.get_or_create(initial_cost_file_location, network, None, lambda: "parsed"), "parsed")
+            self.assertEqual(cache.get_or_create(initial_cost_file_location, network, None, lambda: "reparsed"), "parsed")
+            # other network or time period
+            other_network = FakeNetwork()
+            self.assertEqual(cache.get_or_create(initial_cost_file_location, other_network, None, lambda: "other"),
+                             "other")
+            self.assertEqual(cache.get_or_create(initial_cost_file_location, network, "1", lambda: "period"), "period")
+            self.assertEqual(cache.info(), {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'max_size': 2})
+
+            # a modified file is parsed again
+            with open(initial_cost_file_location, "a") as initial_cost_file:
+                initial_cost_file.write("2,1,20\n")
+            self.assertEqual(cache.get_or_create(initial_cost_file_location, network, "1", lambda: "modified"),
+                             "modified")
+
+            # the entries of a network are dropped once it is garbage collected, the cache does not keep it alive
+            self.assertEqual(cache.info()['size'], 2)
+            del network
+            gc.collect()
+            self.assertEqual(cache.info()['size'], 0)
+        cache.clear()
+        self.assertEqual(cache.info()['size'], 0)
+        gateway_state = GatewayState()
+        self.assertIs(InitialCostCache.of(gateway_state), InitialCostCache.of(gateway_state))
+
+    def test_startup_readiness(self):
+        planit = Planit()
+        # gateway is usable immediately after construction
+        self.assertTrue(GatewayState.gateway_is_running)
+        self.assertTrue(GatewayUtils.get_package_jvm().java.lang.System.currentTimeMillis() > 0)
+        for startup_phase in ['classpath', 'jvm_spawn', 'jvm_listening', 'first_call', 'entry_point']:
+            self.assertTrue(startup_phase in GatewayState.startup_timings)
+        # the PLANit entry point is created on the plain gateway server and accessible via the gateway as well
+        self.assertTrue(GatewayState.python_2_java_gateway.entry_point is GatewayState.entry_point)
+        self.assertEqual(GatewayState.entry_point.getClass().getName(), GatewayConfig.JAVA_GATEWAY_WRAPPER_CLASS)
+
+        planit.force_stop_java()
+        gc.collect()
+
+    def test_jvm_options(self):
+        # requested heap and garbage collector are in effect on the Java side and recorded for diagnostics
+        planit = Planit(jvm_options=JvmOptions(max_heap='256m', min_heap='64m', gc='serial',
+                                               xx_flags=['+UseStringDeduplication']))
+        gateway_state = planit.gateway_state
+        self.assertTrue('-Xmx256m' in gateway_state.java_command)
+        self.assertEqual(gateway_state.jvm_options.gc, 'serial')
+        jvm_info = GatewayUtils.get_jvm_info(gateway_state)
+        self.assertTrue('-Xmx256m' in jvm_info['input_arguments'])
+        self.assertTrue('-XX:+UseStringDeduplication' in jvm_info['input_arguments'])
+        self.assertTrue(jvm_info['max_heap_bytes'] <= 256 * 1024 * 1024)
+        print(f"PLANit JVM info: {jvm_info}")
+
+        planit.force_stop_java()
+        gc.collect()
+
+    @staticmethod
+    def count_calls(gateway_state: GatewayState, function, *args):
+        """ number of calls (round trips) to Java made by function, by counting the commands sent to the gateway
+        """
+        gateway_client = gateway_state.python_2_java_gateway._gateway_client
+        send_command = gateway_client.send_command
+        num_calls = [0]
+
+        def counting_send_command(*send_args, **send_kwargs):
+            num_calls[0] += 1
+            return send_command(*send_args, **send_kwargs)
+        gateway_client.send_command = counting_send_command
+        try:
+            result = function(*args)
+        finally:
+            gateway_client.send_command = send_command
+        return num_calls[0], result
+
+    def test_bulk_conversion(self):
+        # primitive lists and sets are transferred in a constant number of calls regardless of their size
+        planit = Planit()
+        gateway_state = planit.gateway_state
+        map_num_calls = []
+        for size in [1000, 100000]:
+            osm_way_ids = list(range(10 ** 9, 10 ** 9 + size))
+            large_osm_node_ids = list(range(10 ** 10, 10 ** 10 + size))
+            costs = [0.5 * i for i in range(size)]
+            xml_ids = [str(i) for i in range(size)]
+            for python_list in [osm_way_ids, large_osm_node_ids, costs, xml_ids]:
+                # warm up the class lookups, which are cached per gateway
+                GatewayUtils.to_java_list(python_list[:GatewayConfig.BULK_CONVERSION_MIN_SIZE], gateway_state)
+                start_time = time.perf_counter()
+                num_calls, java_list = TestSuiteGateway.count_calls(
+                    gateway_state, GatewayUtils.to_java_list, python_list, gateway_state)
+                duration = time.perf_counter() - start_time
+                print(f"bulk list of {size} {type(python_list[0]).__name__}: {num_calls} calls, {duration:.3f}s")
+                self.assertLess(num_calls, 10)
+                self.assertEqual(java_list.size(), size)
+                self.assertEqual(java_list.get(size - 1), python_list[-1])
+                self.assertEqual(java_list.get(0), python_list[0])
+
+            num_calls, java_set = TestSuiteGateway.count_calls(
+                gateway_state, GatewayUtils.to_java_set, set(xml_ids), gateway_state)
+            self.assertLess(num_calls, 10)
+            self.assertTrue(java_set.contains(xml_ids[-1]))
+
+            # dicts are transferred as key and value arrays zipped on the Java side, warm up its method lookups
+            GatewayUtils.to_java_map(dict(zip(xml_ids, costs[:GatewayConfig.BULK_CONVERSION_MIN_SIZE])), gateway_state)
+            num_calls, java_map = TestSuiteGateway.count_calls(
+                gateway_state, GatewayUtils.to_java_map, dict(zip(xml_ids, costs)), gateway_state)
+            map_num_calls.append(num_calls)
+            self.assertEqual(java_map.size(), size)
+            self.assertEqual(java_map.get(xml_ids[-1]), costs[-1])
+            self.assertEqual(java_map.get(xml_ids[0]), costs[0])
+        self.assertLess(map_num_calls[0], 60)
+        self.assertEqual(map_num_calls[0], map_num_calls[1])
+
+        # elements keep the Java type Py4J gives them individually
+        self.assertEqual(GatewayUtils.to_java_list(osm_way_ids, gateway_state).get(0).getClass().getName(),
+                         'java.lang.Integer')
+        self.assertEqual(GatewayUtils.to_java_list(large_osm_node_ids, gateway_state).get(0).getClass().getName(),
+                         'java.lang.Long')
+
+        # lists that can not be transferred in bulk are still converted, one call per element
+        mixed = [1, 2.5, "3", True] * GatewayConfig.BULK_CONVERSION_MIN_SIZE
+        num_calls, java_list = TestSuiteGateway.count_calls(
+            gateway_state, GatewayUtils.to_java_list, mixed, gateway_state)
+        self.assertEqual(list(java_list), mixed)
+        self.assertGreaterEqual(num_calls, len(mixed))
+        separated = ["a" + GatewayConfig.BULK_STRING_SEPARATOR + "b"] * GatewayConfig.BULK_CONVERSION_MIN_SIZE
+        self.assertEqual(list(GatewayUtils.to_java_list(separated, gateway_state)), separated)
+        self.assertEqual(list(GatewayUtils.to_java_list(["", "a", ""] * 10, gateway_state)), ["", "a", ""] * 10)
+
+        java_map = GatewayUtils.to_java_map({"a": 1, "b": 2}, gateway_state)
+        self.assertEqual(java_map.get("b"), 2)
+
+        planit.force_stop_java()
+        gc.collect()
+
+    def test_bulk_array_conversion(self):
+        # primitive, boxed, and string arrays are transferred in a constant number of calls regardless of their size
+        planit = Planit()
+        gateway_state = planit.gateway_state
+        size = 100000
+        costs = np.linspace(0.0, 1.0, size)
+        for class_name, python_list in [('double', costs), ('double', costs.tolist()), ('int', np.arange(size)),
+                                        ('long', list(range(size))), ('java.lang.Integer', list(range(size))),
+                                        ('java.lang.Double', costs.tolist()),
+                                        ('java.lang.String', [str(i) for i in range(size)])]:
+            object_class = GatewayUtils.get_java_class(class_name, gateway_state)
+            GatewayUtils.to_java_array(object_class, python_list[:GatewayConfig.BULK_CONVERSION_MIN_SIZE], gateway_state)
+            start_time = time.perf_counter()
+            num_calls, java_array = TestSuiteGateway.count_calls(
+                gateway_state, GatewayUtils.to_java_array, object_class, python_list, gateway_state)
+            duration = time.perf_counter() - start_time
+            print(f"bulk {class_name} array of {size} ({type(python_list).__name__}): {num_calls} calls, "
+                  f"{duration:.3f}s")
+            self.assertLess(num_calls, 10)
+            self.assertEqual(len(java_array), size)
+            self.assertEqual(java_array[size - 1], python_list[-1])
+
+        # booleans, and values not representable by the array type, are populated per element as before
+        boolean_class = GatewayUtils.get_java_class('boolean', gateway_state)
+        flags = [i % 2 == 0 for i in range(GatewayConfig.BULK_CONVERSION_MIN_SIZE)]
+        self.assertEqual(list(GatewayUtils.to_java_array(boolean_class, flags, gateway_state)), flags)
+        double_class = GatewayUtils.get_java_class('double', gateway_state)
+        self.assertEqual(list(GatewayUtils.to_java_array(double_class, [1, 2.5] * 10, gateway_state)), [1, 2.5] * 10)
+
+        # primitive arrays are transferred back to NumPy in a constant number of calls as well
+        for java_primitive, values in [('double', costs), ('int', np.arange(-size, size, 2, dtype=np.int32)),
+                                       ('long', np.arange(size, dtype=np.int64) * 10 ** 10)]:
+            java_array = GatewayUtils.to_java_array(GatewayUtils.get_java_class(java_primitive, gateway_state), values,
+                                                    gateway_state)
+            num_calls, numpy_array = TestSuiteGateway.count_calls(
+                gateway_state, GatewayUtils.to_numpy_array, java_array, java_primitive, len(values), gateway_state)
+            self.assertLess(num_calls, 10)
+            self.assertTrue(np.array_equal(numpy_array, values))
+        self.assertEqual(len(GatewayUtils.to_numpy_array(None, 'double', 0, gateway_state)), 0)
+
+        planit.force_stop_java()
+        gc.collect()
+
+    def test_server_mode(self):
+        # first client starts the shared server, subsequent clients attach to it without starting a JVM
+        planit = Planit(standalone=False)
+        self.assertTrue(GatewayUtils.to_java_enum(OutputType.LINK) is not None)
+        planit.force_stop_java()
+        self.assertTrue(GatewayUtils.is_java_gateway_listening(GatewayConfig.JAVA_GATEWAY_ADDRESS,
+                                                               GatewayConfig.SERVER_PORT))
+
+        planit = Planit(standalone=False)
+        self.assertTrue(GatewayUtils.to_java_enum(OutputType.LINK) is not None)
+        print(f"PLANit server attach timings (s): {GatewayState.startup_timings}")
+        planit.force_stop_java()
+
+        Planit.stop_server()
+        gc.collect()
+
+    def test_gateway_state_of(self):
+        # Java objects and Java members (bound methods) resolve to the gateway state of their gateway client
+        class FakeGateway:
+            _gateway_client = object()
+        gateway_state = GatewayState()
+        gateway_state.python_2_java_gateway = FakeGateway()
+        other_gateway_state = GatewayState()
+        other_gateway_state.python_2_java_gateway = type('OtherFakeGateway', (), {'_gateway_client': object()})()
+        gateway_state.register()
+        other_gateway_state.register()
+        try:
+            java_object = type('FakeJavaObject', (), {'_gateway_client': FakeGateway._gateway_client})()
+            java_member = type('FakeJavaMember', (), {'gateway_client': FakeGateway._gateway_client})()
+            self.assertTrue(GatewayState.of(java_object) is gateway_state)
+            self.assertTrue(GatewayState.of(java_member) is gateway_state)
+            self.assertTrue(GatewayState.of(None) is other_gateway_state)
+        finally:
+            other_gateway_state.unregister()
+            gateway_state.unregister()
+        self.assertFalse(GatewayState.gateway_is_running)
+
+    def test_concurrent_instances(self):
+        # each instance runs its own JVM on its own port, Java objects resolve to the gateway that created them
+        planits = [Planit() for _ in range(2)]
+        gateway_states = [planit.gateway_state for planit in planits]
+        self.assertNotEqual(gateway_states[0].port, gateway_states[1].port)
+        for gateway_state in gateway_states:
+            java_enum = GatewayUtils.to_java_enum(OutputType.LINK, gateway_state)
+            self.assertTrue(GatewayState.of(java_enum) is gateway_state)
+
+        # wrapper arguments are converted on the gateway of the wrapped object, not the default (most recent) one
+        java_list = GatewayUtils.get_java_class('java.util.ArrayList', gateway_states[0])()
+        self.assertTrue(GatewayState.of(java_list.addAll) is gateway_states[0])
+        wrapper = BaseWrapper(java_list)
+        self.assertTrue(wrapper.gateway_state is gateway_states[0])
+        self.assertTrue(wrapper.add_all(list(range(100))))
+        self.assertEqual(java_list.size(), 100)
+        self.assertEqual(java_list.get(99), 99)
+
+        # instances can be used from different threads at the same time
+        def current_time_millis(gateway_state: GatewayState):
+            return GatewayUtils.get_package_jvm(gateway_state).java.lang.System.currentTimeMillis()
+        with ThreadPoolExecutor(max_workers=len(gateway_states)) as executor:
+            for result in executor.map(current_time_millis, gateway_states):
+                self.assertTrue(result > 0)
+
+        # stopping one instance leaves the other running
+        planits[0].force_stop_java()
+        self.assertFalse(gateway_states[0].gateway_is_running)
+        self.assertTrue(current_time_millis(gateway_states[1]) > 0)
+        planits[1].force_stop_java()
+        self.assertFalse(GatewayState.gateway_is_running)
+        gc.collect()
+
+
+if __name__ == '__main__':
+    unittest.main()
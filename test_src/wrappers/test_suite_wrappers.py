@@ -0,0 +1,274 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '../..', 'src'))
+
+import threading
+import time
+import unittest
+from unittest import mock
+import numpy as np
+from py4j.protocol import Py4JError
+from planit import *
+
+
+class FakeMemoryOutputIterator:
+    """ Stand-in for the Java MemoryOutputIterator, so the Python side dispatch of the wrappers can be tested without
+    the Java gateway
+    """
+
+    def __init__(self):
+        self.index = 0
+
+    def hasNext(self):
+        return True
+
+    def next(self):
+        self.index += 1
+
+    def getKeys(self):
+        return [self.index]
+
+    def getValues(self):
+        return [float(self.index)]
+
+
+class FiniteMemoryOutputIterator(FakeMemoryOutputIterator):
+    """ Stand-in for the Java MemoryOutputIterator with a limited number of rows
+    """
+
+    def __init__(self, num_rows: int):
+        super().__init__()
+        self.num_rows = num_rows
+
+    def hasNext(self):
+        return self.index < self.num_rows
+
+
+class FakeStopCriterion:
+    """ Stand-in for the Java StopCriterion, recording each maximum number of iterations set, it fails as if the
+    gateway has gone while unavailable
+    """
+
+    def __init__(self, max_iterations: int):
+        self.max_iterations = max_iterations
+        self.max_iterations_set = []
+        self.unavailable = False
+
+    def getMaxIterations(self):
+        return self.max_iterations
+
+    def setMaxIterations(self, max_iterations):
+        if self.unavailable:
+            raise Py4JError('gateway gone')
+        self.max_iterations = max_iterations
+        self.max_iterations_set.append(max_iterations)
+
+
+class StopAtIterationPolicy(StoppingPolicy):
+    """ Stops each time period at a given iteration
+    """
+
+    def __init__(self, iteration: int):
+        self.iteration = iteration
+
+    def should_stop(self, progress: IterationProgress) -> bool:
+        return progress.iteration >= self.iteration
+
+
+class SlowMemoryOutputIterator(FiniteMemoryOutputIterator):
+    """ Stand-in for the Java MemoryOutputIterator of which each row takes a while to fetch, failing after a given
+    number of rows when requested
+    """
+
+    def __init__(self, num_rows: int, delay: float, fail_after: int = None):
+        super().__init__(num_rows)
+        self.delay = delay
+        self.fail_after = fail_after
+
+    def next(self):
+        time.sleep(self.delay)
+        if self.fail_after is not None and self.index >= self.fail_after:
+            raise RuntimeError("fetch failed")
+        super().next()
+
+
+class TestSuiteWrappers(unittest.TestCase):
+
+    def test_dispatch_forwards_to_java_counterpart(self):
+        memory_output_iterator = MemoryOutputIteratorWrapper(FakeMemoryOutputIterator())
+        self.assertTrue(memory_output_iterator.has_next())
+        memory_output_iterator.next()
+        self.assertEqual(memory_output_iterator.get_keys(), [1])
+        # second access is served from the instance, not via __getattr__
+        self.assertTrue('get_keys' in memory_output_iterator.__dict__)
+        self.assertEqual(memory_output_iterator.get_values(), [1.0])
+        with self.assertRaises(AttributeError):
+            memory_output_iterator.__deepcopy__
+
+    def test_iteration_in_chunks(self):
+        memory_output_iterator = MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(5), chunk_size=2)
+        chunks = list(memory_output_iterator.iter_chunks())
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[0][1], ((2,), (2.0,)))
+
+        memory_output_iterator = MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(3))
+        self.assertEqual([keys for keys, values in memory_output_iterator], [(1,), (2,), (3,)])
+        self.assertEqual(list(MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(0))), [])
+
+        # chunks are fetched by a Java int range
+        for chunk_size in [0, 2 ** 31, 2.0, float('inf')]:
+            with self.assertRaises(Exception):
+                MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(3), chunk_size=chunk_size)
+
+    def test_iteration_with_prefetch(self):
+        num_rows = 40
+        prefetch = 2
+
+        # rows are provided in the same order as without prefetching
+        rows = list(MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(num_rows), chunk_size=3))
+        prefetched_rows = list(MemoryOutputIteratorWrapper(FiniteMemoryOutputIterator(num_rows), chunk_size=3,
+                                                           prefetch=prefetch))
+        self.assertEqual(prefetched_rows, rows)
+
+        # fetch failures surface in the iterating thread
+        memory_output_iterator = MemoryOutputIteratorWrapper(SlowMemoryOutputIterator(num_rows, 0, fail_after=3),
+                                                             chunk_size=1, prefetch=prefetch)
+        with self.assertRaises(RuntimeError):
+            list(memory_output_iterator)
+
+        # the buffer is bounded: while the caller does not consume, at most prefetch chunks wait besides the one the
+        # prefetch thread is blocked on
+        java_iterator = FiniteMemoryOutputIterator(num_rows)
+        chunks = MemoryOutputIteratorWrapper(java_iterator, chunk_size=1, prefetch=prefetch).iter_chunks()
+        self.assertEqual(next(chunks), [((1,), (1.0,))])
+        # give the prefetch thread ample opportunity to exceed the bound, the bound holds regardless of timing
+        time.sleep(0.2)
+        self.assertLessEqual(java_iterator.index, 1 + prefetch + 1)
+
+        # abandoning the iteration stops the prefetch thread
+        chunks.close()
+        self.assertFalse(any(thread.name == "planit-memory-output-prefetch" for thread in threading.enumerate()))
+        self.assertLess(java_iterator.index, num_rows)
+
+    def test_stopping_policies_across_time_periods(self):
+        def progress(iteration, time_period_index):
+            return IterationProgress(iteration, 0.1, str(time_period_index), time_period_index, 0.0, 0.0, 0.0, "")
+
+        java_stop_criterion = FakeStopCriterion(10)
+        stop_criterion = StopCriterionWrapper(java_stop_criterion)
+        stop_criterion.set_stopping_policies(StopAtIterationPolicy(3))
+        stop_criterion._start_run()
+        for iteration in range(1, 4):
+            stop_criterion._apply_stopping_policies(progress(iteration, 0))
+        self.assertEqual(java_stop_criterion.max_iterations, 3)
+        # the configured maximum is restored as soon as the next time period reports its first iteration
+        stop_criterion._apply_stopping_policies(progress(1, 1))
+        self.assertEqual(java_stop_criterion.max_iterations, 10)
+        for iteration in range(2, 4):
+            stop_criterion._apply_stopping_policies(progress(iteration, 1))
+        self.assertEqual(java_stop_criterion.max_iterations, 3)
+        self.assertEqual(sorted(stop_criterion.policy_stops), [0, 1])
+
+        # a time period stopped at its first iteration runs one more, so the next time period's first iteration never
+        # meets the lowered maximum
+        java_stop_criterion = FakeStopCriterion(10)
+        stop_criterion = StopCriterionWrapper(java_stop_criterion)
+        stop_criterion.set_stopping_policies(StopAtIterationPolicy(1))
+        stop_criterion._start_run()
+        stop_criterion._apply_stopping_policies(progress(1, 0))
+        self.assertEqual(java_stop_criterion.max_iterations, 2)
+        stop_criterion._apply_stopping_policies(progress(2, 0))
+        stop_criterion._apply_stopping_policies(progress(1, 1))
+        self.assertEqual(java_stop_criterion.max_iterations_set, [2, 10, 2])
+
+    def test_stopping_policies_restored_after_run(self):
+        def progress(iteration):
+            return IterationProgress(iteration, 0.1, "0", 0, 0.0, 0.0, 0.0, "")
+
+        # the configured maximum is restored when a run raises after a policy lowered it
+        java_stop_criterion = FakeStopCriterion(10)
+        stop_criterion = StopCriterionWrapper(java_stop_criterion)
+        stop_criterion.set_stopping_policies(StopAtIterationPolicy(3))
+        stop_criterion._start_run()
+        with self.assertRaises(RuntimeError):
+            try:
+                for iteration in range(1, 4):
+                    stop_criterion._apply_stopping_policies(progress(iteration))
+                raise RuntimeError('run failed')
+            finally:
+                stop_criterion._end_run()
+        self.assertEqual(java_stop_criterion.max_iterations_set, [3, 10])
+
+        # when the gateway is gone at the end of a run, the maximum is restored at the start of the next run
+        stop_criterion._start_run()
+        for iteration in range(1, 4):
+            stop_criterion._apply_stopping_policies(progress(iteration))
+        java_stop_criterion.unavailable = True
+        stop_criterion._end_run()
+        self.assertEqual(java_stop_criterion.max_iterations, 3)
+        java_stop_criterion.unavailable = False
+        stop_criterion._start_run()
+        self.assertEqual(java_stop_criterion.max_iterations, 10)
+        stop_criterion._end_run()
+        self.assertEqual(java_stop_criterion.max_iterations_set, [3, 10, 3, 10])
+
+    def test_network_entity_table_lookups(self):
+        link_segments = NetworkEntityTable(np.array([0, 1, 2], dtype=np.int64),
+                                           np.array(["3", "4", "5"], dtype=object),
+                                           np.array([None, "e4", "e5"], dtype=object),
+                                           np.array(["1", "1", "2"], dtype=object))
+        self.assertEqual(len(link_segments), 3)
+        self.assertEqual(link_segments.id_of("4"), 1)
+        self.assertIsNone(link_segments.id_of("unknown"))
+        self.assertEqual(link_segments.xml_id_of(2), "5")
+        self.assertIsNone(link_segments.xml_id_of(3))
+        self.assertEqual(link_segments.ids_of(["5", "unknown", "3"]).tolist(), [2, -1, 0])
+        self.assertEqual(list(link_segments.to_dataframe().columns), ['id', 'xml_id', 'external_id', 'layer_xml_id'])
+
+    def test_camelcase_memoization(self):
+        GatewayUtils.clear_camelcase_cache()
+        self.assertEqual(GatewayUtils.to_camelcase('get_xml_id'), 'getXmlId')
+        self.assertEqual(GatewayUtils.to_camelcase('get_xml_id'), 'getXmlId')
+        cache_info = GatewayUtils.camelcase_cache_info()
+        self.assertEqual(cache_info['misses'], 1)
+        self.assertEqual(cache_info['hits'], 1)
+        GatewayUtils.clear_camelcase_cache()
+        self.assertEqual(GatewayUtils.camelcase_cache_info()['misses'], 0)
+
+        # the memoization is sized by the configuration as of its first use after clearing, not as of import
+        original_cache_size = GatewayConfig.CAMELCASE_CACHE_SIZE
+        GatewayConfig.CAMELCASE_CACHE_SIZE = 2
+        try:
+            for name in ['get_xml_id', 'get_id', 'get_name']:
+                GatewayUtils.to_camelcase(name)
+            cache_info = GatewayUtils.camelcase_cache_info()
+            self.assertEqual((cache_info['max_size'], cache_info['size'], cache_info['misses']), (2, 2, 3))
+        finally:
+            GatewayConfig.CAMELCASE_CACHE_SIZE = original_cache_size
+            GatewayUtils.clear_camelcase_cache()
+        self.assertEqual(GatewayUtils.camelcase_cache_info()['max_size'], original_cache_size)
+
+    def test_dispatch_is_cached(self):
+        memory_output_iterator = MemoryOutputIteratorWrapper(FakeMemoryOutputIterator())
+        forwarded_names = []
+        forward = BaseWrapper.__getattr__
+
+        def counting_getattr(wrapper, name):
+            forwarded_names.append(name)
+            return forward(wrapper, name)
+
+        with mock.patch.object(MemoryOutputIteratorWrapper, '__getattr__', counting_getattr):
+            for _ in range(3):
+                memory_output_iterator.has_next()
+                memory_output_iterator.next()
+                memory_output_iterator.get_keys()
+        # each method is dispatched via __getattr__ on first access only, and served from the instance afterwards
+        self.assertEqual(forwarded_names, ['has_next', 'next', 'get_keys'])
+        for name in forwarded_names:
+            self.assertIn(name, memory_output_iterator.__dict__)
+        self.assertEqual(memory_output_iterator.get_keys(), [3])
+
+
+if __name__ == '__main__':
+    unittest.main()